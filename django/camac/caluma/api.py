@@ -1,3 +1,4 @@
+from collections import defaultdict
 from logging import getLogger
 
 from caluma.caluma_form import models as caluma_form_models
@@ -7,12 +8,20 @@ from caluma.caluma_workflow import (
     models as caluma_workflow_models,
 )
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import Q, prefetch_related_objects
 
 from camac.user.models import Service
 
 log = getLogger(__name__)
 
+# questions of the main document which are preloaded by `preload_facts`
+FACT_QUESTIONS = [
+    "is-paper",
+    "projektaenderung",
+    "geschaeftstyp",
+    "geschaeftstyp-import",
+]
+
 
 class CalumaApi:
     """
@@ -78,19 +87,42 @@ class CalumaApi:
         except caluma_form_models.Answer.DoesNotExist:
             return None
 
-    def get_nfd_form_permissions(self, instance):
-        permissions = set()
+    def preload_nfd_statuses(self, instances):
+        """Preload the statuses of the NFD (Nachforderung) tables of multiple instances.
 
-        answers = caluma_form_models.Answer.objects.filter(
+        Used by `get_nfd_form_permissions` instead of querying them for every
+        instance.
+        """
+        statuses = defaultdict(set)
+        for instance_pk, value in caluma_form_models.Answer.objects.filter(
             question_id="nfd-tabelle-status",
             document__family__form_id="nfd",
-            document__family__work_item__case__family__instance__pk=instance.pk,
-        )
+            document__family__work_item__case__family__instance__in=instances,
+        ).values_list(
+            "document__family__work_item__case__family__instance__pk", "value"
+        ):
+            statuses[instance_pk].add(value)
+
+        for instance in instances:
+            instance._preloaded_nfd_statuses = statuses[instance.pk]
 
-        if answers.exclude(value="nfd-tabelle-status-entwurf").exists():
+    def get_nfd_form_permissions(self, instance):
+        permissions = set()
+
+        statuses = getattr(instance, "_preloaded_nfd_statuses", None)
+        if statuses is None:
+            statuses = set(
+                caluma_form_models.Answer.objects.filter(
+                    question_id="nfd-tabelle-status",
+                    document__family__form_id="nfd",
+                    document__family__work_item__case__family__instance__pk=instance.pk,
+                ).values_list("value", flat=True)
+            )
+
+        if statuses - {"nfd-tabelle-status-entwurf"}:
             permissions.add("read")
 
-        if answers.filter(value="nfd-tabelle-status-in-bearbeitung").exists():
+        if "nfd-tabelle-status-in-bearbeitung" in statuses:
             permissions.add("read")
             permissions.add("write")
 
@@ -151,13 +183,55 @@ class CalumaApi:
 
         return True
 
+    def preload_facts(self, instances):
+        """Preload the facts of multiple instances in a few queries.
+
+        Lists of instances would otherwise query the answers of every
+        instance's main document multiple times. The preloaded answers are
+        used by `is_paper`, `is_modification`, `get_migration_type` and
+        `get_import_type`.
+        """
+        prefetch_related_objects(instances, "case__document__form", "case__workflow")
+        documents = [instance.case.document for instance in instances if instance.case]
+
+        answers = defaultdict(dict)
+        for document_id, question_id, value in caluma_form_models.Answer.objects.filter(
+            document__in=documents, question_id__in=FACT_QUESTIONS
+        ).values_list("document_id", "question_id", "value"):
+            answers[document_id][question_id] = value
+
+        migration_types = {
+            answers[document.pk].get("geschaeftstyp") for document in documents
+        }
+        option_labels = {
+            option.slug: option.label
+            for option in caluma_form_models.Option.objects.filter(
+                slug__in=migration_types - {None}
+            )
+        }
+
+        for document in documents:
+            document._preloaded_answers = answers[document.pk]
+            document._preloaded_option_labels = option_labels
+
+    def _get_preloaded_answers(self, instance):
+        return getattr(instance.case.document, "_preloaded_answers", None)
+
     def is_paper(self, instance):
+        answers = self._get_preloaded_answers(instance)
+        if answers is not None:
+            return answers.get("is-paper") == "is-paper-yes"
+
         return instance.case.document.answers.filter(
             question_id="is-paper",
             value="is-paper-yes",
         ).exists()
 
     def is_modification(self, instance):
+        answers = self._get_preloaded_answers(instance)
+        if answers is not None:
+            return answers.get("projektaenderung") == "projektaenderung-ja"
+
         return instance.case.document.answers.filter(
             question_id="projektaenderung",
             value="projektaenderung-ja",
@@ -172,6 +246,14 @@ class CalumaApi:
         return instance.case.document.form_id == "migriertes-dossier"
 
     def get_migration_type(self, instance):
+        answers = self._get_preloaded_answers(instance)
+        if answers is not None:
+            slug = answers.get("geschaeftstyp")
+            if not slug:  # pragma: no cover
+                return None
+
+            return (slug, instance.case.document._preloaded_option_labels[slug])
+
         answer = instance.case.document.answers.filter(
             question_id="geschaeftstyp"
         ).first()
@@ -184,6 +266,10 @@ class CalumaApi:
         return (option.slug, option.label)
 
     def get_import_type(self, instance):
+        answers = self._get_preloaded_answers(instance)
+        if answers is not None:
+            return answers.get("geschaeftstyp-import")
+
         answer = instance.case.document.answers.filter(
             question_id="geschaeftstyp-import"
         ).first()
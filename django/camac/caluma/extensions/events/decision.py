@@ -3,7 +3,11 @@ from caluma.caluma_core.events import on
 from caluma.caluma_form.api import save_answer
 from caluma.caluma_form.models import Question
 from caluma.caluma_workflow.api import skip_work_item
-from caluma.caluma_workflow.events import post_complete_work_item, post_create_work_item
+from caluma.caluma_workflow.events import (
+    post_cancel_work_item,
+    post_complete_work_item,
+    post_create_work_item,
+)
 from caluma.caluma_workflow.models import WorkItem
 from django.conf import settings
 from django.db import transaction
@@ -17,7 +21,8 @@ from camac.instance.utils import (
     should_continue_after_decision,
 )
 from camac.notification.utils import send_mail_without_request
-from camac.stats.cycle_time import compute_cycle_time
+from camac.stats.cycle_time import update_cycle_time
+from camac.stats.models import InstanceCycleTime
 from camac.user.models import Service, User
 
 from .general import get_caluma_setting, get_instance
@@ -54,9 +59,26 @@ def set_workflow_answer(sender, work_item, user, context, **kwargs):
 @transaction.atomic
 def set_cycle_time_post_decision_complete(sender, work_item, user, context, **kwargs):
     if work_item.task_id == get_caluma_setting("DECISION_TASK"):
+        update_cycle_time(get_instance(work_item))
+
+
+@on(post_cancel_work_item, raise_exception=True)
+@transaction.atomic
+def delete_cycle_time_post_decision_cancel(sender, work_item, user, context, **kwargs):
+    if work_item.task_id == get_caluma_setting("DECISION_TASK"):
+        InstanceCycleTime.objects.filter(instance=get_instance(work_item)).delete()
+
+
+@on(post_complete_work_item, raise_exception=True)
+@transaction.atomic
+def update_cycle_time_post_nfd_complete(sender, work_item, user, context, **kwargs):
+    # claims can be completed after the decision with a response date before
+    # it (e.g. when entered late), which changes the waiting periods
+    if work_item.task_id == "nfd":
         instance = get_instance(work_item)
-        instance.case.meta.update(compute_cycle_time(instance))
-        instance.case.save()
+
+        if InstanceCycleTime.objects.filter(instance=instance).exists():
+            update_cycle_time(instance)
 
 
 @on(post_complete_work_item, raise_exception=True)
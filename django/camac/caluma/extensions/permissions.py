@@ -30,6 +30,7 @@ from caluma.caluma_workflow.schema import (
     SuspendCase,
 )
 from django.conf import settings
+from django.core.cache import cache
 
 from camac.caluma.utils import CamacRequest
 from camac.constants.kt_bern import DASHBOARD_FORM_SLUG
@@ -368,11 +369,38 @@ class CustomPermission(BasePermission):
         else:
             return False
 
+        permissions = self._get_instance_permissions(case.family.instance, info)
+
+        return required_permission in permissions.get(permission_key, [])
+
+    def _get_instance_permissions(self, instance, info):
+        """Fetch the permissions of an instance from the NG API.
+
+        Saving a form sends a mutation for every answer, so the permissions
+        can be cached per instance, user, group and instance state for
+        `CALUMA_PERMISSIONS_CACHE_TIMEOUT` seconds. Other changes affecting
+        the permissions (e.g. inquiries or publications) don't invalidate the
+        cache, so it's disabled by default.
+        """
+        request_headers = headers(info)
+        if not settings.CALUMA_PERMISSIONS_CACHE_TIMEOUT:
+            return self._fetch_instance_permissions(instance, request_headers)
+
+        cache_key = (
+            f"caluma_permissions__{instance.pk}__{info.context.user.username}__"
+            f"{request_headers['x-camac-group']}__{instance.instance_state_id}"
+        )
+
+        return cache.get_or_set(
+            cache_key,
+            lambda: self._fetch_instance_permissions(instance, request_headers),
+            settings.CALUMA_PERMISSIONS_CACHE_TIMEOUT,
+        )
+
+    def _fetch_instance_permissions(self, instance, request_headers):
         resp = requests.get(
-            build_url(
-                settings.API_HOST, f"/api/v1/instances/{case.family.instance.pk}"
-            ),
-            headers=headers(info),
+            build_url(settings.API_HOST, f"/api/v1/instances/{instance.pk}"),
+            headers=request_headers,
         )
 
         resp.raise_for_status()
@@ -382,9 +410,7 @@ class CustomPermission(BasePermission):
             if "error" in jsondata:
                 raise RuntimeError("Error from NG API: %s" % jsondata["error"])
 
-            permissions = jsondata["data"]["meta"]["permissions"]
-
-            return required_permission in permissions.get(permission_key, [])
+            return jsondata["data"]["meta"]["permissions"]
 
         except KeyError:
             raise RuntimeError(
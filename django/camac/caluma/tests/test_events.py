@@ -3,6 +3,7 @@ from caluma.caluma_core.events import send_event
 from caluma.caluma_form import models as caluma_form_models
 from caluma.caluma_workflow import api as workflow_api, models as caluma_workflow_models
 from caluma.caluma_workflow.events import (
+    post_cancel_work_item,
     post_complete_work_item,
     post_create_work_item,
     post_skip_work_item,
@@ -17,6 +18,7 @@ from camac.constants.kt_bern import (
     DECISIONS_BEWILLIGT,
 )
 from camac.instance.models import HistoryEntryT
+from camac.stats.models import InstanceCycleTime
 
 
 @pytest.mark.parametrize("expected_value", ["is-paper-yes", "is-paper-no"])
@@ -342,6 +344,29 @@ def test_set_is_published(
     assert work_item.meta["is-published"]
 
 
+def test_cancel_decision(
+    db,
+    be_instance,
+    caluma_admin_user,
+    application_settings,
+    work_item_factory,
+    instance_cycle_time_factory,
+):
+    application_settings["CALUMA"]["DECISION_TASK"] = "decision"
+    work_item = work_item_factory(task__slug="decision", case=be_instance.case)
+    instance_cycle_time_factory(instance=be_instance)
+
+    send_event(
+        post_cancel_work_item,
+        sender=test_cancel_decision,
+        work_item=work_item,
+        user=caluma_admin_user,
+        context={},
+    )
+
+    assert not InstanceCycleTime.objects.filter(instance=be_instance).exists()
+
+
 @pytest.mark.parametrize(
     "task_slug,existing_meta,context,expected_meta",
     [
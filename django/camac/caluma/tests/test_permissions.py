@@ -6,6 +6,8 @@ import requests
 from caluma.caluma_core.relay import extract_global_id
 from caluma.caluma_workflow import api as workflow_api, models as caluma_workflow_models
 
+from camac.caluma.extensions.permissions import CustomPermission
+
 
 @pytest.mark.parametrize("role__name", ["Municipality", "Applicant"])
 def test_save_work_item_permission(
@@ -385,3 +387,32 @@ def test_distribution_permission_for_answer(
         ).first()
         == value
     )
+
+
+@pytest.mark.parametrize("timeout", [0, 60])
+def test_instance_permissions_cache(
+    db, instance_factory, instance_state_factory, mocker, clear_cache, settings, timeout
+):
+    settings.CALUMA_PERMISSIONS_CACHE_TIMEOUT = timeout
+    response = Mock(spec=requests.models.Response)
+    response.status_code = 200
+    response.json.return_value = {
+        "data": {"meta": {"permissions": {"main": ["read", "write"]}}}
+    }
+    get = mocker.patch.object(requests, "get", return_value=response)
+
+    instance = instance_factory()
+    info = Mock()
+    info.context.user.username = "user"
+    info.context.META = {"HTTP_X_CAMAC_GROUP": "1", "HTTP_AUTHORIZATION": "Bearer x"}
+
+    for _ in range(2):
+        assert CustomPermission()._get_instance_permissions(instance, info) == {
+            "main": ["read", "write"]
+        }
+    assert get.call_count == (1 if timeout else 2)
+
+    # a changed instance state invalidates the cached permissions
+    instance.instance_state = instance_state_factory()
+    CustomPermission()._get_instance_permissions(instance, info)
+    assert get.call_count == (2 if timeout else 3)
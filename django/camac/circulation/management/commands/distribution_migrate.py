@@ -11,7 +11,7 @@ from caluma.caluma_workflow.models import Case, Task, WorkItem
 from deepmerge import always_merger
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
-from django.core.management.base import BaseCommand, CommandError
+from django.core.management.base import CommandError
 from django.db import connection, reset_queries, transaction
 from django.db.models import (
     Case as DjangoCase,
@@ -30,6 +30,7 @@ from django.utils.timezone import now
 from tqdm import tqdm
 
 from camac.core import models as core_models
+from camac.core.chunked_migration import ChunkedMigrationCommand
 from camac.instance.models import HistoryEntry
 from camac.responsible.models import ResponsibleService
 from camac.user.models import Service, User
@@ -186,7 +187,7 @@ def canton_aware(include_base_method=False):
     return decorator
 
 
-class Command(BaseCommand):
+class Command(ChunkedMigrationCommand):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -235,6 +236,7 @@ class Command(BaseCommand):
                 self.print_case(work_item.child_case, index + 4)
 
     def add_arguments(self, parser):
+        super().add_arguments(parser)
         parser.add_argument("--reset", dest="reset", action="store_true", default=False)
         parser.add_argument(
             "--visualize", dest="visualize", action="store_true", default=False
@@ -287,13 +289,21 @@ class Command(BaseCommand):
                 [settings.DISTRIBUTION["INQUIRY_FORM"]],
             )
 
-    @transaction.atomic
     def handle(self, *args, **options):
+        if options.get("reset") and options.get("dry"):
+            # the reset is committed before the chunks are migrated
+            raise CommandError("--reset can't be used in a dry run")
+
         if options.get("reset"):
-            self.reset()
+            with transaction.atomic():
+                self.reset()
+            options["restart"] = True
 
         setup_logger(options.get("file"))
 
+        super().handle(*args, **options)
+
+    def get_queryset(self, options):
         base_filters = Exists(
             WorkItem.objects.filter(
                 case_id=OuterRef("pk"),
@@ -304,7 +314,7 @@ class Command(BaseCommand):
 
         filters = self.cases_to_migrate_filters(base_filters)
 
-        cases_to_migrate = (
+        return (
             Case.objects.select_related("instance", "instance__instance_state")
             .prefetch_related("instance__circulations")
             .exclude(workflow_id__in=self.config.EXCLUDED_WORKFLOWS)
@@ -319,12 +329,13 @@ class Command(BaseCommand):
             .filter(filters)
         )
 
+    def migrate_chunk(self, cases_to_migrate):
         for case in tqdm(cases_to_migrate, mininterval=1, maxinterval=2):
             try:
                 identifier = case.instance.identifier or case.meta.get("ebau-number")
                 self.migrate_case(case)
 
-                if options.get("visualize"):
+                if self.options.get("visualize"):
                     logger.info(f"--- Instance {case.instance.pk} ({identifier}) ---")
                     logger.info(
                         f" * state: {case.instance.instance_state.description}, "
@@ -1,18 +1,16 @@
-from django.core.management.base import BaseCommand
-from django.db import transaction
-
+from camac.core.chunked_migration import ChunkedMigrationCommand
 from camac.core.models import Circulation
 
 
-class Command(BaseCommand):
+class Command(ChunkedMigrationCommand):
     help = """
     Migrate "old" single circulations to new multicirculations.
     """
 
-    @transaction.atomic
-    def handle(self, *args, **options):
-        circulations = Circulation.objects.filter(service=None)
+    def get_queryset(self, options):
+        return Circulation.objects.filter(service=None)
 
+    def migrate_chunk(self, circulations):
         for circulation in circulations:
             created_circulations = {}
             activations = circulation.activations.all()
@@ -44,5 +42,3 @@ class Command(BaseCommand):
                 )
                 activation.circulation = created_circulations[service_parent_id]
                 activation.save()
-
-        print("done")
@@ -1,4 +1,3 @@
-import django_excel
 from django.conf import settings
 from django.db import transaction
 from django.db.models import OuterRef, Subquery
@@ -183,6 +182,8 @@ class ActivationView(InstanceQuerysetMixin, views.ReadOnlyModelViewSet):
             for activation in queryset
         ]
 
+        import django_excel
+
         sheet = django_excel.pe.Sheet(content)
         return django_excel.make_response(
             sheet, file_type="xlsx", file_name="list.xlsx"
@@ -0,0 +1,165 @@
+"""Pre-parsed lookups of the application configuration.
+
+Some parts of `settings.APPLICATION` are read on every request, partly by
+scanning nested dicts. They are compiled into indexed, read-only structures
+once and compiled again only when the configuration is replaced (e.g. when a
+test assigns a new dict), which is detected by the identity of the source.
+Changing a compiled configuration in place isn't detected.
+"""
+from types import MappingProxyType
+
+from django.conf import settings
+
+_EMPTY = MappingProxyType({})
+
+# name: (source, compiled)
+_compiled = {}
+
+
+def compiled(name, source, compile):
+    """Return `compile(source)`, compiled once per source object."""
+    cached = _compiled.get(name)
+    if cached is not None and cached[0] is source:
+        return cached[1]
+
+    result = compile(source)
+    _compiled[name] = (source, result)
+    return result
+
+
+def _application(key):
+    return settings.APPLICATION.get(key) or _EMPTY
+
+
+def _compile_role_permissions(role_permissions):
+    by_permission = {}
+    for role, permission in role_permissions.items():
+        by_permission.setdefault(permission, []).append(role)
+
+    return MappingProxyType(
+        {permission: tuple(roles) for permission, roles in by_permission.items()}
+    )
+
+
+def get_permission(role_name):
+    """Return the permission of a role as configured in `ROLE_PERMISSIONS`."""
+    return _application("ROLE_PERMISSIONS").get(role_name)
+
+
+def get_roles(permission):
+    """Return the names of all roles with the given permission."""
+    return compiled(
+        "roles", _application("ROLE_PERMISSIONS"), _compile_role_permissions
+    ).get(permission, ())
+
+
+def get_parent_permission(permission):
+    """Return the permission a permission inherits from (`ROLE_INHERITANCE`)."""
+    return _application("ROLE_INHERITANCE").get(permission)
+
+
+def _compile_permission_funcs(role_inheritance):
+    # filled by `get_permission_func_name`, depends on the inheritance only
+    return {}
+
+
+def get_permission_func_name(cls, name, permission):
+    """Return the name of the method handling `name` for a permission.
+
+    Like `camac.user.permissions.permission_aware`, the method of the
+    permission itself is preferred over the one of the parent permission.
+    The result is cached per class, method and permission, so `cls` must be
+    a class and not an instance.
+    """
+    cache = compiled(
+        "permission_funcs",
+        _application("ROLE_INHERITANCE"),
+        _compile_permission_funcs,
+    )
+    key = (cls, name, permission)
+
+    if key not in cache:
+        parent = get_parent_permission(permission)
+        candidates = [f"{name}_for_{permission}"]
+        if parent:
+            candidates.append(f"{name}_for_{parent}")
+
+        cache[key] = next(
+            (candidate for candidate in candidates if hasattr(cls, candidate)), None
+        )
+
+    return cache[key]
+
+
+def _compile_active_services(active_services):
+    by_states = {}
+    default = None
+
+    for name, config in active_services.items():
+        if config.get("DEFAULT"):
+            default = (name, config)
+        for state_pair in config.get("INSTANCE_STATES", []):
+            # the last matching config wins
+            by_states[tuple(state_pair)] = (name, config)
+
+    return MappingProxyType(by_states), default
+
+
+def get_active_service_config(instance_state, previous_instance_state):
+    """Return the name and config of the active service of a state change.
+
+    Falls back to the default config when no config matches the states.
+    """
+    by_states, default = compiled(
+        "active_services", _application("ACTIVE_SERVICES"), _compile_active_services
+    )
+
+    return by_states.get((instance_state, previous_instance_state), default)
+
+
+def _compile_hidden_states(hidden_states):
+    return MappingProxyType(
+        {role: frozenset(states) for role, states in hidden_states.items()}
+    )
+
+
+def get_hidden_states(role_name):
+    """Return the instance states hidden from a role."""
+    return compiled(
+        "hidden_states",
+        _application("INSTANCE_HIDDEN_STATES"),
+        _compile_hidden_states,
+    ).get(role_name, frozenset())
+
+
+def _compile_master_data(master_data):
+    configs = {}
+
+    for key, (resolver, *args) in master_data.items():
+        configs[key] = (
+            resolver,
+            f"{resolver}_resolver",
+            args[0] if args else None,
+            MappingProxyType(args[1] if len(args) > 1 else {}),
+        )
+
+    return MappingProxyType(configs)
+
+
+def get_master_data_config(key):
+    """Return the parsed config of a master data key.
+
+    :return: resolver name, resolver method name, lookup and options of the
+             resolver, None if the key isn't configured
+    """
+    return compiled(
+        "master_data", _application("MASTER_DATA"), _compile_master_data
+    ).get(key)
+
+
+def compile_all():
+    """Compile all lookups of the current configuration ahead of time."""
+    get_roles(None)
+    get_active_service_config(None, None)
+    get_hidden_states(None)
+    get_master_data_config(None)
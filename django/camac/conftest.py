@@ -51,6 +51,7 @@ from camac.notification import factories as notification_factories
 from camac.objection import factories as objection_factories
 from camac.responsible import factories as responsible_factories
 from camac.settings_distribution import DISTRIBUTION
+from camac.stats import factories as stats_factories
 from camac.tags import factories as tags_factories
 from camac.urls import urlpatterns as app_patterns
 from camac.user import factories as user_factories
@@ -95,6 +96,7 @@ register_module(responsible_factories)
 register_module(ech_factories)
 register_module(objection_factories)
 register_module(tags_factories)
+register_module(stats_factories)
 
 # caluma factories
 register_module(caluma_form_factories, prefix="caluma")
@@ -0,0 +1,275 @@
+import time
+from abc import ABCMeta, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.db.models import Q
+
+from camac.core.models import MigrationCheckpoint
+
+# Runner of the parent process, inherited by the forked worker processes
+_runner = None
+
+
+def _run_chunk_in_worker(chunk):
+    return _runner.run_chunk(chunk)
+
+
+class MigrationRunner:
+    """Run a data migration over a queryset in chunks of primary key ranges.
+
+    Every chunk is migrated and committed in its own transaction together
+    with a `MigrationCheckpoint`. When the migration fails or is interrupted,
+    only the current chunk is rolled back and running it again continues with
+    the chunks which are not completed yet.
+
+    Chunks can be distributed to multiple worker processes. As the workers
+    are forked, `migrate_chunk` doesn't need to be picklable.
+    """
+
+    def __init__(
+        self,
+        name,
+        queryset,
+        migrate_chunk,
+        chunk_size=None,
+        workers=None,
+        dry=False,
+        stdout=None,
+    ):
+        """Initialize the runner.
+
+        :param name:          name of the migration, used for the checkpoints
+        :param queryset:      all objects to migrate
+        :param migrate_chunk: function receiving the queryset of a chunk,
+                              may return the number of migrated rows
+        :param chunk_size:    number of objects per chunk
+        :param workers:       number of worker processes
+        :param dry:           roll back every chunk and don't write checkpoints
+        :param stdout:        stream to report the progress to
+        """
+        self.name = name
+        self.queryset = queryset
+        self.migrate_chunk = migrate_chunk
+        self.chunk_size = chunk_size or settings.MIGRATION_CHUNK_SIZE
+        self.workers = workers or settings.MIGRATION_WORKERS
+        self.dry = dry
+        self.stdout = stdout
+
+    @property
+    def checkpoints(self):
+        return MigrationCheckpoint.objects.filter(name=self.name)
+
+    def reset(self):
+        """Forget the progress of earlier runs."""
+        self.checkpoints.delete()
+
+    def pending(self):
+        """Return the objects which are not in a completed chunk."""
+        to_python = self.queryset.model._meta.pk.to_python
+        completed = Q()
+
+        for first, last in self.checkpoints.values_list("first_pk", "last_pk"):
+            completed |= Q(pk__range=(to_python(first), to_python(last)))
+
+        return self.queryset.exclude(completed) if completed else self.queryset
+
+    def chunks(self):
+        """Split the pending objects into ranges of `chunk_size` primary keys."""
+        chunks = []
+        pks = (
+            self.pending()
+            .prefetch_related(None)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+            .distinct()
+            .iterator()
+        )
+
+        for index, pk in enumerate(pks):
+            if index % self.chunk_size == 0:
+                chunks.append([pk, pk])
+            else:
+                chunks[-1][1] = pk
+
+        return [tuple(chunk) for chunk in chunks]
+
+    def run_chunk(self, chunk):
+        """Migrate and commit a single chunk.
+
+        :return: number of migrated rows and the duration in seconds
+        """
+        first, last = chunk
+        start = time.monotonic()
+
+        with transaction.atomic():
+            queryset = self.queryset.filter(pk__range=(first, last))
+            # counted beforehand as the migration may change whether the
+            # objects match the queryset
+            count = queryset.count()
+            rows = self.migrate_chunk(queryset)
+            if rows is None:
+                rows = count
+
+            duration = time.monotonic() - start
+
+            if self.dry:
+                transaction.set_rollback(True)
+            else:
+                MigrationCheckpoint.objects.create(
+                    name=self.name,
+                    first_pk=str(first),
+                    last_pk=str(last),
+                    rows=rows,
+                    duration=duration,
+                )
+
+        return rows, duration
+
+    def run(self):
+        """Migrate all pending chunks.
+
+        :return: total number of migrated rows
+        """
+        chunks = self.chunks()
+        self.total_rows = 0
+        self.completed = 0
+        self.start = time.monotonic()
+
+        self._write(f"{self.name}: migrating {len(chunks)} chunks")
+
+        if self.workers > 1 and len(chunks) > 1:
+            self._run_parallel(chunks)
+        else:
+            for chunk in chunks:
+                self._report(len(chunks), *self.run_chunk(chunk))
+
+        elapsed = time.monotonic() - self.start
+        self._write(
+            f"{self.name}: migrated {self.total_rows} rows in {elapsed:.1f}s "
+            f"({self._rate(self.total_rows, elapsed)} rows/s)"
+        )
+
+        return self.total_rows
+
+    def _run_parallel(self, chunks):
+        global _runner
+
+        # The workers must open their own database connections, so the
+        # connections of this process may not be inherited. This process
+        # doesn't use the database until all chunks are done.
+        connections.close_all()
+        _runner = self
+
+        try:
+            with ProcessPoolExecutor(
+                self.workers, mp_context=get_context("fork")
+            ) as executor:
+                futures = [
+                    executor.submit(_run_chunk_in_worker, chunk) for chunk in chunks
+                ]
+
+                for future in as_completed(futures):
+                    self._report(len(chunks), *future.result())
+        finally:
+            _runner = None
+
+    def _rate(self, rows, seconds):
+        return f"{rows / seconds:.1f}" if seconds else "-"
+
+    def _report(self, total_chunks, rows, duration):
+        self.completed += 1
+        self.total_rows += rows
+
+        self._write(
+            f"{self.name}: chunk {self.completed}/{total_chunks} done, "
+            f"{rows} rows in {duration:.1f}s ({self._rate(rows, duration)} rows/s), "
+            f"{self.total_rows} rows total "
+            f"({self._rate(self.total_rows, time.monotonic() - self.start)} rows/s)"
+        )
+
+    def _write(self, message):
+        if self.stdout:
+            self.stdout.write(message)
+
+
+class ChunkedMigrationCommand(BaseCommand, metaclass=ABCMeta):
+    """Base for data migration commands which are run by `MigrationRunner`.
+
+    Subclasses must implement the abstract `get_queryset` and `migrate_chunk`.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry",
+            default=False,
+            action="store_true",
+            help="Don't apply changes",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.MIGRATION_CHUNK_SIZE,
+            help="Number of objects migrated in one transaction",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.MIGRATION_WORKERS,
+            help="Number of worker processes",
+        )
+        parser.add_argument(
+            "--restart",
+            default=False,
+            action="store_true",
+            help="Ignore the progress of earlier runs",
+        )
+
+    def get_migration_name(self):
+        return self.__module__.split(".")[-1]
+
+    @abstractmethod
+    def get_queryset(self, options):
+        """Return all objects to migrate.
+
+        The queryset is split into chunks of primary key ranges, so it
+        shouldn't be sliced. Objects which are already migrated may be
+        excluded, but don't need to be: completed chunks are skipped.
+
+        :param options: options of the command
+        :return:        queryset of the objects to migrate
+        """
+
+    @abstractmethod
+    def migrate_chunk(self, queryset):
+        """Migrate the objects of a chunk.
+
+        Runs in a transaction which is committed together with the checkpoint
+        of the chunk, possibly in a forked worker process. It must not
+        commit itself and mustn't rely on state changed by other chunks.
+
+        :param queryset: objects of the chunk
+        :return:         number of migrated rows, or None to count all objects
+                         of the chunk
+        """
+
+    def handle(self, *args, **options):
+        self.options = options
+
+        runner = MigrationRunner(
+            self.get_migration_name(),
+            self.get_queryset(options),
+            self.migrate_chunk,
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            dry=options["dry"],
+            stdout=self.stdout,
+        )
+
+        if options["restart"] and not options["dry"]:
+            runner.reset()
+
+        runner.run()
@@ -0,0 +1,166 @@
+import time
+from collections import defaultdict
+
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Prefetch
+
+
+def _m2m_fields(model):
+    return [
+        field
+        for field in model._meta.many_to_many
+        if field.serialize and field.remote_field.through._meta.auto_created
+    ]
+
+
+def iterate_for_dump(queryset, chunk_size=2000):
+    """Iterate over a queryset without caching the whole result.
+
+    Many to many relations are prefetched per chunk, as the serializer would
+    query them for every object otherwise.
+    """
+    m2m_fields = _m2m_fields(queryset.model)
+
+    if not m2m_fields:
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+
+    prefetches = [
+        Prefetch(field.name, queryset=field.related_model._base_manager.only("pk"))
+        for field in m2m_fields
+    ]
+    pks = list(queryset.values_list("pk", flat=True))
+
+    for start in range(0, len(pks), chunk_size):
+        yield from queryset.filter(
+            pk__in=pks[start : start + chunk_size]
+        ).prefetch_related(*prefetches)
+
+
+class FixtureLoader:
+    """Load fixtures with bulk inserts and updates instead of `loaddata`.
+
+    `loaddata` saves every object on its own. Here, the objects of all
+    fixtures are grouped by model; existing rows are updated with
+    `bulk_update` and new rows inserted in batches. Like `loaddata`, the
+    values are written as they are (no `auto_now` etc.), no signals are
+    sent and the sequences are reset afterwards. Foreign keys are checked at
+    the end of the transaction, so the order of the models doesn't matter.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS, batch_size=1000, stdout=None):
+        self.using = using
+        self.batch_size = batch_size
+        self.stdout = stdout
+
+    def read(self, fixtures):
+        objects = defaultdict(dict)
+
+        for fixture in fixtures:
+            with open(fixture, "r") as stream:
+                for deserialized in serializers.deserialize(
+                    "json", stream, using=self.using
+                ):
+                    # later fixtures overwrite earlier ones, like with loaddata
+                    objects[type(deserialized.object)][
+                        deserialized.object.pk
+                    ] = deserialized
+
+        return objects
+
+    def load(self, fixtures):
+        """Load the given fixture files.
+
+        :return: number of loaded objects
+        """
+        objects = self.read(fixtures)
+        total = 0
+
+        with transaction.atomic(using=self.using):
+            for model, deserialized in objects.items():
+                start = time.monotonic()
+                self.load_model(model, list(deserialized.values()))
+                total += len(deserialized)
+                self._write(
+                    f"Loaded {len(deserialized)} {model._meta.label} "
+                    f"in {time.monotonic() - start:.2f}s"
+                )
+
+            connection = connections[self.using]
+            connection.check_constraints(
+                table_names=[model._meta.db_table for model in objects]
+            )
+
+            sequence_sql = connection.ops.sequence_reset_sql(no_style(), list(objects))
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+
+        return total
+
+    def load_model(self, model, deserialized):
+        objs = [obj.object for obj in deserialized]
+
+        if model._meta.parents:
+            # multi table inheritance isn't supported by the bulk operations
+            for obj in deserialized:
+                obj.save(using=self.using)
+            return
+
+        manager = model._base_manager.db_manager(self.using)
+        existing = set()
+        pks = [obj.pk for obj in objs]
+        for start in range(0, len(pks), self.batch_size):
+            existing.update(
+                manager.filter(pk__in=pks[start : start + self.batch_size]).values_list(
+                    "pk", flat=True
+                )
+            )
+
+        fields = list(model._meta.local_concrete_fields)
+        update_fields = [field.name for field in fields if not field.primary_key]
+        to_update = [obj for obj in objs if obj.pk in existing]
+        to_insert = [obj for obj in objs if obj.pk not in existing]
+
+        if to_update and update_fields:
+            manager.bulk_update(to_update, update_fields, batch_size=self.batch_size)
+
+        for start in range(0, len(to_insert), self.batch_size):
+            # raw inserts store the values as they are, like `loaddata`
+            manager._insert(
+                to_insert[start : start + self.batch_size],
+                fields=fields,
+                using=self.using,
+                raw=True,
+            )
+
+        self.load_m2m(model, deserialized)
+
+    def load_m2m(self, model, deserialized):
+        for field in _m2m_fields(model):
+            through = field.remote_field.through
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+            values = [
+                (obj.object.pk, value)
+                for obj in deserialized
+                if field.name in obj.m2m_data
+                for value in obj.m2m_data[field.name]
+            ]
+            pks = [obj.object.pk for obj in deserialized if field.name in obj.m2m_data]
+
+            manager = through._base_manager.db_manager(self.using)
+            manager.filter(**{f"{source}__in": pks}).delete()
+            manager.bulk_create(
+                [
+                    through(**{f"{source}_id": pk, f"{target}_id": value})
+                    for pk, value in values
+                ],
+                batch_size=self.batch_size,
+            )
+
+    def _write(self, message):
+        if self.stdout:
+            self.stdout.write(message)
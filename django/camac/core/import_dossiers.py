@@ -1,6 +1,3 @@
-import shutil
-from pathlib import Path
-
 from caluma.caluma_form.models import Answer, Document, Question
 from caluma.caluma_user.models import BaseUser
 from django.conf import settings
@@ -9,6 +6,7 @@ from rest_framework.exceptions import ValidationError
 
 from camac.core.models import AuthorityLocation
 from camac.document.models import Attachment, AttachmentSection
+from camac.document.storage import save_attachment_file
 from camac.instance import domain_logic, models
 from camac.user.models import Group, Location, User
 
@@ -131,25 +129,24 @@ def _write_attachments(instance, data):
     group = Group.objects.get(group_id=GROUP_KOOR_ARE_BG_ID)
 
     for document in data["documents"]:
-        path = f"{settings.MEDIA_ROOT}/attachments/files/{instance.pk}"
-        Path(path).mkdir(parents=True, exist_ok=True)
-        with open(f'{path}/{document["name"]}', "wb") as output_file:
-            document["data"].seek(0)
-            shutil.copyfileobj(document["data"], output_file)
-
-            attachment = Attachment.objects.create(
-                instance=instance,
-                user=user,
-                service=group.service,
-                group=group,
-                name=document["name"],
-                context={},
-                path=f"attachments/files/{instance.pk}/{document['name']}",
-                size=output_file.truncate(),
-                date=now(),
-                mime_type="application/pdf",
-            )
-            attachment_section = AttachmentSection.objects.get(
-                attachment_section_id=document["section"]
-            )
-            attachment_section.attachments.add(attachment)
+        document["data"].seek(0)
+        path = save_attachment_file(
+            f"attachments/files/{instance.pk}/{document['name']}", document["data"]
+        )
+
+        attachment = Attachment.objects.create(
+            instance=instance,
+            user=user,
+            service=group.service,
+            group=group,
+            name=document["name"],
+            context={},
+            path=path,
+            size=Attachment.path.field.storage.size(path),
+            date=now(),
+            mime_type="application/pdf",
+        )
+        attachment_section = AttachmentSection.objects.get(
+            attachment_section_id=document["section"]
+        )
+        attachment_section.attachments.add(attachment)
@@ -1,13 +1,17 @@
 import collections
 import itertools
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from django.apps import apps
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.core.serializers.json import Serializer
+from django.db import connection
 
 from camac import dump_settings as config
+from camac.core.fixtures import iterate_for_dump
 
 
 class CamacDumpSerializer(Serializer):
@@ -34,14 +38,46 @@ class Command(BaseCommand):
             default=settings.APPLICATION_DIR("config"),
             help="Output dir for config files",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of files which are written concurrently",
+        )
 
-    def dump(self, output_dir):
-        serializer = CamacDumpSerializer()
+    def dump_group(self, output_dir, group_name, querysets):
+        start = time.monotonic()
+        filename = os.path.join(output_dir, f"{group_name}.json")
 
-        for group_name, querysets in self.groups.items():
-            filename = os.path.join(output_dir, f"{group_name}.json")
+        try:
             with open(filename, "w") as out:
-                serializer.serialize(itertools.chain(*querysets), indent=2, stream=out)
+                # objects are written to the file as they are fetched
+                CamacDumpSerializer().serialize(
+                    itertools.chain.from_iterable(
+                        iterate_for_dump(queryset) for queryset in querysets
+                    ),
+                    indent=2,
+                    stream=out,
+                )
+        finally:
+            if self.workers > 1:
+                # every thread has its own connection
+                connection.close()
+
+        self.stdout.write(f"Dumped {filename} in {time.monotonic() - start:.2f}s")
+
+    def dump(self, output_dir):
+        if self.workers == 1:
+            for group_name, querysets in self.groups.items():
+                self.dump_group(output_dir, group_name, querysets)
+            return
+
+        with ThreadPoolExecutor(self.workers) as executor:
+            for future in [
+                executor.submit(self.dump_group, output_dir, group_name, querysets)
+                for group_name, querysets in self.groups.items()
+            ]:
+                future.result()
 
     def get_groups(self):
         return {
@@ -68,6 +104,8 @@ class Command(BaseCommand):
         ]
 
     def handle(self, *app_labels, **options):
+        self.workers = options["workers"]
+
         for model_identifier, app_label, model_label, group_only in self.get_models():
             model = apps.get_model(app_label, model_label)
 
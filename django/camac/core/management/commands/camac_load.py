@@ -1,4 +1,5 @@
 import os
+import time
 from glob import glob
 
 from django.apps import apps
@@ -8,6 +9,7 @@ from django.core.management import call_command
 from django.core.management.base import BaseCommand
 
 from camac import dump_settings as config
+from camac.core.fixtures import FixtureLoader
 
 
 class Command(BaseCommand):
@@ -21,6 +23,12 @@ class Command(BaseCommand):
             "See settings.SEQUENCE_NAMESPACES",
             required=False,
         )
+        parser.add_argument(
+            "--loaddata",
+            default=False,
+            action="store_true",
+            help="Load the fixtures with Django's loaddata instead of bulk inserts",
+        )
 
     def get_fixtures_in_path(self, path):
         return sorted(glob(os.path.join(path, "*.json")))
@@ -52,7 +60,14 @@ class Command(BaseCommand):
         for fixture in fixtures:
             self.stdout.write(f"- {fixture}")
 
-        call_command("loaddata", *fixtures)
+        if options["loaddata"]:
+            call_command("loaddata", *fixtures)
+        else:
+            start = time.monotonic()
+            count = FixtureLoader(stdout=self.stdout).load(fixtures)
+            self.stdout.write(
+                f"Installed {count} object(s) in {time.monotonic() - start:.2f}s"
+            )
 
         sequence_apps = settings.APPLICATION.get("SEQUENCE_NAMESPACE_APPS")
         if sequence_apps and options["user"]:
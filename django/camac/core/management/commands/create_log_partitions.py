@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from camac.core.partitioning import PARTITIONED_MODELS, create_partitions
+
+
+class Command(BaseCommand):
+    help = "Create the monthly partitions of the log tables for the next months."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            default=3,
+            type=int,
+            help="Number of months to create partitions for in advance.",
+        )
+
+    def handle(self, *args, **options):
+        for model_label in PARTITIONED_MODELS:
+            created = create_partitions(model_label, options["months"])
+            self.stdout.write(f"Created {created} partitions for {model_label}")
@@ -5,6 +5,8 @@ from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
+from camac.core.partitioning import PARTITIONED_MODELS, drop_partitions
+
 log_models = (
     "core.InstanceLog",
     "core.InstanceLocationLog",
@@ -33,6 +35,10 @@ class Command(BaseCommand):
         clean_till = timezone.now() - timedelta(days=days)
         for model_name in log_models:
             self.stdout.write("Clean logs table {0}".format(model_name))
+            if model_name in PARTITIONED_MODELS:
+                # drop whole months first, only the rest is deleted row by row
+                drop_partitions(model_name, clean_till)
+
             (app_label, model_name) = model_name.split(".")
             model = apps.get_model(app_label=app_label, model_name=model_name)
 
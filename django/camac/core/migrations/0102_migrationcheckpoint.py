@@ -0,0 +1,26 @@
+# Generated by Django 3.2.14 on 2022-08-16 09:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0101_delete_rcalumalist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MigrationCheckpoint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(db_index=True, max_length=255)),
+                ('first_pk', models.CharField(max_length=255)),
+                ('last_pk', models.CharField(max_length=255)),
+                ('rows', models.PositiveIntegerField()),
+                ('duration', models.FloatField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
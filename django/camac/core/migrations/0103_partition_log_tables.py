@@ -0,0 +1,47 @@
+# Generated by Django 3.2.14 on 2022-08-17 10:05
+
+from django.db import migrations
+
+from camac.core.partitioning import partition_table, unpartition_table
+
+LOG_MODELS = {
+    "core.ActivationAnswerLog": "modification_date",
+    "core.ActivationLog": "modification_date",
+    "core.AnswerLog": "modification_date",
+    "core.CirculationLog": "modification_date",
+    "core.InstanceLocationLog": "modification_date",
+    "core.InstanceLog": "modification_date",
+    "core.NoticeLog": "modification_date",
+    "user.UserGroupLog": "modification_date",
+    "auditlog.AuditLog": "timestamp",
+    "document.AttachmentDownloadHistory": "date_time",
+}
+
+
+def partition_log_tables(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for model_label, field in LOG_MODELS.items():
+            model = apps.get_model(model_label)
+            partition_table(
+                cursor, model._meta.db_table, model._meta.get_field(field).column
+            )
+
+
+def unpartition_log_tables(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for model_label in LOG_MODELS:
+            unpartition_table(cursor, apps.get_model(model_label)._meta.db_table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0102_migrationcheckpoint'),
+        ('user', '0016_set_superuser_and_is_staff'),
+        ('auditlog', '0002_alter_auditlog_system_info'),
+        ('document', '0030_attachment_storage'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_log_tables, unpartition_log_tables),
+    ]
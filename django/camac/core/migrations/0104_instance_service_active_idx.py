@@ -0,0 +1,17 @@
+# Generated by Django 3.2.14 on 2022-08-24 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0103_partition_log_tables'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='instanceservice',
+            index=models.Index(condition=models.Q(('active', 1)), fields=['instance', '-id'], name='instance_service_active_idx'),
+        ),
+    ]
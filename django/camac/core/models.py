@@ -3,7 +3,7 @@ import json
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
 from django.db import models
-from django.utils import translation
+from django.utils import timezone, translation
 
 
 class MultilingualModel:
@@ -749,6 +749,26 @@ class Answer(models.Model):
     item = models.IntegerField(db_column="ITEM")
     answer = models.TextField(db_column="ANSWER")
 
+    def get_value(self):
+        """Return the answer, with the labels of the selected options if any."""
+
+        def _json_valid_or_none(data):
+            try:
+                return json.loads(data)
+            except json.decoder.JSONDecodeError:
+                return None
+
+        option_values = _json_valid_or_none(self.answer)
+        if option_values and self.question.answerlist.exists():
+            # make the extra effort to get the correct ordering
+            option_labels = {
+                vl.value: vl.get_name()
+                for vl in self.question.answerlist.all().filter(value__in=option_values)
+            }
+            return ", ".join(option_labels.get(val, "") for val in option_values)
+
+        return self.answer
+
     @staticmethod
     def get_value_by_cqi(
         instance, chapter, question, item, *, default=None, fail_on_not_found=False
@@ -763,29 +783,10 @@ class Answer(models.Model):
         pass in another fallback value by passing `default=your_value`.
         """
 
-        def _json_valid_or_none(data):
-            try:
-                return json.loads(data)
-            except json.decoder.JSONDecodeError:
-                return None
-
         try:
-            ans = Answer.objects.get(
+            return Answer.objects.get(
                 instance=instance, question=question, chapter=chapter, item=item
-            )
-            option_values = _json_valid_or_none(ans.answer)
-            if option_values and ans.question.answerlist.exists():
-                # make the extra effort to get the correct ordering
-                option_labels = {
-                    vl.value: vl.get_name()
-                    for vl in ans.question.answerlist.all().filter(
-                        value__in=option_values
-                    )
-                }
-                return ", ".join(option_labels.get(val, "") for val in option_values)
-            else:
-                return ans.answer
-
+            ).get_value()
         except Answer.DoesNotExist:
             if fail_on_not_found:
                 raise
@@ -3880,6 +3881,13 @@ class InstanceService(models.Model):
     class Meta:
         managed = True
         db_table = "INSTANCE_SERVICE"
+        indexes = [
+            models.Index(
+                fields=["instance", "-id"],
+                condition=models.Q(active=1),
+                name="instance_service_active_idx",
+            )
+        ]
 
 
 class InstanceParent(models.Model):
@@ -4304,3 +4312,17 @@ class IrTaskform(models.Model):
     class Meta:
         managed = True
         db_table = "IR_TASKFORM"
+
+
+class MigrationCheckpoint(models.Model):
+    """Chunk of a data migration which has been completed.
+
+    See `camac.core.chunked_migration.MigrationRunner`.
+    """
+
+    name = models.CharField(max_length=255, db_index=True)
+    first_pk = models.CharField(max_length=255)
+    last_pk = models.CharField(max_length=255)
+    rows = models.PositiveIntegerField()
+    duration = models.FloatField()
+    created_at = models.DateTimeField(default=timezone.now)
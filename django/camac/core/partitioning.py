@@ -0,0 +1,268 @@
+"""Monthly range partitioning of the log and history tables.
+
+Every table is partitioned by month on its timestamp column. A default
+partition catches rows outside of the existing partitions, so inserts never
+fail when `create_log_partitions` hasn't been run in time. Retention drops
+whole partitions instead of deleting rows.
+"""
+from datetime import date
+
+from django.apps import apps
+from django.db import connection, transaction
+
+# model label: timestamp field
+PARTITIONED_MODELS = {
+    "core.ActivationAnswerLog": "modification_date",
+    "core.ActivationLog": "modification_date",
+    "core.AnswerLog": "modification_date",
+    "core.CirculationLog": "modification_date",
+    "core.InstanceLocationLog": "modification_date",
+    "core.InstanceLog": "modification_date",
+    "core.NoticeLog": "modification_date",
+    "user.UserGroupLog": "modification_date",
+    "auditlog.AuditLog": "timestamp",
+    "document.AttachmentDownloadHistory": "date_time",
+}
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(day, months):
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_{month:%Y_%m}"
+
+
+def default_partition_name(table):
+    return f"{table}_default"
+
+
+def get_table(model_label):
+    """Return the table and the partition key column of a model."""
+    model = apps.get_model(model_label)
+    field = model._meta.get_field(PARTITIONED_MODELS[model_label])
+    return model._meta.db_table, field.column
+
+
+def partition_table(cursor, table, column, months_ahead=3):
+    """Convert an existing table to a partitioned table.
+
+    The primary key is extended by the partition key as postgres requires
+    it; indexes, foreign keys and the sequence of the primary key are taken
+    over. Partitions are created from the oldest row up to `months_ahead`
+    months in the future.
+    """
+    cursor.execute(
+        """
+        SELECT indexdef FROM pg_indexes
+        WHERE tablename = %s AND indexname NOT IN (
+            SELECT conname FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype IN ('p', 'u')
+        )
+        """,
+        [table, f'"{table}"'],
+    )
+    indexes = [row[0] for row in cursor.fetchall()]
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype = 'f'
+        """,
+        [f'"{table}"'],
+    )
+    foreign_keys = cursor.fetchall()
+    cursor.execute(
+        """
+        SELECT a.attname FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE i.indrelid = %s::regclass AND i.indisprimary
+        """,
+        [f'"{table}"'],
+    )
+    pk_columns = [row[0] for row in cursor.fetchall()]
+    cursor.execute(f'SELECT MIN("{column}") FROM "{table}"')
+    oldest = cursor.fetchone()[0]
+
+    old_table = f"{table}_unpartitioned"
+    cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{old_table}"')
+    cursor.execute(
+        f'CREATE TABLE "{table}" (LIKE "{old_table}" INCLUDING DEFAULTS '
+        f'INCLUDING CONSTRAINTS) PARTITION BY RANGE ("{column}")'
+    )
+    cursor.execute(
+        f'CREATE TABLE "{default_partition_name(table)}" PARTITION OF "{table}" DEFAULT'
+    )
+
+    today = month_start(date.today())
+    month = month_start(oldest) if oldest else today
+    while month <= add_months(today, months_ahead):
+        _create_partition(cursor, table, month)
+        month = add_months(month, 1)
+
+    cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{old_table}"')
+
+    # keep the sequence of the primary key when dropping the old table
+    for pk_column in pk_columns:
+        cursor.execute(
+            "SELECT pg_get_serial_sequence(%s, %s)", [f'"{old_table}"', pk_column]
+        )
+        sequence = cursor.fetchone()[0]
+        if sequence:
+            cursor.execute(
+                f'ALTER SEQUENCE {sequence} OWNED BY "{table}"."{pk_column}"'
+            )
+
+    cursor.execute(f'DROP TABLE "{old_table}"')
+
+    pk = ", ".join(f'"{col}"' for col in pk_columns + [column])
+    cursor.execute(f'ALTER TABLE "{table}" ADD PRIMARY KEY ({pk})')
+    for indexdef in indexes:
+        cursor.execute(indexdef.replace(" ONLY ", " "))
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+
+
+def unpartition_table(cursor, table):
+    """Convert a partitioned table back to a regular table."""
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype = 'f'
+        """,
+        [f'"{table}"'],
+    )
+    foreign_keys = cursor.fetchall()
+    cursor.execute(
+        """
+        SELECT indexdef FROM pg_indexes
+        WHERE tablename = %s AND indexname NOT IN (
+            SELECT conname FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = 'p'
+        )
+        """,
+        [table, f'"{table}"'],
+    )
+    indexes = [row[0] for row in cursor.fetchall()]
+    cursor.execute(
+        """
+        SELECT a.attname FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE i.indrelid = %s::regclass AND i.indisprimary
+        ORDER BY array_position(i.indkey::int2[], a.attnum)
+        """,
+        [f'"{table}"'],
+    )
+    pk_column = cursor.fetchone()[0]
+
+    old_table = f"{table}_partitioned"
+    cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{old_table}"')
+    cursor.execute(
+        f'CREATE TABLE "{table}" (LIKE "{old_table}" INCLUDING DEFAULTS '
+        "INCLUDING CONSTRAINTS)"
+    )
+    cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{old_table}"')
+    cursor.execute(
+        "SELECT pg_get_serial_sequence(%s, %s)", [f'"{old_table}"', pk_column]
+    )
+    sequence = cursor.fetchone()[0]
+    if sequence:
+        cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY "{table}"."{pk_column}"')
+    cursor.execute(f'DROP TABLE "{old_table}" CASCADE')
+    cursor.execute(f'ALTER TABLE "{table}" ADD PRIMARY KEY ("{pk_column}")')
+
+    for indexdef in indexes:
+        cursor.execute(indexdef.replace(" ONLY ", " "))
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+
+
+def _create_partition(cursor, table, month):
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(table, month)}" '
+        f'PARTITION OF "{table}" FOR VALUES FROM (%s) TO (%s)',
+        [month.isoformat(), add_months(month, 1).isoformat()],
+    )
+
+
+def get_partitions(cursor, table):
+    """Return the months of the existing partitions of a table."""
+    cursor.execute(
+        """
+        SELECT child.relname FROM pg_inherits
+        JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+        JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+        WHERE parent.relname = %s
+        """,
+        [table],
+    )
+    months = []
+
+    for (name,) in cursor.fetchall():
+        if name == default_partition_name(table):
+            continue
+        year, month = name[len(table) + 1 :].split("_")
+        months.append(date(int(year), int(month), 1))
+
+    return sorted(months)
+
+
+def create_partitions(model_label, months_ahead):
+    """Create the partitions up to `months_ahead` months in the future.
+
+    Rows of the new months which have been written to the default partition
+    are moved to the new partitions.
+
+    :return: number of created partitions
+    """
+    table, column = get_table(model_label)
+    default = default_partition_name(table)
+    created = 0
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        existing = set(get_partitions(cursor, table))
+
+        for months in range(months_ahead + 1):
+            month = add_months(date.today(), months)
+            if month in existing:
+                continue
+
+            cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{default}"')
+            _create_partition(cursor, table, month)
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM "{default}" '
+                f'WHERE "{column}" >= %s AND "{column}" < %s RETURNING *) '
+                f'INSERT INTO "{table}" SELECT * FROM moved',
+                [month, add_months(month, 1)],
+            )
+            cursor.execute(
+                f'ALTER TABLE "{table}" ATTACH PARTITION "{default}" DEFAULT'
+            )
+            created += 1
+
+    return created
+
+
+def drop_partitions(model_label, before):
+    """Drop all partitions which only contain rows older than `before`.
+
+    :return: number of dropped partitions
+    """
+    table, _ = get_table(model_label)
+    dropped = 0
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for month in get_partitions(cursor, table):
+            if add_months(month, 1) > before.date():
+                continue
+
+            name = partition_name(table, month)
+            cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+            cursor.execute(f'DROP TABLE "{name}"')
+            dropped += 1
+
+    return dropped
@@ -0,0 +1,87 @@
+import pytest
+from caluma.caluma_workflow.models import WorkItem
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from camac.core.chunked_migration import ChunkedMigrationCommand, MigrationRunner
+from camac.core.models import MigrationCheckpoint
+
+
+@pytest.fixture
+def publications(db, work_item_factory, task_factory):
+    task = task_factory(slug="fill-publication")
+    return work_item_factory.create_batch(5, task=task, closed_by_user=None)
+
+
+def test_migration_runner_chunks(publications):
+    runner = MigrationRunner(
+        "test", WorkItem.objects.all(), lambda work_items: None, chunk_size=2
+    )
+    chunks = runner.chunks()
+
+    pks = sorted(work_item.pk for work_item in publications)
+    assert chunks == [(pks[0], pks[1]), (pks[2], pks[3]), (pks[4], pks[4])]
+
+    assert runner.run() == 5
+    assert MigrationCheckpoint.objects.filter(name="test").count() == 3
+
+    # all chunks are completed
+    assert runner.chunks() == []
+
+
+def test_migration_runner_resume(publications):
+    migrated = []
+    fail = True
+
+    def migrate_chunk(work_items):
+        if fail and migrated:
+            raise ValueError("Failed")
+
+        for work_item in work_items:
+            work_item.meta["migrated"] = True
+            work_item.save()
+            migrated.append(work_item.pk)
+
+    runner = MigrationRunner(
+        "test", WorkItem.objects.all(), migrate_chunk, chunk_size=2
+    )
+
+    with pytest.raises(ValueError):
+        runner.run()
+
+    # the first chunk is committed
+    assert WorkItem.objects.filter(meta__migrated=True).count() == 2
+    assert MigrationCheckpoint.objects.get(name="test").rows == 2
+
+    migrated.clear()
+    fail = False
+    runner.run()
+
+    assert len(migrated) == 3
+    assert WorkItem.objects.filter(meta__migrated=True).count() == 5
+
+
+@pytest.mark.parametrize("dry", [True, False])
+def test_chunked_migration_command(publications, dry):
+    call_command("migrate_is_published", chunk_size=2, dry=dry)
+
+    assert WorkItem.objects.filter(meta__has_key="is-published").count() == (
+        0 if dry else 5
+    )
+    assert MigrationCheckpoint.objects.filter(name="migrate_is_published").count() == (
+        0 if dry else 3
+    )
+
+
+def test_chunked_migration_command_abstract():
+    class Command(ChunkedMigrationCommand):
+        def get_queryset(self, options):
+            return WorkItem.objects.all()
+
+    with pytest.raises(TypeError):
+        Command()
+
+
+def test_distribution_migrate_reset_dry(db):
+    with pytest.raises(CommandError):
+        call_command("distribution_migrate", reset=True, dry=True)
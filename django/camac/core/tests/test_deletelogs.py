@@ -1,9 +1,12 @@
 import os
+from datetime import date
 
 import pytest
 from django.core.management import call_command
+from django.db import connection
 
 from camac.core.models import InstanceLog
+from camac.core.partitioning import get_partitions
 
 
 @pytest.mark.freeze_time("2017-7-27")
@@ -19,3 +22,37 @@ def test_deletelogs(db):
 
     assert InstanceLog.objects.count() == 1
     assert InstanceLog.objects.first().id == 1
+
+
+def test_deletelogs_partitions(db, freezer):
+    freezer.move_to("2017-07-27")
+    InstanceLog.objects.create(
+        id=1, action="test", user_id=1, modification_date="2017-07-26 13:09:56+00:00"
+    )
+    call_command("create_log_partitions", months=1, stdout=open(os.devnull, "w"))
+
+    with connection.cursor() as cursor:
+        partitions = get_partitions(cursor, "INSTANCE_LOG")
+        assert date(2017, 7, 1) in partitions
+        assert date(2017, 8, 1) in partitions
+
+        # the log has been moved from the default partition
+        cursor.execute('SELECT COUNT(*) FROM "INSTANCE_LOG_2017_07"')
+        assert cursor.fetchone()[0] == 1
+
+    InstanceLog.objects.create(
+        id=2, action="test", user_id=1, modification_date="2017-08-26 13:09:56+00:00"
+    )
+    InstanceLog.objects.create(
+        id=3, action="test", user_id=1, modification_date="2017-04-25 23:09:56+00:00"
+    )
+
+    freezer.move_to("2017-08-30")
+    call_command("deletelogs", days=10, stdout=open(os.devnull, "w"))
+
+    with connection.cursor() as cursor:
+        partitions = get_partitions(cursor, "INSTANCE_LOG")
+        assert date(2017, 7, 1) not in partitions
+        assert date(2017, 8, 1) in partitions
+
+    assert list(InstanceLog.objects.values_list("id", flat=True)) == [2]
@@ -3,9 +3,13 @@ import os
 from glob import glob
 
 import pytest
+from caluma.caluma_form.models import Option
 from django.conf import settings
+from django.core import serializers
 from django.core.management import call_command
 
+from camac.core.fixtures import FixtureLoader
+
 
 @pytest.mark.parametrize("application", settings.APPLICATIONS.keys())
 def test_dump_and_load(db, settings, application, tmpdir):
@@ -46,3 +50,20 @@ def test_dump_and_load(db, settings, application, tmpdir):
                 assert json.load(test_dumped) == json.load(
                     dumped
                 ), f"Dumped file '{filename}' does not match '{filepath}'"
+
+
+def test_fixture_loader(db, option_factory, tmpdir):
+    options = option_factory.create_batch(2)
+    fixture = tmpdir.join("options.json")
+    fixture.write(serializers.serialize("json", options))
+
+    options[0].delete()
+    Option.objects.filter(pk=options[1].pk).update(meta={"changed": True})
+
+    assert FixtureLoader().load([str(fixture)]) == 2
+
+    for option in options:
+        loaded = Option.objects.get(pk=option.pk)
+        assert loaded.meta == option.meta
+        # values are stored as they are in the fixture
+        assert loaded.created_at == option.created_at
@@ -2,6 +2,7 @@ from typing import Callable
 
 from caluma.caluma_workflow.models import Case
 from django.conf import settings
+from django.db import connection
 from django.db.models import CharField, IntegerField
 from django.db.models.fields.json import KeyTextTransform
 from django.db.models.functions import Cast, Substr
@@ -13,7 +14,20 @@ from camac.instance.models import HistoryEntry, HistoryEntryT, Instance
 from camac.user.models import User
 
 
+def lock_sequence(key: str):
+    """Serialize the allocation of numbers of the sequence `key`.
+
+    Takes a transaction level advisory lock, so concurrent transactions
+    (e.g. multiple import workers) can't allocate the same number before the
+    one holding the lock has committed.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [key])
+
+
 def generate_ebau_nr(year: int) -> str:
+    lock_sequence(f"ebau-number-{year}")
+
     max_number = (
         Case.objects.filter(**{"meta__ebau-number__startswith": year})
         .annotate(
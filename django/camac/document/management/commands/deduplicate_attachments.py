@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from camac.document.models import Attachment
+
+
+class Command(BaseCommand):
+    help = """Converts the files of existing attachments into links to their
+    content addressed blobs so identical files are only stored once."""
+
+    def handle(self, *args, **options):
+        storage = Attachment.path.field.storage
+
+        if not hasattr(storage, "deduplicate"):
+            raise CommandError(
+                "ATTACHMENT_STORAGE needs to be a content addressed storage"
+            )
+
+        names = Attachment.objects.values_list("path", flat=True).iterator()
+        missing = 0
+        for name in names:
+            if not storage.exists(name):
+                missing += 1
+                continue
+
+            storage.deduplicate(name)
+
+        if missing:
+            self.stdout.write(f"Skipped {missing} attachments with missing files")
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.14 on 2022-08-01 09:00
+
+from django.db import migrations, models
+
+import camac.document.models
+import camac.document.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("document", "0029_alter_attachment_context"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="attachment",
+            name="path",
+            field=models.FileField(
+                db_column="PATH",
+                max_length=1024,
+                storage=camac.document.storage.attachment_storage,
+                upload_to=camac.document.models.attachment_path_directory_path,
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 3.2.14 on 2022-08-24 10:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('document', '0030_attachment_storage'),
+    ]
+
+    operations = [
+        # The unique constraint covers lookups by attachment; this index
+        # covers the visibility subqueries which start from the sections.
+        migrations.RunSQL(
+            'CREATE INDEX attachment_sections_section_idx ON '
+            '"ATTACHMENT_attachment_sections" (attachmentsection_id, attachment_id);',
+            'DROP INDEX IF EXISTS attachment_sections_section_idx;',
+        ),
+    ]
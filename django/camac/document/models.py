@@ -10,6 +10,7 @@ from django.utils import timezone
 from camac.core import models as core_models
 
 from . import permissions
+from .storage import attachment_storage
 
 
 def attachment_path_directory_path(attachment, filename):
@@ -28,7 +29,10 @@ class Attachment(models.Model):
         related_name="attachments",
     )
     path = models.FileField(
-        db_column="PATH", max_length=1024, upload_to=attachment_path_directory_path
+        db_column="PATH",
+        max_length=1024,
+        upload_to=attachment_path_directory_path,
+        storage=attachment_storage,
     )
     size = models.IntegerField(db_column="SIZE")
     date = models.DateTimeField(db_column="DATE", default=timezone.now)
@@ -1,7 +1,8 @@
 from caluma.caluma_workflow.models import Case, WorkItem
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 
+from camac.applicants.models import Applicant
 from camac.constants import kt_uri as uri_constants
 from camac.instance.models import Instance
 
@@ -197,6 +198,17 @@ def _is_general_instance(group, instance):
     return not _is_internal_instance(group, instance)
 
 
+def is_involved_applicant(request):
+    """Filter attachments of instances the user is invited to."""
+    return Q(
+        Exists(
+            Applicant.objects.filter(
+                instance_id=OuterRef("instance_id"), invitee=request.user
+            )
+        )
+    )
+
+
 # Permissions configuration:
 # Top-Level keys are the internal role names. The second-level keys are
 # the permissions, followed by a list of sections where the permission applies.
@@ -361,10 +373,10 @@ PERMISSIONS = {
 # if this feature not used!
 LOOSEN_FILTERS = {
     "kt_bern": lambda request: Q(
-        context__isDecision=True, instance__involved_applicants__invitee=request.user
+        Q(context__isDecision=True), is_involved_applicant(request)
     ),
     "kt_uri": lambda request: (
-        Q(context__isDecision=True, instance__involved_applicants__invitee=request.user)
+        Q(Q(context__isDecision=True), is_involved_applicant(request))
     ),
     # in test mode, we don't want to complicate the setup, so we don't enforce
     # user to be invitee
@@ -403,22 +415,66 @@ PERMISSION_ORDERED = [
 ]
 
 
-def rebuild_app_permissions(permissions, group, instance):
+def _build_role_permissions(role_permissions, applies):
     result = {}
-    for role, value in permissions.items():
-        result[role] = {}
-        for permission, sections in value.items():
-            if type(sections) is tuple:
-                is_visible, sections = sections
-                if instance and not is_visible(group, instance):
-                    continue
-
-            for section in sections:
-                result[role][section] = permission
+    for permission, sections in role_permissions.items():
+        if type(sections) is tuple:
+            is_visible, sections = sections
+            if not applies(is_visible):
+                continue
+
+        for section in sections:
+            result[section] = permission
     return result
 
 
-def section_permissions(group, instance=None):
+def rebuild_app_permissions(permissions, group, instance):
+    return {
+        role: _build_role_permissions(
+            value, lambda is_visible: not instance or is_visible(group, instance)
+        )
+        for role, value in permissions.items()
+    }
+
+
+# application name: (PERMISSIONS of the application, built role permissions)
+_role_permissions_cache = {}
+
+
+def _get_role_permissions(app_name, role, group, instance):
+    """Return the section permissions of a role.
+
+    The permissions are built once per role and outcome of the visibility
+    predicates, so only the predicates are evaluated for every instance.
+    """
+    app_permissions = PERMISSIONS[app_name]
+    source, cache = _role_permissions_cache.get(app_name, (None, None))
+    if source is not app_permissions:
+        # rebuild when the configuration was replaced, e.g. in tests
+        cache = {}
+        _role_permissions_cache[app_name] = (app_permissions, cache)
+
+    role_permissions = app_permissions.get(role, {})
+    predicates = dict.fromkeys(
+        sections[0] for sections in role_permissions.values() if type(sections) is tuple
+    )
+    visible = frozenset(
+        predicate
+        for predicate in predicates
+        if not instance or predicate(group, instance)
+    )
+
+    key = (role, visible, bool(instance))
+    if key not in cache:
+        cache[key] = _build_role_permissions(
+            role_permissions,
+            lambda is_visible: not instance or is_visible in visible,
+        )
+
+    return cache[key]
+
+
+def _section_permissions(group, instance):
     role = group.role.name
     app_name = settings.APPLICATION_NAME
 
@@ -439,26 +495,46 @@ def section_permissions(group, instance=None):
         if not instance.instance_services.filter(service=group.service).exists():
             role = role.replace("municipality-", "service-")
 
-    all_app_permissions = rebuild_app_permissions(
-        PERMISSIONS[app_name], group, instance
-    )
     role_perms = settings.APPLICATIONS[app_name].get("ROLE_PERMISSIONS", {})
     role_name_int = role_perms.get(role, role).lower()
-    if role_name_int not in all_app_permissions:
+    if role_name_int not in PERMISSIONS[app_name]:
         # fallback
         role_name_int = role.lower()
 
-    app_permissions = all_app_permissions.get(role_name_int, {})
+    app_permissions = dict(
+        _get_role_permissions(app_name, role_name_int, group, instance)
+    )
     special_permissions = SPECIAL_PERMISSIONS.get(app_name, lambda _: None)(group)
 
     if not special_permissions:
         return app_permissions
 
     for section, special_permission in special_permissions.items():
-        regular_permission = all_app_permissions[role_name_int].get(section)
+        regular_permission = app_permissions.get(section)
         if not regular_permission or PERMISSION_ORDERED.index(
             special_permission
         ) > PERMISSION_ORDERED.index(regular_permission):
             app_permissions[section] = special_permission
 
     return app_permissions
+
+
+def section_permissions(group, instance=None):
+    """Return the permission of the group on every section.
+
+    The result is memoized on the group, which is loaded for every request,
+    so listing many sections or attachments only computes it once per
+    instance.
+    """
+    instance_pk = instance.pk if isinstance(instance, Instance) else instance
+    key = (settings.APPLICATION_NAME, str(instance_pk) if instance_pk else None)
+
+    memo = getattr(group, "_section_permissions", None)
+    if memo is None:
+        memo = {}
+        group._section_permissions = memo
+
+    if key not in memo:
+        memo[key] = _section_permissions(group, instance)
+
+    return memo[key]
@@ -0,0 +1,147 @@
+import hashlib
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.module_loading import import_string
+
+
+def attachment_storage():
+    """Return the storage used for the files of attachments.
+
+    Configured through `ATTACHMENT_STORAGE`. A dedicated instance is returned
+    even when it's the same class as the default storage, as `FileField`
+    leaves out `default_storage` when deconstructing and the field wouldn't
+    match its migration anymore.
+    """
+    return import_string(settings.ATTACHMENT_STORAGE)()
+
+
+def save_attachment_file(name, content):
+    """Store `content` under `name` in the attachment storage.
+
+    An existing file with the same name is replaced. Returns the stored name.
+    """
+    attachment_model = apps.get_model("document", "Attachment")
+    storage = attachment_model._meta.get_field("path").storage
+
+    if storage.exists(name):
+        storage.delete(name)
+
+    return storage.save(name, File(content))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage which keeps every distinct content only once.
+
+    The content of a file is written once as a blob named after its SHA-256
+    digest (below `blob_directory`). The name returned to the caller (e.g.
+    `attachments/files/<instance>/<filename>`) is a hard link to that blob,
+    so storing the same content again only costs a new directory entry.
+
+    The link count of a blob serves as its reference count: when the last
+    name pointing to a blob is deleted, the blob is deleted as well. As the
+    names stay the same as with the `FileSystemStorage`, existing download
+    urls and the x-sendfile handling keep working.
+    """
+
+    blob_directory = "blobs"
+    chunk_size = 64 * 2**10
+
+    def blob_name(self, digest):
+        return os.path.join(self.blob_directory, digest[:2], digest[2:4], digest)
+
+    def _digest(self, content):
+        sha256 = hashlib.sha256()
+        for chunk in content.chunks(chunk_size=self.chunk_size):
+            sha256.update(chunk if isinstance(chunk, bytes) else chunk.encode())
+        content.seek(0)
+
+        return sha256.hexdigest()
+
+    def _digest_file(self, name):
+        with self.open(name, "rb") as f:
+            return self._digest(f)
+
+    def _store_blob(self, content):
+        digest = self._digest(content)
+        blob_name = self.blob_name(digest)
+
+        if not self.exists(blob_name):
+            # Write to a temporary name first and link the file in place
+            # afterwards so a blob is never visible half written. Unlike a
+            # rename, linking never replaces a blob which has been stored by
+            # a concurrent upload in the meantime (and is linked already).
+            tmp_name = super()._save(f"{blob_name}.partial", content)
+            try:
+                os.link(self.path(tmp_name), self.path(blob_name))
+            except FileExistsError:
+                pass  # already stored
+            finally:
+                os.remove(self.path(tmp_name))
+
+        return blob_name
+
+    def _link(self, blob_name, name):
+        os.makedirs(os.path.dirname(self.path(name)), exist_ok=True)
+
+        while True:
+            try:
+                os.link(self.path(blob_name), self.path(name))
+            except FileExistsError:
+                # name has been taken since `get_available_name` was called
+                name = self.get_available_name(name)
+            else:
+                return name
+
+    def _save(self, name, content):
+        blob_name = self._store_blob(content)
+        return self._link(blob_name, name).replace("\\", "/")
+
+    def link(self, source, name):
+        """Store the content of the existing file `source` under `name`.
+
+        Used for copying files (e.g. attachments of a modification) without
+        writing their content again.
+        """
+        blob_name = self.deduplicate(source)
+        return self._link(blob_name, self.get_available_name(name))
+
+    def deduplicate(self, name):
+        """Make sure the file `name` is a link to its blob and return the blob.
+
+        Used to convert files which have been written by the
+        `FileSystemStorage` or directly to the file system.
+        """
+        with self.open(name, "rb") as f:
+            blob_name = self._store_blob(f)
+
+        if not os.path.samefile(self.path(name), self.path(blob_name)):
+            tmp_path = f"{self.path(name)}.dedup"
+            os.link(self.path(blob_name), tmp_path)
+            os.replace(tmp_path, self.path(name))
+
+        return blob_name
+
+    def delete(self, name):
+        path = self.path(name)
+
+        try:
+            links = os.stat(path).st_nlink
+        except FileNotFoundError:
+            return
+
+        # The blob itself holds one link, so a name pointing to a blob
+        # which is not referenced anywhere else has two links.
+        blob_name = self.blob_name(self._digest_file(name)) if links == 2 else None
+
+        super().delete(name)
+
+        if (
+            blob_name
+            and self.exists(blob_name)
+            and os.stat(self.path(blob_name)).st_nlink == 1
+        ):
+            super().delete(blob_name)
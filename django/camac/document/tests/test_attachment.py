@@ -92,6 +92,81 @@ def test_attachment_list(
     assert (data[0]["attributes"]["webdav-link"] is not None) == (can_write and is_docx)
 
 
+@pytest.mark.parametrize(
+    "role__name,instance__user,invite",
+    [
+        # the instance's user is invited by the instance factory
+        ("Applicant", LazyFixture("admin_user"), False),
+        ("Reader", LazyFixture("user"), False),
+        ("Reader", LazyFixture("user"), True),
+        ("Canton", LazyFixture("user"), False),
+        ("Municipality", LazyFixture("user"), True),
+        ("Service", LazyFixture("user"), False),
+        ("Service", LazyFixture("user"), True),
+    ],
+)
+@pytest.mark.parametrize(
+    "mode", [permissions.ReadPermission, permissions.ReadInternalPermission]
+)
+def test_attachment_list_multiple_sections(
+    admin_client,
+    admin_user,
+    instance,
+    activation,
+    role,
+    mode,
+    invite,
+    mocker,
+    attachment_factory,
+    attachment_section_factory,
+    applicant_factory,
+    service_factory,
+):
+    url = reverse("attachment-list")
+    readable, hidden, applicant = attachment_section_factory.create_batch(3)
+    # other applicants mustn't duplicate the attachments
+    applicant_factory.create_batch(2, instance=instance)
+    if invite:
+        applicant_factory(instance=instance, invitee=admin_user)
+
+    def create_attachment(sections, service=None):
+        attachment = attachment_factory(
+            instance=instance,
+            service=service or admin_client.user.get_default_group().service,
+        )
+        attachment.attachment_sections.set(sections)
+        return attachment
+
+    # attachments in multiple sections mustn't be duplicated either
+    readable_attachment = create_attachment([readable, hidden])
+    foreign_attachment = create_attachment([readable], service=service_factory())
+    create_attachment([hidden])
+    applicant_attachment = create_attachment([applicant, hidden])
+
+    mocker.patch(
+        "camac.document.permissions.PERMISSIONS",
+        {
+            "demo": {
+                role.name.lower(): {mode: [readable.pk], "applicant": [applicant.pk]}
+            }
+        },
+    )
+
+    response = admin_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+
+    expected = [readable_attachment]
+    if mode == permissions.ReadPermission:
+        # internal sections only show the attachments of the own service
+        expected.append(foreign_attachment)
+    if invite or role.name == "Applicant":
+        expected.append(applicant_attachment)
+
+    assert sorted(entry["id"] for entry in response.json()["data"]) == sorted(
+        str(attachment.pk) for attachment in expected
+    )
+
+
 @pytest.mark.parametrize(
     "role__name,instance__user", [("Applicant", LazyFixture("admin_user"))]
 )
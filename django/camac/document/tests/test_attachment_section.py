@@ -188,6 +188,53 @@ def test_rebuild_app_permissions(
     }
 
 
+@pytest.mark.parametrize("role__name", ["trusted_service"])
+def test_section_permissions_cache(
+    db,
+    mocker,
+    group,
+    group_factory,
+    instance,
+    application_settings,
+    instance_state_factory,
+    django_assert_num_queries,
+):
+    application_settings["ATTACHMENT_INTERNAL_STATES"] = ["internal"]
+    mocker.patch(
+        "camac.document.permissions.PERMISSIONS",
+        {
+            "demo": {
+                "trusted_service": {
+                    permissions.ReadPermission: [1],
+                    permissions.AdminPermission: (
+                        permissions._is_general_instance,
+                        [2],
+                    ),
+                }
+            }
+        },
+    )
+
+    expected = {1: permissions.ReadPermission, 2: permissions.AdminPermission}
+    assert permissions.section_permissions(group, instance.pk) == expected
+
+    # memoized per group and instance
+    with django_assert_num_queries(0):
+        assert permissions.section_permissions(group, str(instance.pk)) == expected
+
+    assert permissions.section_permissions(group) == expected
+
+    instance.instance_state = instance_state_factory(name="internal")
+    instance.save()
+    instance.group.service = group.service
+    instance.group.save()
+
+    other_group = group_factory(role=group.role, service=group.service)
+    assert permissions.section_permissions(other_group, instance) == {
+        1: permissions.ReadPermission
+    }
+
+
 @pytest.mark.parametrize("role__name", ["municipality-lead"])
 @pytest.mark.parametrize(
     "is_involved,expected_permission", [(True, "admin"), (False, "read")]
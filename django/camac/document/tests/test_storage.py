@@ -0,0 +1,90 @@
+import os
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+
+from camac.document.storage import ContentAddressedStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return ContentAddressedStorage(location=str(tmp_path))
+
+
+def test_content_addressed_storage_deduplicates(storage):
+    first = storage.save("attachments/files/1/plan.pdf", ContentFile(b"content"))
+    second = storage.save("attachments/files/2/plan.pdf", ContentFile(b"content"))
+    other = storage.save("attachments/files/2/other.pdf", ContentFile(b"other"))
+
+    assert first == "attachments/files/1/plan.pdf"
+    assert os.path.samefile(storage.path(first), storage.path(second))
+    assert not os.path.samefile(storage.path(first), storage.path(other))
+    assert storage.open(second).read() == b"content"
+
+    # two links plus the blob itself
+    assert os.stat(storage.path(first)).st_nlink == 3
+    assert len(storage.listdir(storage.blob_directory)[0]) == 2
+
+
+def test_content_addressed_storage_delete(storage):
+    first = storage.save("attachments/files/1/plan.pdf", ContentFile(b"content"))
+    second = storage.save("attachments/files/2/plan.pdf", ContentFile(b"content"))
+    blob_path = storage.path(storage.blob_name(storage._digest_file(first)))
+
+    storage.delete(first)
+    assert not storage.exists(first)
+    assert os.path.exists(blob_path)
+
+    storage.delete(second)
+    assert not storage.exists(second)
+    assert not os.path.exists(blob_path)
+
+
+def test_content_addressed_storage_concurrent_blob(storage, mocker):
+    first = storage.save("attachments/files/1/plan.pdf", ContentFile(b"content"))
+
+    # the blob has been stored by another upload after the existence check
+    mocker.patch.object(storage, "exists", return_value=False)
+    second = storage.save("attachments/files/2/plan.pdf", ContentFile(b"content"))
+
+    assert os.path.samefile(storage.path(first), storage.path(second))
+    assert os.stat(storage.path(first)).st_nlink == 3
+    blob_directory = os.path.dirname(
+        storage.path(storage.blob_name(storage._digest_file(first)))
+    )
+    assert os.listdir(blob_directory) == [storage._digest_file(first)]
+
+
+def test_content_addressed_storage_link(storage, tmp_path):
+    # file written directly to the file system
+    (tmp_path / "attachments/files/1").mkdir(parents=True)
+    (tmp_path / "attachments/files/1/plan.pdf").write_bytes(b"content")
+
+    copy = storage.link("attachments/files/1/plan.pdf", "attachments/files/2/plan.pdf")
+
+    assert copy == "attachments/files/2/plan.pdf"
+    assert os.path.samefile(
+        storage.path("attachments/files/1/plan.pdf"), storage.path(copy)
+    )
+    assert os.stat(storage.path(copy)).st_nlink == 3
+
+
+def test_deduplicate_attachments(db, attachment_factory, mocker):
+    storage = ContentAddressedStorage()
+    mocker.patch.object(attachment_factory._meta.model.path.field, "storage", storage)
+
+    files = [f"attachments/files/{i}/plan.pdf" for i in range(3)]
+    for name in files:
+        os.makedirs(os.path.dirname(storage.path(name)), exist_ok=True)
+        with open(storage.path(name), "wb") as f:
+            f.write(b"content")
+        attachment_factory(path=name)
+    attachment_factory(path="attachments/files/4/missing.pdf")
+
+    call_command("deduplicate_attachments")
+
+    assert all(
+        os.path.samefile(storage.path(files[0]), storage.path(name))
+        for name in files[1:]
+    )
@@ -4,7 +4,7 @@ import os
 import zipfile
 
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from django.http import HttpResponse
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext as _
@@ -72,6 +72,17 @@ class FileUploadSwaggerAutoSchema(SwaggerAutoSchema):
         return natural_parameters + serializer_parameters
 
 
+def _in_sections(sections):
+    """Filter attachments which are in one of the given sections."""
+    return Q(
+        Exists(
+            models.Attachment.attachment_sections.through.objects.filter(
+                attachment_id=OuterRef("pk"), attachmentsection_id__in=list(sections)
+            )
+        )
+    )
+
+
 class AttachmentQuerysetMixin:
     @permission_aware
     def get_base_queryset(self):
@@ -118,22 +129,25 @@ class AttachmentQuerysetMixin:
             settings.APPLICATION_NAME, lambda _: Q(pk=0)
         )
 
+        # The conditions are subqueries instead of joins, so attachments in
+        # multiple sections or of instances with multiple applicants are not
+        # duplicated and no DISTINCT is needed.
         return queryset.filter(
             # first: directly readable sections
-            Q(attachment_sections__in=readable_sections)
+            _in_sections(readable_sections)
             # second: sections where only documents from my own service are readable
             | Q(
-                attachment_sections__in=internal_sections,
+                _in_sections(internal_sections),
                 service=self.request.group.service,
             )
             # third: documents where i'm invitee
             | Q(
-                Q(attachment_sections__in=applicant_sections),
-                Q(instance__involved_applicants__invitee=self.request.user)
+                _in_sections(applicant_sections),
+                permissions.is_involved_applicant(self.request)
                 | Q(instance__user=self.request.user),
             )
             | loosen_filter(self.request)
-        ).distinct()
+        )
 
     def get_base_queryset_for_public(self):
         return (
@@ -146,13 +160,11 @@ class AttachmentQuerysetMixin:
                 | Q(
                     context__isPublishedWithoutObligation=True,
                 )
-                | Q(
-                    attachment_sections__pk__in=settings.APPLICATION.get(
-                        "PUBLICATION_ATTACHMENT_SECTION", []
-                    )
+                | _in_sections(
+                    settings.APPLICATION.get("PUBLICATION_ATTACHMENT_SECTION", [])
                 )
             )
-        ).distinct()
+        )
 
 
 class AttachmentView(
@@ -1,20 +1,26 @@
 import os
 import re
+import time
 from dataclasses import asdict
+from datetime import timedelta
+from itertools import islice
 from logging import getLogger
 
 import requests
 from caluma.caluma_workflow.models import Case
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
 from django.utils import timezone
 from django.utils.module_loading import import_string
+from django_q.tasks import async_task
 from requests_toolbelt.multipart.encoder import MultipartEncoder
 
 from camac.core.utils import generate_ebau_nr
 from camac.document.models import Attachment
 from camac.dossier_import.loaders import XlsxFileDossierLoader
-from camac.dossier_import.messages import update_summary
-from camac.dossier_import.models import DossierImport
+from camac.dossier_import.messages import append_import_details, update_summary
+from camac.dossier_import.models import DossierImport, DossierImportChunk
 from camac.instance.models import Instance
 from camac.user.models import User
 from camac.utils import build_url
@@ -22,40 +28,51 @@ from camac.utils import build_url
 logger = getLogger(__name__)
 
 
+def get_writer(dossier_import):
+    IMPORT_SETTINGS = settings.APPLICATION["DOSSIER_IMPORT"]
+    configured_writer_cls = import_string(IMPORT_SETTINGS["WRITER_CLASS"])
+
+    return configured_writer_cls(
+        user_id=User.objects.get(username=IMPORT_SETTINGS["USER"]).pk,
+        group_id=dossier_import.group.pk,
+        location_id=dossier_import.location and dossier_import.location.pk,
+        import_settings=IMPORT_SETTINGS,
+    )
+
+
+def complete_import(dossier_import):
+    update_summary(dossier_import)
+    dossier_import.messages["import"]["summary"]["stats"] = {
+        "dossiers": Instance.objects.filter(
+            **{"case__meta__import-id": str(dossier_import.pk)}
+        ).count(),
+        "attachments": Attachment.objects.filter(
+            **{"instance__case__meta__import-id": str(dossier_import.pk)}
+        ).count(),
+    }
+    dossier_import.messages["import"]["completed"] = timezone.localtime().strftime(
+        "%Y-%m-%dT%H:%M:%S%z"
+    )
+    dossier_import.status = DossierImport.IMPORT_STATUS_IMPORTED
+    dossier_import.save()
+
+
 def perform_import(dossier_import, override_config=None):
     try:
-        IMPORT_SETTINGS = settings.APPLICATION["DOSSIER_IMPORT"]
         if override_config:
             settings.APPLICATION = settings.APPLICATIONS[override_config]
-        configured_writer_cls = import_string(IMPORT_SETTINGS["WRITER_CLASS"])
 
         loader = XlsxFileDossierLoader()
+        writer = get_writer(dossier_import)
 
-        writer = configured_writer_cls(
-            user_id=User.objects.get(username=IMPORT_SETTINGS["USER"]).pk,
-            group_id=dossier_import.group.pk,
-            location_id=dossier_import.location and dossier_import.location.pk,
-            import_settings=settings.APPLICATION["DOSSIER_IMPORT"],
-        )
         dossier_import.messages["import"] = {"details": []}
-        for dossier in loader.load_dossiers(dossier_import.source_file.path):
-            message = writer.import_dossier(dossier, str(dossier_import.id))
-            dossier_import.messages["import"]["details"].append(asdict(message))
-            dossier_import.save()
-        update_summary(dossier_import)
-        dossier_import.messages["import"]["summary"]["stats"] = {
-            "dossiers": Instance.objects.filter(
-                **{"case__meta__import-id": str(dossier_import.pk)}
-            ).count(),
-            "attachments": Attachment.objects.filter(
-                **{"instance__case__meta__import-id": str(dossier_import.pk)}
-            ).count(),
-        }
-        dossier_import.messages["import"]["completed"] = timezone.localtime().strftime(
-            "%Y-%m-%dT%H:%M:%S%z"
-        )
-        dossier_import.status = DossierImport.IMPORT_STATUS_IMPORTED
         dossier_import.save()
+        import_dossiers(
+            dossier_import,
+            writer,
+            loader.load_dossiers(dossier_import.source_file.path),
+        )
+        complete_import(dossier_import)
 
     except Exception as e:  # pragma: no cover # noqa: B902
         logger.exception(e)
@@ -64,6 +81,208 @@ def perform_import(dossier_import, override_config=None):
         dossier_import.save()
 
 
+def start_import(dossier_import):
+    """Import the dossiers, split into chunks run by multiple workers.
+
+    Archives with more than `DOSSIER_IMPORT_CHUNK_SIZE` dossiers are split
+    into chunks which are queued as separate tasks. The last finished chunk
+    completes the import.
+    """
+    try:
+        count = XlsxFileDossierLoader().count_rows(dossier_import.source_file.path)
+    except Exception as e:  # pragma: no cover # noqa: B902
+        logger.exception(e)
+        dossier_import.messages["import"] = {"details": [], "exception": str(e)}
+        dossier_import.status = DossierImport.IMPORT_STATUS_IMPORT_FAILED
+        dossier_import.save()
+        return
+
+    chunk_size = settings.DOSSIER_IMPORT_CHUNK_SIZE
+    if not chunk_size or count <= chunk_size:
+        perform_import(dossier_import)
+        return
+
+    dossier_import.messages["import"] = {"details": []}
+    dossier_import.save()
+    dossier_import.chunks.all().delete()
+
+    chunks = DossierImportChunk.objects.bulk_create(
+        [
+            DossierImportChunk(
+                dossier_import=dossier_import,
+                index=index,
+                start=start,
+                end=min(start + chunk_size, count),
+            )
+            for index, start in enumerate(range(0, count, chunk_size))
+        ]
+    )
+    for chunk in chunks:
+        async_task(import_chunk, chunk.pk)
+
+
+def import_chunk(chunk_pk):
+    """Import the dossiers of a single chunk and complete the import if it was the last.
+
+    Only pending chunks are imported. The task of a chunk may be delivered
+    again after the chunk timed out and the import was finalized, and its
+    dossiers mustn't be imported twice.
+    """
+    with transaction.atomic():
+        chunk = (
+            DossierImportChunk.objects.select_for_update(of=("self",))
+            .select_related("dossier_import")
+            .get(pk=chunk_pk)
+        )
+        if chunk.status != DossierImportChunk.STATUS_PENDING:
+            logger.warning(
+                f"Dossier import chunk {chunk.pk} is {chunk.status}, not importing it"
+            )
+            return
+
+        chunk.status = DossierImportChunk.STATUS_RUNNING
+        chunk.started_at = timezone.now()
+        chunk.save()
+
+    dossier_import = chunk.dossier_import
+
+    try:
+        # The import object is shared with the other chunks, so its messages
+        # are only appended to and the object is never saved here.
+        chunk.dossiers = import_dossiers(
+            dossier_import,
+            get_writer(dossier_import),
+            XlsxFileDossierLoader().load_dossiers(
+                dossier_import.source_file.path, chunk.start, chunk.end
+            ),
+        )
+        chunk.status = DossierImportChunk.STATUS_DONE
+    except Exception as e:  # noqa: B902
+        logger.exception(e)
+        chunk.status = DossierImportChunk.STATUS_FAILED
+        chunk.error = str(e)
+
+    chunk.finished_at = timezone.now()
+    chunk.save()
+
+    finalize_import(dossier_import.pk)
+
+
+@transaction.atomic
+def finalize_import(dossier_import_pk):
+    """Complete a chunked import as soon as all of its chunks are finished.
+
+    The import is locked, so only one of the concurrently finishing chunks
+    completes it. Stale chunks (see `_stale_chunks`) are marked as failed, as
+    they won't be finished anymore.
+    """
+    dossier_import = DossierImport.objects.select_for_update().get(pk=dossier_import_pk)
+    chunks = dossier_import.chunks.all()
+
+    _stale_chunks(chunks).update(
+        status=DossierImportChunk.STATUS_FAILED,
+        error="Timed out",
+        finished_at=timezone.now(),
+    )
+
+    if (
+        dossier_import.status != DossierImport.IMPORT_STATUS_IMPORT_INPROGRESS
+        or chunks.filter(
+            status__in=[
+                DossierImportChunk.STATUS_PENDING,
+                DossierImportChunk.STATUS_RUNNING,
+            ]
+        ).exists()
+    ):
+        return
+
+    errors = [
+        f"Chunk {chunk.index + 1} (dossiers {chunk.start + 1}-{chunk.end}): "
+        f"{chunk.error}"
+        for chunk in chunks.filter(status=DossierImportChunk.STATUS_FAILED)
+    ]
+    if errors:
+        dossier_import.messages["import"]["exception"] = "\n".join(errors)
+        dossier_import.status = DossierImport.IMPORT_STATUS_IMPORT_FAILED
+        dossier_import.save()
+        return
+
+    complete_import(dossier_import)
+
+
+def _stale_chunks(chunks):
+    """Filter the chunks which won't be finished anymore.
+
+    These are chunks running for longer than `DOSSIER_IMPORT_CHUNK_TIMEOUT`,
+    whose worker died, and pending chunks of imports which didn't make any
+    progress for that long, whose task was lost. Pending chunks of imports
+    whose other chunks are still progressing may just be waiting in the queue.
+    """
+    deadline = timezone.now() - timedelta(seconds=settings.DOSSIER_IMPORT_CHUNK_TIMEOUT)
+    progressing = DossierImportChunk.objects.filter(
+        Q(started_at__gte=deadline) | Q(finished_at__gte=deadline),
+        dossier_import=OuterRef("dossier_import"),
+    )
+
+    return chunks.filter(
+        Q(status=DossierImportChunk.STATUS_RUNNING, started_at__lt=deadline)
+        | Q(
+            ~Exists(progressing),
+            status=DossierImportChunk.STATUS_PENDING,
+            created_at__lt=deadline,
+        )
+    )
+
+
+def finalize_stale_imports():
+    """Finalize the chunked imports which wait for a stale chunk.
+
+    Runs periodically, as a chunk whose worker died or whose task was lost
+    never finalizes the import itself.
+    """
+    stale = _stale_chunks(DossierImportChunk.objects.all()).filter(
+        dossier_import__status=DossierImport.IMPORT_STATUS_IMPORT_INPROGRESS
+    )
+    for dossier_import_pk in stale.values_list("dossier_import", flat=True).distinct():
+        finalize_import(dossier_import_pk)
+
+
+def import_dossiers(dossier_import, writer, dossiers):
+    """Import the dossiers in batches of `DOSSIER_IMPORT_BATCH_SIZE`.
+
+    The messages of the dossiers are appended after every batch, and before
+    an exception is raised, so the messages of the already imported dossiers
+    aren't lost when a dossier fails.
+    """
+    start = time.monotonic()
+    count = 0
+    dossiers = iter(dossiers)
+
+    while True:
+        batch = list(islice(dossiers, settings.DOSSIER_IMPORT_BATCH_SIZE))
+        if not batch:
+            break
+
+        details = []
+        try:
+            for dossier in batch:
+                details.append(
+                    asdict(writer.import_dossier(dossier, str(dossier_import.id)))
+                )
+        finally:
+            if details:
+                append_import_details(dossier_import, details)
+
+        count += len(batch)
+        elapsed = time.monotonic() - start
+        logger.info(
+            f"Dossier import {dossier_import.pk}: imported {count} dossiers "
+            f"({count / elapsed:.2f} dossiers/s)"
+        )
+
+    return count
+
+
 def get_token():
     DOSSIER_IMPORT = settings.APPLICATION.get("DOSSIER_IMPORT", {})
     r = requests.post(
@@ -1,10 +1,10 @@
 import itertools
 import zipfile
+from collections import defaultdict
 from dataclasses import fields
 from enum import Enum
-from typing import Generator, Iterable, List, Optional, Tuple
+from typing import Dict, Generator, Iterable, List, Optional, Set, Tuple
 
-import openpyxl
 from django.conf import settings
 from django.utils.translation import gettext as _
 from pyproj import Transformer
@@ -24,6 +24,30 @@ from camac.dossier_import.messages import (
 )
 
 
+def index_archive(
+    archive: zipfile.ZipFile,
+) -> Tuple[Dict[str, List[zipfile.ZipInfo]], Set[str]]:
+    """Index the documents of an import archive by dossier ID.
+
+    Built in one pass over the archive's directory, so the archive doesn't
+    need to be scanned again for every dossier.
+
+    :return: the files in the directory of every dossier (including
+             subdirectories), and the top level directories which have an
+             entry of their own in the archive
+    """
+    files = defaultdict(list)
+    dirs = set()
+    for info in archive.infolist():
+        dossier_id, separator, name = info.filename.partition("/")
+        if not name:
+            if separator:
+                dirs.add(dossier_id)
+        elif not info.filename.endswith("/"):
+            files[dossier_id].append(info)
+    return files, dirs
+
+
 def numbers(string):
     return int("".join(char for char in str(string) if char.isdigit()) or 0)
 
@@ -304,8 +328,9 @@ class XlsxFileDossierLoader:
             )
         return out, messages
 
-    def load_dossiers(self, path_to_archive: str) -> Generator:
-        archive = zipfile.ZipFile(path_to_archive, "r")
+    def _open_worksheet(self, archive):
+        import openpyxl
+
         data_file = archive.open("dossiers.xlsx")
         try:
             work_book = openpyxl.load_workbook(data_file, data_only=True)
@@ -313,9 +338,27 @@ class XlsxFileDossierLoader:
             raise InvalidImportDataError(
                 _("Meta data file in archive is corrupt or not a valid .xlsx file.")
             )
-        worksheet = work_book.worksheets[0]
+        return work_book.worksheets[0]
+
+    def count_rows(self, path_to_archive: str) -> int:
+        """Count the dossier rows of the metadata file (without the heading)."""
+        with zipfile.ZipFile(path_to_archive, "r") as archive:
+            return max(self._open_worksheet(archive).max_row - 1, 0)
+
+    def load_dossiers(
+        self, path_to_archive: str, start: int = 0, end: Optional[int] = None
+    ) -> Generator:
+        """Load the dossiers of the archive.
+
+        `start` and `end` (exclusive) select a range of the dossier rows.
+        """
+        archive = zipfile.ZipFile(path_to_archive, "r")
+        worksheet = self._open_worksheet(archive)
         headings = worksheet[1]
-        for row in worksheet.iter_rows(min_row=2):
+        archive_index, _dirs = index_archive(archive)
+        for row in worksheet.iter_rows(
+            min_row=2 + start, max_row=None if end is None else 1 + end
+        ):
             dossier = self._load_dossier(
                 dict(
                     zip(
@@ -326,15 +369,14 @@ class XlsxFileDossierLoader:
             )
             if dossier.id is None:  # pragma: no cover
                 continue
-            dossier = self._load_attachments(dossier, archive)
+            dossier = self._load_attachments(dossier, archive, archive_index)
             yield dossier
 
-    def _load_attachments(self, dossier, archive):
-        for document_name in filter(
-            lambda x: x.filename.startswith(f"{dossier.id}/"), archive.infolist()
-        ):
-            if document_name.filename.endswith("/"):
-                continue
+    def _load_attachments(self, dossier, archive, archive_index=None):
+        if archive_index is None:  # pragma: no cover
+            archive_index, _dirs = index_archive(archive)
+
+        for document_name in archive_index.get(str(dossier.id), []):
             if not dossier.attachments:
                 dossier.attachments = []
             dossier.attachments.append(
@@ -1,8 +1,11 @@
+import json
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import List, Union
 
 from dataclasses_json import dataclass_json
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
 from django.utils.translation import gettext as _
 
 from camac.document.models import Attachment
@@ -292,6 +295,50 @@ def update_messages_section_detail(message: DossierSummary, dossier_import, sect
     message_exists.update(message.to_dict())
 
 
+def append_import_details(dossier_import, details: List[dict]):
+    """Append dossier messages to the import section of `DossierImport.messages`.
+
+    The messages are appended in the database instead of saving the whole
+    (ever growing) messages object for every imported dossier.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {dossier_import._meta.db_table}
+            SET messages = jsonb_set(
+                messages,
+                '{{import,details}}',
+                COALESCE(messages #> '{{import,details}}', '[]'::jsonb) || %s::jsonb
+            )
+            WHERE id = %s
+            """,
+            [json.dumps(details, cls=DjangoJSONEncoder), dossier_import.pk],
+        )
+
+    dossier_import.messages.setdefault("import", {}).setdefault("details", []).extend(
+        details
+    )
+
+
+def set_progress(dossier_import, section, **progress):
+    """Write the progress of a running section to `DossierImport.messages`.
+
+    Only the progress is written, so it can be reported while the rest of the
+    section is still being built up in memory.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {dossier_import._meta.db_table}
+            SET messages = jsonb_set(messages, %s, %s::jsonb)
+            WHERE id = %s
+            """,
+            [[section, "progress"], json.dumps(progress), dossier_import.pk],
+        )
+
+    dossier_import.messages.setdefault(section, {})["progress"] = progress
+
+
 def default_messages_object():
     return {
         "import": {"details": [], "summary": Summary().to_dict(), "completed": None},
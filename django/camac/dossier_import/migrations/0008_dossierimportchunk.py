@@ -0,0 +1,34 @@
+# Generated by Django 3.2.14 on 2022-08-18 14:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dossier_import', '0007_simple_history_update'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DossierImportChunk',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField()),
+                ('start', models.PositiveIntegerField()),
+                ('end', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('pending', 'pending'), ('running', 'running'), ('done', 'done'), ('failed', 'failed')], default='pending', max_length=32)),
+                ('dossiers', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('dossier_import', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='dossier_import.dossierimport')),
+            ],
+            options={
+                'ordering': ['index'],
+                'unique_together': {('dossier_import', 'index')},
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.14 on 2022-08-22 09:12
+
+from django.db import migrations, models
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.get_or_create(
+        name="finalize-stale-dossier-imports",
+        defaults={
+            "func": "camac.dossier_import.domain_logic.finalize_stale_imports",
+            "schedule_type": "I",
+            "minutes": 10,
+            "repeats": -1,
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(name="finalize-stale-dossier-imports").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dossier_import", "0008_dossierimportchunk"),
+        ("django_q", "0014_schedule_cluster"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dossierimportchunk",
+            name="started_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
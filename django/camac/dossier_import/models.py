@@ -4,6 +4,7 @@ from pathlib import Path
 from caluma.caluma_core.models import UUIDModel
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 from camac.dossier_import.messages import default_messages_object
 
@@ -102,3 +103,42 @@ class DossierImport(UUIDModel):
                 ignore_errors=True,
             )
         return super().delete(*args, **kwargs)
+
+
+class DossierImportChunk(models.Model):
+    """Part of a dossier import which is run by a separate worker.
+
+    A chunk covers the dossiers of the rows `start` to `end` (exclusive) of
+    the archive's metadata file.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (STATUS_PENDING, STATUS_PENDING),
+        (STATUS_RUNNING, STATUS_RUNNING),
+        (STATUS_DONE, STATUS_DONE),
+        (STATUS_FAILED, STATUS_FAILED),
+    )
+
+    dossier_import = models.ForeignKey(
+        DossierImport, models.CASCADE, related_name="chunks"
+    )
+    index = models.PositiveIntegerField()
+    start = models.PositiveIntegerField()
+    end = models.PositiveIntegerField()
+    status = models.CharField(
+        max_length=32, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    dossiers = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = [("dossier_import", "index")]
+        ordering = ["index"]
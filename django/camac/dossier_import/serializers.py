@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.utils.translation import gettext as _
+from django_q.tasks import async_task
 from rest_framework.exceptions import ValidationError
 from rest_framework_json_api import serializers
 
@@ -11,7 +12,11 @@ from camac.user.serializers import CurrentGroupDefault
 
 from . import models
 from .loaders import InvalidImportDataError
-from .validation import validate_zip_archive_structure, verify_source_file
+from .validation import (
+    validate_import_task,
+    validate_zip_archive_structure,
+    verify_source_file,
+)
 
 
 class DossierImportSerializer(serializers.ModelSerializer):
@@ -60,6 +65,12 @@ class DossierImportSerializer(serializers.ModelSerializer):
         dossier_import = super().create(validated_data)
         dossier_import.status = dossier_import.IMPORT_STATUS_IMPORT_INPROGRESS
         dossier_import.save()
+        if settings.DOSSIER_IMPORT_VALIDATE_ASYNC:
+            dossier_import.task_id = async_task(
+                validate_import_task, str(dossier_import.pk)
+            )
+            dossier_import.save()
+            return dossier_import
         try:
             return validate_zip_archive_structure(str(dossier_import.pk))
         except InvalidImportDataError as e:
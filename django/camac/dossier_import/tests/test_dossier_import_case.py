@@ -1,3 +1,5 @@
+import zipfile
+from datetime import timedelta
 from pathlib import Path
 
 import pytest
@@ -9,10 +11,20 @@ from pytest_lazyfixture import lazy_fixture
 from camac.caluma.api import CalumaApi
 from camac.constants.kt_bern import DECISION_TYPE_BUILDING_PERMIT
 from camac.core.models import InstanceLocation
+from camac.dossier_import import domain_logic
+from camac.dossier_import.domain_logic import import_dossiers
 from camac.dossier_import.dossier_classes import Dossier
-from camac.dossier_import.loaders import InvalidImportDataError, XlsxFileDossierLoader
-from camac.dossier_import.messages import MessageCodes, update_summary
-from camac.dossier_import.validation import validate_zip_archive_structure
+from camac.dossier_import.loaders import (
+    InvalidImportDataError,
+    XlsxFileDossierLoader,
+    index_archive,
+)
+from camac.dossier_import.messages import DossierSummary, MessageCodes, update_summary
+from camac.dossier_import.models import DossierImport, DossierImportChunk
+from camac.dossier_import.validation import (
+    validate_import_task,
+    validate_zip_archive_structure,
+)
 from camac.instance.master_data import MasterData
 from camac.instance.models import Instance
 
@@ -664,6 +676,53 @@ def test_validation(
         validate_zip_archive_structure(str(dossier_import.pk))
 
 
+@pytest.mark.parametrize(
+    "input_file,expected_status",
+    [
+        ("import-example.zip", DossierImport.IMPORT_STATUS_VALIDATION_SUCCESSFUL),
+        (
+            "import-missing-status-column.zip",
+            DossierImport.IMPORT_STATUS_VALIDATION_FAILED,
+        ),
+    ],
+)
+def test_validate_import_task(
+    db, dossier_import, archive_file, mocker, input_file, expected_status
+):
+    mocker.patch("camac.dossier_import.validation.PROGRESS_INTERVAL", 1)
+    dossier_import.source_file = archive_file(input_file)
+    dossier_import.save()
+
+    validate_import_task(str(dossier_import.pk))
+
+    dossier_import.refresh_from_db()
+    assert dossier_import.status == expected_status
+    if expected_status == DossierImport.IMPORT_STATUS_VALIDATION_SUCCESSFUL:
+        progress = dossier_import.messages["validation"]["progress"]
+        assert progress["rows"] == progress["total"]
+    else:
+        assert dossier_import.messages["validation"]["summary"]["error"]
+
+
+def test_validate_import_task_unexpected_error(
+    db, dossier_import, archive_file, mocker
+):
+    mocker.patch(
+        "camac.dossier_import.validation.index_archive",
+        side_effect=RuntimeError("Broken archive"),
+    )
+    dossier_import.source_file = archive_file("import-example.zip")
+    dossier_import.save()
+
+    validate_import_task(str(dossier_import.pk))
+
+    dossier_import.refresh_from_db()
+    assert dossier_import.status == DossierImport.IMPORT_STATUS_VALIDATION_FAILED
+    assert dossier_import.messages["validation"]["summary"]["error"] == [
+        "Broken archive"
+    ]
+
+
 @pytest.mark.parametrize(
     "target_state,workflow_type,ebau_number,expected_work_items_states,expected_case_status",
     [
@@ -856,3 +915,168 @@ def test_set_workflow_state_be(
                 ebau_number,
             ]
         )
+
+
+def test_index_archive():
+    archive = zipfile.ZipFile(str(Path(TEST_IMPORT_FILE_PATH) / TEST_IMPORT_FILE_NAME))
+    files, dirs = index_archive(archive)
+
+    assert set(files.keys()) == {"2017-53"}
+    assert dirs == {"2017-53", "2017-84"}
+    assert sorted(info.filename for info in files["2017-53"]) == [
+        "2017-53/Baugesuch.pdf",
+        "2017-53/Gründrisse/4 Gründriss UG.pdf",
+        "2017-53/Gründrisse/Thumbs.up",
+        "2017-53/Verfahrensprogramm.pdf",
+    ]
+
+
+def test_import_dossiers_batches(db, dossier_import_factory, settings, mocker):
+    settings.DOSSIER_IMPORT_BATCH_SIZE = 2
+    dossier_import = dossier_import_factory()
+    writer = mocker.Mock()
+    writer.import_dossier.side_effect = lambda dossier, import_id: DossierSummary(
+        status="success", dossier_id=dossier, details=[]
+    )
+
+    assert import_dossiers(dossier_import, writer, ["1", "2", "3"]) == 3
+
+    expected = ["1", "2", "3"]
+    assert [
+        detail["dossier_id"] for detail in dossier_import.messages["import"]["details"]
+    ] == expected
+    dossier_import.refresh_from_db()
+    assert [
+        detail["dossier_id"] for detail in dossier_import.messages["import"]["details"]
+    ] == expected
+
+
+@pytest.mark.parametrize("fail", [False, True])
+def test_start_import_chunks(db, dossier_import_factory, settings, mocker, fail):
+    settings.DOSSIER_IMPORT_CHUNK_SIZE = 2
+    dossier_import = dossier_import_factory(
+        status=DossierImport.IMPORT_STATUS_IMPORT_INPROGRESS
+    )
+    async_task = mocker.patch("camac.dossier_import.domain_logic.async_task")
+    mocker.patch.object(XlsxFileDossierLoader, "count_rows", return_value=5)
+    mocker.patch.object(
+        XlsxFileDossierLoader,
+        "load_dossiers",
+        side_effect=lambda path, start=0, end=None: [str(i) for i in range(start, end)],
+    )
+    writer = mocker.Mock()
+
+    def import_dossier(dossier, import_id):
+        if fail and dossier == "3":
+            raise Exception("Broken dossier")
+        return DossierSummary(status="success", dossier_id=dossier, details=[])
+
+    writer.import_dossier.side_effect = import_dossier
+    mocker.patch("camac.dossier_import.domain_logic.get_writer", return_value=writer)
+
+    domain_logic.start_import(dossier_import)
+
+    chunks = list(dossier_import.chunks.all())
+    assert [(chunk.start, chunk.end) for chunk in chunks] == [(0, 2), (2, 4), (4, 5)]
+    assert async_task.call_count == 3
+
+    for chunk in reversed(chunks):
+        domain_logic.import_chunk(chunk.pk)
+        dossier_import.refresh_from_db()
+        if chunk.index:
+            # the import is completed by the last finished chunk
+            assert (
+                dossier_import.status == DossierImport.IMPORT_STATUS_IMPORT_INPROGRESS
+            )
+
+    assert list(dossier_import.chunks.values_list("status", flat=True)) == [
+        DossierImportChunk.STATUS_DONE,
+        DossierImportChunk.STATUS_FAILED if fail else DossierImportChunk.STATUS_DONE,
+        DossierImportChunk.STATUS_DONE,
+    ]
+    assert sorted(
+        detail["dossier_id"] for detail in dossier_import.messages["import"]["details"]
+    ) == (["0", "1", "2", "4"] if fail else ["0", "1", "2", "3", "4"])
+
+    if fail:
+        assert dossier_import.status == DossierImport.IMPORT_STATUS_IMPORT_FAILED
+        assert "Broken dossier" in dossier_import.messages["import"]["exception"]
+    else:
+        assert dossier_import.status == DossierImport.IMPORT_STATUS_IMPORTED
+        assert dossier_import.messages["import"]["completed"]
+
+
+@pytest.mark.parametrize(
+    "status,hours_ago,done_hours_ago,stale",
+    [
+        # running chunks time out after they started
+        (DossierImportChunk.STATUS_RUNNING, 1, 3, False),
+        (DossierImportChunk.STATUS_RUNNING, 3, 1, True),
+        # pending chunks are stale when the import didn't make any progress
+        (DossierImportChunk.STATUS_PENDING, 3, 1, False),
+        (DossierImportChunk.STATUS_PENDING, 3, 3, True),
+    ],
+)
+def test_finalize_stale_imports(
+    db, dossier_import_factory, settings, status, hours_ago, done_hours_ago, stale
+):
+    settings.DOSSIER_IMPORT_CHUNK_TIMEOUT = 2 * 3600
+    now = timezone.now()
+    dossier_import = dossier_import_factory(
+        status=DossierImport.IMPORT_STATUS_IMPORT_INPROGRESS,
+        messages={"import": {"details": []}},
+    )
+    DossierImportChunk.objects.create(
+        dossier_import=dossier_import,
+        index=0,
+        start=0,
+        end=2,
+        status=DossierImportChunk.STATUS_DONE,
+        created_at=now - timedelta(hours=4),
+        started_at=now - timedelta(hours=4),
+        finished_at=now - timedelta(hours=done_hours_ago),
+    )
+    chunk = DossierImportChunk.objects.create(
+        dossier_import=dossier_import,
+        index=1,
+        start=2,
+        end=4,
+        status=status,
+        created_at=now - timedelta(hours=hours_ago),
+        started_at=(
+            now - timedelta(hours=hours_ago)
+            if status == DossierImportChunk.STATUS_RUNNING
+            else None
+        ),
+    )
+
+    domain_logic.finalize_stale_imports()
+
+    dossier_import.refresh_from_db()
+    chunk.refresh_from_db()
+    if stale:
+        assert chunk.status == DossierImportChunk.STATUS_FAILED
+        assert dossier_import.status == DossierImport.IMPORT_STATUS_IMPORT_FAILED
+        assert "Timed out" in dossier_import.messages["import"]["exception"]
+    else:
+        assert chunk.status == status
+        assert dossier_import.status == DossierImport.IMPORT_STATUS_IMPORT_INPROGRESS
+
+
+@pytest.mark.parametrize(
+    "status", [DossierImportChunk.STATUS_RUNNING, DossierImportChunk.STATUS_FAILED]
+)
+def test_import_chunk_not_pending(db, dossier_import_factory, mocker, status):
+    dossier_import = dossier_import_factory(
+        status=DossierImport.IMPORT_STATUS_IMPORT_FAILED
+    )
+    chunk = DossierImportChunk.objects.create(
+        dossier_import=dossier_import, index=0, start=0, end=2, status=status
+    )
+    get_writer = mocker.patch("camac.dossier_import.domain_logic.get_writer")
+
+    domain_logic.import_chunk(chunk.pk)
+
+    chunk.refresh_from_db()
+    assert chunk.status == status
+    assert not get_writer.called
@@ -1,19 +1,28 @@
 import datetime
 import zipfile
-from typing import List
+from collections import Counter
+from logging import getLogger
+from typing import Dict, List, Set
 
-import openpyxl
 from django.utils import timezone
 from django.utils.translation import gettext as _
 from rest_framework.exceptions import ValidationError
 
 from camac.dossier_import import messages
-from camac.dossier_import.loaders import InvalidImportDataError
+from camac.dossier_import.loaders import InvalidImportDataError, index_archive
 from camac.dossier_import.models import DossierImport
 
 from .config.common import mimetypes
 from .messages import MessageCodes
 
+REQUIRED_COLUMNS = ["ID", "STATUS", "PROPOSAL", "SUBMIT-DATE"]
+STATUS_CHOICES = ["SUBMITTED", "APPROVED", "DONE"]
+
+logger = getLogger(__name__)
+
+# number of validated rows after which the progress is written
+PROGRESS_INTERVAL = 500
+
 
 def verify_source_file(source_file: str) -> str:
     """
@@ -30,6 +39,8 @@ def verify_source_file(source_file: str) -> str:
      - the archive must contain a dossiers.xlsx
      - the dossiers.xlsx must in fact be a XLSX file
     """
+    import openpyxl
+
     if source_file is None:
         raise ValidationError(_("To start an import please upload a file."))
 
@@ -44,7 +55,7 @@ def verify_source_file(source_file: str) -> str:
             _("No metadata file 'dossiers.xlsx' found in uploaded archive.")
         )
     try:
-        openpyxl.load_workbook(metadata, data_only=True)
+        openpyxl.load_workbook(metadata, read_only=True, data_only=True).close()
     except zipfile.BadZipfile:
         raise ValidationError(
             _("Metadata file `dossiers.xlsx` is not a valid .xlsx file.")
@@ -52,12 +63,7 @@ def verify_source_file(source_file: str) -> str:
     return source_file
 
 
-def validate_attachments(archive: zipfile.ZipFile, dossier_ids: List[str]):
-    dirs = {
-        zipinfo.filename.split("/")[0]
-        for zipinfo in archive.filelist
-        if zipinfo.filename.endswith("/") and len(zipinfo.filename.split("/")) < 3
-    }
+def validate_attachments(dirs: Set[str], dossier_ids: List[str]):
     orphan_dirs = sorted(list(dirs - set(dossier_ids)))
     result = []
     if orphan_dirs:
@@ -76,64 +82,149 @@ def validate_attachments(archive: zipfile.ZipFile, dossier_ids: List[str]):
     return result
 
 
-def get_attachment_validation_stats(archive: zipfile.ZipFile, dossier_ids: List[str]):
+def get_attachment_validation_stats(
+    files: Dict[str, List[zipfile.ZipInfo]], dossier_ids: List[str]
+):
     return sum(
-        [
-            1
-            for url in archive.filelist
-            if url.filename.split("/")[0] in dossier_ids
-            and not url.filename.endswith("/")
-            and mimetypes.guess_type(url.filename)
-        ]
+        1
+        for dossier_id in set(dossier_ids)
+        for info in files.get(dossier_id, [])
+        if mimetypes.guess_type(info.filename)
     )
 
 
-# flake8: noqa: C901
+def _open_worksheet(archive: zipfile.ZipFile):
+    import openpyxl
+
+    data_file = archive.open("dossiers.xlsx")
+    try:
+        work_book = openpyxl.load_workbook(data_file, read_only=True, data_only=True)
+    except zipfile.BadZipfile:
+        raise InvalidImportDataError(
+            _("Meta data file in archive is corrupt or not a valid .xlsx file.")
+        )
+    return work_book.worksheets[0]
+
+
+def _validate_row(row, columns, date_columns):
+    """Validate a single row of the metadata file.
+
+    :return: list of (field name, detail, code, level) tuples
+    """
+    errors = []
+
+    for index, field_name in date_columns:
+        value = row[index]
+        if value is not None and type(value) != datetime.datetime:
+            errors.append(
+                (
+                    field_name,
+                    str(value),
+                    MessageCodes.DATE_FIELD_VALIDATION_ERROR.value,
+                    messages.LOG_LEVEL_WARNING,
+                )
+            )
+
+    status = row[columns["STATUS"]]
+    if status is None:
+        errors.append(
+            (
+                "status",
+                None,
+                MessageCodes.MISSING_REQUIRED_VALUE_ERROR.value,
+                messages.LOG_LEVEL_ERROR,
+            )
+        )
+    elif status not in STATUS_CHOICES:
+        errors.append(
+            (
+                "status",
+                status,
+                MessageCodes.STATUS_CHOICE_VALIDATION_ERROR.value,
+                messages.LOG_LEVEL_ERROR,
+            )
+        )
+
+    if not row[columns["SUBMIT-DATE"]]:
+        errors.append(
+            (
+                "submit_date",
+                None,
+                MessageCodes.MISSING_REQUIRED_VALUE_ERROR.value,
+                messages.LOG_LEVEL_ERROR,
+            )
+        )
+
+    return errors
+
+
+def _validate_rows(rows, width, columns, dossier_import, total):
+    """Validate the dossier rows in a single pass.
+
+    :return: IDs of all dossiers and the errors per dossier
+    """
+    date_columns = [
+        (index, heading.lower())
+        for heading, index in columns.items()
+        if heading.endswith("-DATE")
+    ]
+    id_column = columns["ID"]
+    dossier_ids = []
+    row_errors = []
+
+    for count, row in enumerate(rows, start=1):
+        if count % PROGRESS_INTERVAL == 0:
+            messages.set_progress(dossier_import, "validation", rows=count, total=total)
+
+        # rows without ID are ignored, missing trailing cells are filled up
+        if len(row) <= id_column or row[id_column] is None:
+            continue
+        row = row + (None,) * (width - len(row))
+
+        dossier_ids.append(row[id_column])
+        errors = _validate_row(row, columns, date_columns)
+        if errors:
+            row_errors.append((row[id_column], errors))
+
+    return dossier_ids, row_errors
+
+
 def validate_zip_archive_structure(instance_pk, clean_on_fail=True) -> DossierImport:
     """
     ZIP archive validation.
 
     scans the archive and best guesses the outcome of actually importing it.
+
+    The metadata file is streamed row by row (openpyxl read-only mode), so
+    memory usage doesn't grow with the size of the archive. The progress is
+    written to the validation messages while the rows are validated.
     """
     dossier_import = DossierImport.objects.get(pk=instance_pk)
 
     archive = zipfile.ZipFile(dossier_import.source_file.path, "r")
-    data_file = archive.open("dossiers.xlsx")
-    try:
-        work_book = openpyxl.load_workbook(data_file, data_only=True)
-    except zipfile.BadZipfile:
-        raise InvalidImportDataError(
-            _("Meta data file in archive is corrupt or not a valid .xlsx file.")
-        )
-    worksheet = work_book.worksheets[0]
-    headings = [h for h in worksheet[1] if h.value is not None]
+    worksheet = _open_worksheet(archive)
+    rows = worksheet.iter_rows(values_only=True)
+    headings = next(rows, ())
 
-    required_columns = ["ID", "STATUS", "PROPOSAL", "SUBMIT-DATE"]
-    heading_values = [col.value for col in headings]
-    missing = set(required_columns) - set(heading_values)
+    columns = {
+        heading: index for index, heading in enumerate(headings) if heading is not None
+    }
+    missing = set(REQUIRED_COLUMNS) - set(columns)
     if missing:
         raise InvalidImportDataError(
             _("Meta data file in archive is missing required columns %(missing)s.")
             % dict(missing=missing)
         )
 
-    status_column = next((col for col in headings if col.value == "STATUS"))
-    submit_date_column = next((col for col in headings if col.value == "SUBMIT-DATE"))
-    id_column = next((col for col in headings if col.value == "ID"))
+    total = worksheet.max_row and worksheet.max_row - 1
+    dossier_ids, row_errors = _validate_rows(
+        rows, len(headings), columns, dossier_import, total
+    )
 
+    dossiers_success = set(dossier_ids)
     dossier_msgs = []
-    deleted_rows = 0
-    for cell in worksheet[id_column.column_letter]:
-        if cell.value is not None:
-            continue
-        worksheet.delete_rows(cell.row, 1)
-        deleted_rows += 1
-
-    dossier_ids = [cell.value for cell in worksheet[id_column.column_letter][1:]]
 
-    dupes = set([d for d in dossier_ids if dossier_ids.count(d) > 1])
-
-    for dupe in dupes:
+    for dupe in [id for id, count in Counter(dossier_ids).items() if count > 1]:
         messages.append_or_update_dossier_message(
             dupe,
             "id",
@@ -142,90 +233,26 @@ def validate_zip_archive_structure(instance_pk, clean_on_fail=True) -> DossierIm
             dossier_msgs,
         )
 
-    dossiers_success = list(set(dossier_ids))
-
-    for date_column in [col for col in headings if col.value.endswith("-DATE")]:
-        for cell in worksheet[date_column.column_letter][1:]:
-            dossier_id = worksheet[f"A{cell.row}"].value
-            field_name = worksheet[f"{cell.column_letter}1"].value.lower()
-            try:
-                assert cell.value is None or type(cell.value) == datetime.datetime
-            except AssertionError:
-                messages.append_or_update_dossier_message(
-                    dossier_id,
-                    field_name,
-                    str(cell.value),
-                    MessageCodes.DATE_FIELD_VALIDATION_ERROR.value,
-                    dossier_msgs,
-                )
-                try:
-                    dossiers_success.remove(dossier_id)
-                except ValueError:
-                    pass
-                continue
-
-    status_choices = ["SUBMITTED", "APPROVED", "DONE"]
-
-    if status_column:
-        for cell in worksheet[status_column.column_letter][1:]:
-            dossier_id = worksheet[f"A{cell.row}"].value
-            if cell.value not in status_choices:
-                if cell.value is None:
-                    messages.append_or_update_dossier_message(
-                        dossier_id,
-                        "status",
-                        None,
-                        MessageCodes.MISSING_REQUIRED_VALUE_ERROR.value,
-                        dossier_msgs,
-                        level=messages.LOG_LEVEL_ERROR,
-                    )
-                    try:
-                        dossiers_success.remove(dossier_id)
-                    except ValueError:  # pragma: no cover
-                        pass
-                    continue
-
-                messages.append_or_update_dossier_message(
-                    dossier_id,
-                    "status",
-                    cell.value,
-                    MessageCodes.STATUS_CHOICE_VALIDATION_ERROR.value,
-                    dossier_msgs,
-                    level=messages.LOG_LEVEL_ERROR,
-                )
-                try:
-                    dossiers_success.remove(dossier_id)
-                except ValueError:  # pragma: no cover
-                    pass
-
-    if submit_date_column:
-        for cell in worksheet[submit_date_column.column_letter][1:]:
-            dossier_id = worksheet[f"A{cell.row}"].value
-            if not cell.value:
-                messages.append_or_update_dossier_message(
-                    dossier_id,
-                    "submit_date",
-                    None,
-                    MessageCodes.MISSING_REQUIRED_VALUE_ERROR.value,
-                    dossier_msgs,
-                    level=messages.LOG_LEVEL_ERROR,
-                )
-                try:
-                    dossiers_success.remove(dossier_id)
-                except ValueError:  # pragma: no cover
-                    pass
+    for dossier_id, errors in row_errors:
+        for field_name, detail, code, level in errors:
+            messages.append_or_update_dossier_message(
+                dossier_id, field_name, detail, code, dossier_msgs, level=level
+            )
+        dossiers_success.discard(dossier_id)
 
     for msg in dossier_msgs:
         messages.update_messages_section_detail(
             msg, dossier_import, section="validation"
         )
 
+    files, dirs = index_archive(archive)
+
     dossier_import = messages.update_summary(dossier_import)
     dossier_import.messages["validation"]["summary"]["warning"] += validate_attachments(
-        archive, dossier_ids
+        dirs, dossier_ids
     )
     dossier_import.messages["validation"]["summary"]["stats"] = {
-        "attachments": get_attachment_validation_stats(archive, dossier_ids),
+        "attachments": get_attachment_validation_stats(files, dossier_ids),
         "dossiers": len(dossiers_success),
     }
 
@@ -242,3 +269,22 @@ def validate_zip_archive_structure(instance_pk, clean_on_fail=True) -> DossierIm
     dossier_import.save()
 
     return dossier_import
+
+
+def validate_import_task(instance_pk):
+    """Validate the archive of an import in the background.
+
+    Errors which prevent the validation are reported in the validation
+    summary instead of the response of the upload. Unexpected errors fail the
+    validation as well, so the import doesn't stay in progress.
+    """
+    try:
+        validate_zip_archive_structure(instance_pk)
+    except Exception as e:  # noqa: B902
+        if not isinstance(e, InvalidImportDataError):
+            logger.exception(e)
+        dossier_import = DossierImport.objects.get(pk=instance_pk)
+        dossier_import.messages["validation"]["summary"]["error"].append(str(e))
+        dossier_import.status = dossier_import.IMPORT_STATUS_VALIDATION_FAILED
+        dossier_import.source_file.delete()
+        dossier_import.save()
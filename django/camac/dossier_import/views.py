@@ -7,11 +7,7 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework_json_api.views import ModelViewSet
 
-from camac.dossier_import.domain_logic import (
-    perform_import,
-    transmit_import,
-    undo_import,
-)
+from camac.dossier_import.domain_logic import start_import, transmit_import, undo_import
 from camac.dossier_import.models import DossierImport
 from camac.dossier_import.serializers import DossierImportSerializer
 from camac.user.permissions import permission_aware
@@ -61,7 +57,7 @@ class DossierImportView(ModelViewSet):
         dossier_import.status = DossierImport.IMPORT_STATUS_IMPORT_INPROGRESS
         dossier_import.save()
         task_id = async_task(
-            perform_import,
+            start_import,
             dossier_import,
             # sync=settings.Q_CLUSTER.get("sync", False),  # TODO: running tasks sync does not work at
             #  the moment: django-q task loses db connection. maybe related to testing fixtures
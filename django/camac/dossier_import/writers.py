@@ -1,6 +1,5 @@
 import mimetypes
 import re
-import shutil
 from dataclasses import asdict, fields
 from datetime import datetime
 from pathlib import Path
@@ -14,10 +13,12 @@ from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import IntegrityError
 from django.utils import timezone
+from django.utils.functional import cached_property
 from future.moves import itertools
 
 from camac.core.models import WorkflowEntry
 from camac.document.models import Attachment, AttachmentSection
+from camac.document.storage import save_attachment_file
 from camac.dossier_import.domain_logic import get_or_create_ebau_nr
 from camac.dossier_import.dossier_classes import CalumaPlotData, Dossier
 from camac.dossier_import.loaders import safe_join
@@ -404,6 +405,7 @@ class DossierWriter:
 
         attachments_path.mkdir(parents=True, exist_ok=True)
 
+        attachments = []
         for attachment in dossier.attachments:
             target_base_path = f"{settings.MEDIA_ROOT}/attachments/files/{instance.pk}"
 
@@ -435,28 +437,37 @@ class DossierWriter:
                 )
                 continue
 
-            with open(str(Path(target_base_path) / file_path), "wb") as target_file:
-                shutil.copyfileobj(attachment.file_accessor, target_file)
+            path = save_attachment_file(
+                f"attachments/files/{instance.pk}/{file_path}",
+                attachment.file_accessor,
+            )
 
-                attachment = Attachment.objects.create(
+            attachments.append(
+                Attachment(
                     instance=instance,
                     user=self._user,
                     service=self._group.service,
                     group=self._group,
                     name=file_path,
                     context={},
-                    path=f"attachments/files/{instance.pk}/{file_path}",
-                    size=target_file.tell(),
+                    path=path,
+                    size=Attachment.path.field.storage.size(path),
                     date=timezone.localtime(),
                     mime_type=mime_type,
                 )
-                attachment_section = AttachmentSection.objects.get(
-                    attachment_section_id=self._import_settings["ATTACHMENT_SECTION_ID"]
-                )
-                attachment_section.attachments.add(attachment)
+            )
+
+        Attachment.objects.bulk_create(attachments)
+        self._attachment_section.attachments.add(*attachments)
 
         return messages
 
+    @cached_property
+    def _attachment_section(self):
+        return AttachmentSection.objects.get(
+            attachment_section_id=self._import_settings["ATTACHMENT_SECTION_ID"]
+        )
+
     def _ensure_retrieveable(self):
         """Make imported dossiers identifiable.
 
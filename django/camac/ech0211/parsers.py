@@ -1,11 +1,8 @@
 from xml.sax import SAXParseException
 
-from pyxb.exceptions_ import PyXBException
 from rest_framework.exceptions import ParseError
 from rest_framework_xml.parsers import XMLParser
 
-from .schema.ech_0211_2_0 import CreateFromDocument
-
 
 class ECHXMLParser(XMLParser):
     """XML parser."""
@@ -14,6 +11,10 @@ class ECHXMLParser(XMLParser):
 
     def parse(self, stream, media_type=None, parser_context=None):
         """Parse the incoming bytestream as XML and return the resulting data."""
+        # the generated bindings are large, so they're imported on first use
+        from pyxb.exceptions_ import PyXBException
+
+        from .schema.ech_0211_2_0 import CreateFromDocument
 
         try:
             return CreateFromDocument(stream.read())
@@ -0,0 +1,115 @@
+"""Signal receivers sending eCH messages.
+
+The event handlers import the large generated eCH bindings, so they're only
+imported when the first message is sent instead of at startup.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.dispatch import receiver
+
+from .signals import (
+    accompanying_report_send,
+    assigned_ebau_number,
+    change_responsibility,
+    circulation_ended,
+    circulation_started,
+    file_subsequently,
+    finished,
+    instance_submitted,
+    ruling,
+    sb1_submitted,
+    sb2_submitted,
+    task_send,
+)
+
+
+def if_ech_enabled(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        instance = kwargs.get("instance")
+        if (
+            settings.APPLICATION["ECH0211"].get("API_ACTIVE")
+            and instance.case.workflow_id not in settings.ECH_EXCLUDED_WORKFLOWS
+            and instance.case.document.form_id not in settings.ECH_EXCLUDED_FORMS
+        ):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+@receiver(instance_submitted)
+@if_ech_enabled
+def submit_callback(sender, instance, user_pk, group_pk, **kwargs):
+    from .event_handlers import SubmitEventHandler
+
+    handler = SubmitEventHandler(instance, user_pk=user_pk, group_pk=group_pk)
+    handler.run()
+
+
+@receiver(assigned_ebau_number)
+@receiver(circulation_started)
+@receiver(circulation_ended)
+@receiver(ruling)
+@receiver(finished)
+@if_ech_enabled
+def send_status_notification(sender, instance, user_pk, group_pk, **kwargs):
+    from .event_handlers import StatusNotificationEventHandler
+
+    handler = StatusNotificationEventHandler(
+        instance, user_pk=user_pk, group_pk=group_pk
+    )
+    handler.run()
+
+
+@receiver(task_send)
+@receiver(sb1_submitted)
+@receiver(sb2_submitted)
+@if_ech_enabled
+def task_callback(sender, instance, user_pk, group_pk, inquiry=None, **kwargs):
+    from .event_handlers import TaskEventHandler
+
+    handler = TaskEventHandler(
+        instance,
+        user_pk=user_pk,
+        group_pk=group_pk,
+        inquiry=inquiry,
+    )
+    handler.run()
+
+
+@receiver(accompanying_report_send)
+@if_ech_enabled
+def accompanying_report_callback(
+    sender, instance, user_pk, group_pk, inquiry, attachments, **kwargs
+):
+    from .event_handlers import AccompanyingReportEventHandler
+
+    handler = AccompanyingReportEventHandler(
+        instance,
+        user_pk=user_pk,
+        group_pk=group_pk,
+        inquiry=inquiry,
+        attachments=attachments,
+    )
+    handler.run()
+
+
+@receiver(file_subsequently)
+@if_ech_enabled
+def file_subsequently_callback(sender, instance, user_pk, group_pk, **kwargs):
+    from .event_handlers import FileSubsequentlyEventHandler
+
+    handler = FileSubsequentlyEventHandler(instance, user_pk=user_pk, group_pk=group_pk)
+    handler.run()
+
+
+@receiver(change_responsibility)
+@if_ech_enabled
+def change_responsibility_callback(sender, instance, user_pk, group_pk, **kwargs):
+    from .event_handlers import ChangeResponsibilityEventHandler
+
+    handler = ChangeResponsibilityEventHandler(
+        instance, user_pk=user_pk, group_pk=group_pk
+    )
+    handler.run()
@@ -3,7 +3,6 @@ import logging
 from django.http import HttpResponse
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from pyxb import IncompleteElementContentError, UnprocessedElementContentError
 from rest_framework import status
 from rest_framework.authentication import get_authorization_header
 from rest_framework.generics import get_object_or_404
@@ -17,7 +16,6 @@ from camac.constants.kt_bern import ECH_BASE_DELIVERY
 from camac.instance.models import Instance
 from camac.swagger.utils import get_operation_description, group_param
 
-from .. import event_handlers, formatters
 from ..data_preparation import get_document
 from ..mixins import ECHInstanceQuerysetMixin
 from ..models import Message
@@ -44,6 +42,11 @@ class ApplicationView(ECHInstanceQuerysetMixin, RetrieveModelMixin, GenericViewS
         responses={"200": "eCH-0211 baseDelivery"},
     )
     def retrieve(self, request, instance_id=None, **kwargs):
+        # the generated bindings are large, so they're imported on first use
+        from pyxb import IncompleteElementContentError, UnprocessedElementContentError
+
+        from .. import formatters
+
         qs = self.get_queryset()
         instance = get_object_or_404(qs, pk=instance_id)
         document = get_document(instance.pk)
@@ -157,6 +160,8 @@ class EventView(ECHInstanceQuerysetMixin, GenericViewSet):
         return False
 
     def create(self, request, instance_id, event_type, *args, **kwargs):
+        from .. import event_handlers
+
         instance = get_object_or_404(self.get_queryset(), pk=instance_id)
         try:
             EventHandler = getattr(event_handlers, f"{event_type}EventHandler")
@@ -2,7 +2,6 @@ import logging
 
 from django.http import HttpResponse
 from drf_yasg.utils import swagger_auto_schema
-from pyxb import IncompleteElementContentError, UnprocessedElementContentError
 from rest_framework.generics import get_object_or_404
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin
 from rest_framework.serializers import Serializer
@@ -13,7 +12,6 @@ from ...constants.kt_bern import ECH_BASE_DELIVERY
 from ...constants.kt_schwyz import FORM_DESCRIPTIONS
 from ...instance.models import Instance
 from ...swagger.utils import get_operation_description, group_param
-from .. import formatters
 from ..mixins import ECHInstanceQuerysetMixin
 from ..serializers import ApplicationsSerializer
 
@@ -35,6 +33,11 @@ class ApplicationView(ECHInstanceQuerysetMixin, RetrieveModelMixin, GenericViewS
         responses={"200": "eCH-0211 baseDelivery"},
     )
     def retrieve(self, request, instance_id=None, **kwargs):
+        # the generated bindings are large, so they're imported on first use
+        from pyxb import IncompleteElementContentError, UnprocessedElementContentError
+
+        from .. import formatters
+
         qs = self.get_queryset()
         instance = get_object_or_404(qs, pk=instance_id)
         base_delivery_formatter = formatters.BaseDeliveryFormatter("kt_schwyz")
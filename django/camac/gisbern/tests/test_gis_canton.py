@@ -1,6 +1,8 @@
 import pytest
 from django.urls import reverse
 
+from camac.gisbern import views
+
 
 @pytest.fixture(scope="module")
 def vcr_config():
@@ -25,6 +27,92 @@ def vcr_config():
     ],
 )
 @pytest.mark.vcr()
-def test_gis_canton(egrid, client, vcr_config, snapshot):
+def test_gis_canton(egrid, client, vcr_config, snapshot, clear_cache):
     response = client.get(reverse("egrid", kwargs={"egrid": egrid}))
     snapshot.assert_match(response.json())
+
+
+NAMESPACES = (
+    'xmlns:gml="http://www.opengis.net/gml" '
+    'xmlns:a42geo_a42geo_ebau_kt_wfs_d_fk="http://example.com/wfs"'
+)
+
+
+def _feature_collection(*members):
+    features = "".join(
+        f"<gml:featureMember>{member}</gml:featureMember>" for member in members
+    )
+    return f"<wfs:FeatureCollection xmlns:wfs='http://www.opengis.net/wfs' {NAMESPACES}>{features}</wfs:FeatureCollection>"
+
+
+def test_gis_canton_concurrent(client, settings, requests_mock, clear_cache):
+    settings.GIS_CONCURRENT_LAYER_QUERIES = True
+    settings.GIS_SKIP_BOOLEAN_LAYERS = ["GK5_SY", "ARCHINV_FUNDST", "NSG_NSGP"]
+
+    wfs_url = f"{settings.GIS_BASE_URL}/geoservice2/services/a42geo/a42geo_ebau_kt_wfs_d_fk/MapServer/WFSServer"
+    polygon = requests_mock.get(
+        wfs_url,
+        text=_feature_collection("<gml:Polygon><gml:coordinates/></gml:Polygon>"),
+    )
+
+    def features(request, context):
+        if "GEODB.UZP_BAU_VW" in request.text:
+            return _feature_collection(
+                "<a42geo_a42geo_ebau_kt_wfs_d_fk:GEODB.UZP_BAU_VW>"
+                "<a42geo_a42geo_ebau_kt_wfs_d_fk:ZONE_LO> Wohnzone </a42geo_a42geo_ebau_kt_wfs_d_fk:ZONE_LO>"
+                "</a42geo_a42geo_ebau_kt_wfs_d_fk:GEODB.UZP_BAU_VW>"
+            )
+        if "GEODB.GSK25_GSK_VW" in request.text:
+            return _feature_collection(
+                "<a42geo_a42geo_ebau_kt_wfs_d_fk:GEODB.GSK25_GSK_VW>"
+                "<a42geo_a42geo_ebau_kt_wfs_d_fk:GSKT_BEZEICH_DE>Au</a42geo_a42geo_ebau_kt_wfs_d_fk:GSKT_BEZEICH_DE>"
+                "</a42geo_a42geo_ebau_kt_wfs_d_fk:GEODB.GSK25_GSK_VW>"
+            )
+        return _feature_collection()
+
+    layers = requests_mock.post(wfs_url, text=features)
+
+    url = reverse("egrid", kwargs={"egrid": "CH643546955207"})
+    expected = {
+        "GSK25_GSK_VW": True,
+        "BALISKBS_KBS": False,
+        "BAUINV_BAUINV_VW": False,
+        "UZP_LSG_VW": False,
+        "UZP_BAU_VW": ["Wohnzone"],
+        "UZP_UEO_VW": [],
+        "GSKT_BEZEICH_DE": ["Au"],
+    }
+
+    assert client.get(url).json() == expected
+    # one request per layer
+    assert layers.call_count == 6
+
+    # the second request is served from the cache
+    assert client.get(url).json() == expected
+    assert polygon.call_count == 1
+    assert layers.call_count == 6
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_gis_canton_all_layers_skipped(
+    client, settings, requests_mock, clear_cache, concurrent
+):
+    settings.GIS_CONCURRENT_LAYER_QUERIES = concurrent
+    settings.GIS_SKIP_BOOLEAN_LAYERS = views.ALL_BOOLEAN_LAYERS
+    settings.GIS_SKIP_SPECIAL_LAYERS = views.ALL_SPECIAL_LAYERS
+
+    wfs_url = f"{settings.GIS_BASE_URL}/geoservice2/services/a42geo/a42geo_ebau_kt_wfs_d_fk/MapServer/WFSServer"
+    requests_mock.get(
+        wfs_url,
+        text=_feature_collection("<gml:Polygon><gml:coordinates/></gml:Polygon>"),
+    )
+    layers = requests_mock.post(wfs_url, text=_feature_collection())
+
+    response = client.get(reverse("egrid", kwargs={"egrid": "CH643546955207"}))
+
+    assert response.json() == {
+        "UZP_BAU_VW": [],
+        "UZP_UEO_VW": [],
+        "GSKT_BEZEICH_DE": [],
+    }
+    assert layers.call_count == 0
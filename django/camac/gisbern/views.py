@@ -1,7 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 from os import path
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
 from drf_yasg.utils import swagger_auto_schema
 from lxml import etree
 from rest_framework import status
@@ -12,6 +14,23 @@ from camac.utils import build_url
 
 _session = requests.session()
 
+with open(path.join(path.dirname(__file__), "xml/get_feature.xml"), "r") as f:
+    GET_FEATURE_XML = f.read()
+
+ALL_BOOLEAN_LAYERS = [
+    "GEODB.GSK25_GSK_VW",  # Gewässerschutzzonen
+    "BALISKBS_KBS",  # Belasteter Standort
+    "GK5_SY",  # Naturgefahren
+    "GEODB.BAUINV_BAUINV_VW",  # Bauinventar
+    "GEODB.UZP_LSG_VW",  # Besonderer Landschaftsschutz
+    "ARCHINV_FUNDST",  # Archäologische Fundstellen
+    "NSG_NSGP",  # Naturschutzgebiet
+]
+ALL_SPECIAL_LAYERS = [
+    "GEODB.UZP_BAU_VW",  # Nutzungszone
+    "GEODB.UZP_UEO_VW",  # Überbauungsordnung
+]
+
 
 @swagger_auto_schema(method="get", auto_schema=None)
 @api_view(["GET"])
@@ -19,11 +38,23 @@ _session = requests.session()
 def gis_data_view(request, egrid, format=None):
     # View to list all the data from the GIS service.
     try:
-        return Response(get_gis_data(get_polygon(egrid)))
+        return Response(get_cached_gis_data(egrid))
     except ValueError as e:
         return Response(str(e), status=status.HTTP_404_NOT_FOUND)
 
 
+def get_cached_gis_data(egrid):
+    """Get the data from the GIS service for a parcel, cached per EGRID.
+
+    Errors are not cached.
+    """
+    return cache.get_or_set(
+        f"gisbern__egrid__{egrid}",
+        lambda: get_gis_data(get_polygon(egrid)),
+        settings.GIS_CACHE_TIMEOUT,
+    )
+
+
 def get_polygon(egrid):
     """Get a polygon with the coordinates of a parcel.
 
@@ -61,63 +92,54 @@ def get_gis_data(polygon):
     :rtype:           dict
     """
 
-    all_boolean_layers = [
-        "GEODB.GSK25_GSK_VW",  # Gewässerschutzzonen
-        "BALISKBS_KBS",  # Belasteter Standort
-        "GK5_SY",  # Naturgefahren
-        "GEODB.BAUINV_BAUINV_VW",  # Bauinventar
-        "GEODB.UZP_LSG_VW",  # Besonderer Landschaftsschutz
-        "ARCHINV_FUNDST",  # Archäologische Fundstellen
-        "NSG_NSGP",  # Naturschutzgebiet
-    ]
-    all_special_layers = [
-        "GEODB.UZP_BAU_VW",  # Nutzungszone
-        "GEODB.UZP_UEO_VW",  # Überbauungsordnung
-    ]
-
     boolean_layers = [
         layer
-        for layer in all_boolean_layers
+        for layer in ALL_BOOLEAN_LAYERS
         if layer not in settings.GIS_SKIP_BOOLEAN_LAYERS
     ]
     special_layers = [
         layer
-        for layer in all_special_layers
+        for layer in ALL_SPECIAL_LAYERS
         if layer not in settings.GIS_SKIP_SPECIAL_LAYERS
     ]
 
-    query = "".join(
-        map(
-            lambda x: """<Query typeName="a42geo_ebau_kt_wfs_d_fk:{0}" srsName="EPSG:2056">
+    queries = [
+        """<Query typeName="a42geo_ebau_kt_wfs_d_fk:{0}" srsName="EPSG:2056">
         <ogc:Filter>
           <ogc:Intersects>
             {1}
           </ogc:Intersects>
         </ogc:Filter>
       </Query>""".format(
-                x, polygon
-            ),
-            boolean_layers + special_layers,
+            layer, polygon
         )
-    )
+        for layer in boolean_layers + special_layers
+    ]
 
-    get_feature_xml = open(
-        path.join(path.dirname(__file__), "xml/get_feature.xml"), "r"
-    ).read()
+    if not queries:
+        return parse_features([], boolean_layers)
 
-    response_kanton = _session.post(
-        "{0}/geoservice2/services/a42geo/a42geo_ebau_kt_wfs_d_fk/MapServer/WFSServer".format(
-            settings.GIS_BASE_URL
-        ),
-        data=get_feature_xml.format(baseURL=settings.GIS_BASE_URL, query=query),
-    )
+    if settings.GIS_CONCURRENT_LAYER_QUERIES:
+        # one request per layer, sent concurrently
+        with ThreadPoolExecutor(len(queries)) as executor:
+            roots = list(executor.map(get_features, [[query] for query in queries]))
+    else:
+        roots = [get_features(queries)]
 
-    try:
-        et = get_root(response_kanton)
-    except etree.XMLSyntaxError:
-        raise ValueError("Can't parse document")
+    return parse_features(roots, boolean_layers)
+
+
+def parse_features(roots, boolean_layers):
+    """Extract the data of the GIS service from GetFeature responses.
 
-    tag_list = []
+    :param   roots:          root elements of the responses
+    :type    roots:          list
+    :param   boolean_layers: layers which are returned as true/false values
+    :type    boolean_layers: list
+    :return:                 the data from the GIS service
+    :rtype:                  dict
+    """
+    tags = set()
     data = {}
 
     usage_zones = set()
@@ -125,32 +147,34 @@ def get_gis_data(polygon):
     water_protection_zones = set()
 
     # Find all layers beneath featureMember
-    for child in et.findall("./gml:featureMember/", et.nsmap):
-        tag_list.append(child.tag)
-
-        # true/false values of kanton service
-        for value in boolean_layers:
-            data[value.split(".")[-1]] = len([x for x in tag_list if value in x]) > 0
-
-        # Nutzungszone ([String])
-        if "GEODB.UZP_BAU_VW" in child.tag:
+    for et in roots:
+        for child in et.findall("./gml:featureMember/", et.nsmap):
+            tags.add(child.tag)
+
+            # Nutzungszone ([String])
+            if "GEODB.UZP_BAU_VW" in child.tag:
+                for item in child.findall(
+                    "a42geo_a42geo_ebau_kt_wfs_d_fk:ZONE_LO", et.nsmap
+                ):
+                    usage_zones.add(item.text.strip())
+
+            # Überbauungsordnung (String)
+            if "GEODB.UZP_UEO_VW" in child.tag:
+                for item in child.findall(
+                    "a42geo_a42geo_ebau_kt_wfs_d_fk:ZONE_LO", et.nsmap
+                ):
+                    building_regulations.add(item.text.strip())
+
+            # Gewässerschutz (String)
             for item in child.findall(
-                "a42geo_a42geo_ebau_kt_wfs_d_fk:ZONE_LO", et.nsmap
+                "a42geo_a42geo_ebau_kt_wfs_d_fk:GSKT_BEZEICH_DE", et.nsmap
             ):
-                usage_zones.add(item.text.strip())
+                water_protection_zones.add(item.text.strip())
 
-        # Überbauungsordnung (String)
-        if "GEODB.UZP_UEO_VW" in child.tag:
-            for item in child.findall(
-                "a42geo_a42geo_ebau_kt_wfs_d_fk:ZONE_LO", et.nsmap
-            ):
-                building_regulations.add(item.text.strip())
-
-        # Gewässerschutz (String)
-        for item in child.findall(
-            "a42geo_a42geo_ebau_kt_wfs_d_fk:GSKT_BEZEICH_DE", et.nsmap
-        ):
-            water_protection_zones.add(item.text.strip())
+    # true/false values of kanton service (only if any feature was found)
+    if tags:
+        for value in boolean_layers:
+            data[value.split(".")[-1]] = any(value in tag for tag in tags)
 
     return {
         **data,
@@ -160,5 +184,27 @@ def get_gis_data(polygon):
     }
 
 
+def get_features(queries):
+    """Run a WFS GetFeature request with the given queries.
+
+    :param   queries: WFS query elements
+    :type    queries: list
+    :return:          root element of the response
+    """
+    response = _session.post(
+        "{0}/geoservice2/services/a42geo/a42geo_ebau_kt_wfs_d_fk/MapServer/WFSServer".format(
+            settings.GIS_BASE_URL
+        ),
+        data=GET_FEATURE_XML.format(
+            baseURL=settings.GIS_BASE_URL, query="".join(queries)
+        ),
+    )
+
+    try:
+        return get_root(response)
+    except etree.XMLSyntaxError:
+        raise ValueError("Can't parse document")
+
+
 def get_root(response):
     return etree.fromstring(response.content)
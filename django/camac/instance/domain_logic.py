@@ -20,6 +20,7 @@ from camac.core.models import (
     WorkflowEntry,
     WorkflowItem,
 )
+from camac.core.utils import lock_sequence
 from camac.instance.models import Instance, InstanceGroup
 from camac.user.permissions import permission_aware
 
@@ -164,6 +165,7 @@ class CreateInstanceLogic:
                 ) or str(instance.location.communal_federal_number)
 
             start = separator.join([str(identifier_start), str(year).zfill(2)])
+            lock_sequence(f"identifier-{start}")
 
             if settings.APPLICATION["CALUMA"].get("SAVE_DOSSIER_NUMBER_IN_CALUMA") or (
                 name in settings.APPLICATION.get("CALUMA_INSTANCE_FORMS", [])
@@ -359,18 +361,30 @@ class CreateInstanceLogic:
     @staticmethod
     def copy_attachments(source, target):
         for attachment in source.attachments.all():
-            try:
-                new_file = ContentFile(attachment.path.read())
-            except FileNotFoundError:  # pragma: no cover
-                # file does not exist so use the old file
-                new_file = attachment.path
+            storage = attachment.path.storage
 
             # store sections first
             sections = attachment.attachment_sections.all()
 
             # copy the file
-            new_file.name = attachment.path.name
-            attachment.path = new_file
+            if hasattr(storage, "link") and storage.exists(attachment.path.name):
+                # content addressed storages can reuse the existing content
+                attachment.instance = target
+                attachment.path = storage.link(
+                    attachment.path.name,
+                    attachment.path.field.generate_filename(
+                        attachment, attachment.path.name
+                    ),
+                )
+            else:
+                try:
+                    new_file = ContentFile(attachment.path.read())
+                except FileNotFoundError:  # pragma: no cover
+                    # file does not exist so use the old file
+                    new_file = attachment.path
+
+                new_file.name = attachment.path.name
+                attachment.path = new_file
 
             attachment.attachment_id = None
             attachment.instance = target
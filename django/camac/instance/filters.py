@@ -6,7 +6,16 @@ from caluma.caluma_workflow.models import Case, WorkItem
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField
 from django.core.validators import EMPTY_VALUES
-from django.db.models import Exists, F, OuterRef, Q, Subquery
+from django.db.models import (
+    BooleanField,
+    Exists,
+    ExpressionWrapper,
+    F,
+    FilteredRelation,
+    OuterRef,
+    Q,
+    Subquery,
+)
 from django.db.models.constants import LOOKUP_SEP
 from django.db.models.expressions import RawSQL
 from django.db.models.fields import TextField
@@ -184,7 +193,9 @@ class FormFieldListValueFilter(Filter):
         if value in EMPTY_VALUES:
             return qs
 
-        form_fields = models.FormField.objects.all()
+        form_fields = models.FormField.objects.alias(
+            search_text=models.FormFieldSearchText("value")
+        )
 
         # Use alias() instead of annotate() to only calculate expression if
         # the form field has to be checked for the instance query.
@@ -209,7 +220,13 @@ class FormFieldListValueFilter(Filter):
         search_values = filter(None, value.strip().split(" "))
         for v in search_values:
             subfilters = [Q(**{f"values_{key}__icontains": v}) for key in self._keys]
-            filters.append(reduce(lambda a, b: a | b, subfilters))
+            # The search text covers all keys, so it only pre-filters the
+            # form fields using the trigram index. The keys are checked on
+            # the remaining form fields.
+            filters.append(
+                Q(search_text__contains=v.lower())
+                & reduce(lambda a, b: a | b, subfilters)
+            )
 
         return qs.filter(
             # Use exists() since the instance should be returned as long
@@ -410,17 +427,26 @@ class InstanceFilterSet(FilterSet):
 
         return queryset.filter(circulations__activations__service__pk=value)
 
-    def filter_address_sz(self, queryset, name, value):
-        address_form_fields = settings.APPLICATION.get("ADDRESS_FORM_FIELDS", [])
+    def _filter_form_field_text(self, queryset, form_field_names, value):
         return queryset.filter(
-            fields__name__in=address_form_fields, fields__value__icontains=value
+            Exists(
+                models.FormField.objects.alias(
+                    search_text=models.FormFieldSearchText("value")
+                ).filter(
+                    instance=OuterRef("pk"),
+                    name__in=form_field_names,
+                    search_text__contains=value.lower(),
+                )
+            )
         )
 
+    def filter_address_sz(self, queryset, name, value):
+        address_form_fields = settings.APPLICATION.get("ADDRESS_FORM_FIELDS", [])
+        return self._filter_form_field_text(queryset, address_form_fields, value)
+
     def filter_intent_sz(self, queryset, name, value):
         intent_form_fields = settings.APPLICATION.get("INTENT_FORM_FIELDS", [])
-        return queryset.filter(
-            fields__name__in=intent_form_fields, fields__value__icontains=value
-        )
+        return self._filter_form_field_text(queryset, intent_form_fields, value)
 
     class Meta:
         model = models.Instance
@@ -602,18 +628,46 @@ class FormFieldOrdering(OrderingFilter):
     def filter_queryset(self, request, queryset, view):
         param = self.get_ordering(request, queryset, view)
 
-        if param:
-            ordering = "-field_val" if param.startswith("-") else "field_val"
+        if not param:
+            return queryset
 
-            outer_ref = OuterRef(self._get_instance_pk_filter_expr(view))
-            form_field = models.FormField.objects.filter(
-                instance=outer_ref, name=param.lstrip("-")
-            )
+        prefix = "-" if param.startswith("-") else ""
+        name = param.lstrip("-")
+
+        if not getattr(view, "instance_field"):
+            # Join the form field instead of running a subquery for every
+            # instance, so the index on name and sort keys can be used.
             queryset = queryset.annotate(
-                field_val=Subquery(form_field.values("value")[:1])
-            ).order_by(ordering)
+                sort_form_field=FilteredRelation(
+                    "fields", condition=Q(fields__name=name)
+                )
+            ).annotate(
+                field_missing=ExpressionWrapper(
+                    Q(sort_form_field__isnull=True), output_field=BooleanField()
+                ),
+                field_num=models.FormFieldSortNumber("sort_form_field__value"),
+                field_val=models.FormFieldSortKey("sort_form_field__value"),
+            )
+            # Same order as the jsonb values: null, strings and numbers
+            # ascending, instances without the field last. Other types are
+            # sorted by their text along with the strings.
+            if prefix:
+                return queryset.order_by(
+                    F("field_missing").desc(),
+                    F("field_num").desc(nulls_last=True),
+                    F("field_val").desc(nulls_last=True),
+                )
+            return queryset.order_by(
+                F("field_missing").asc(),
+                F("field_num").asc(nulls_first=True),
+                F("field_val").asc(nulls_first=True),
+            )
 
-        return queryset
+        outer_ref = OuterRef(self._get_instance_pk_filter_expr(view))
+        form_field = models.FormField.objects.filter(instance=outer_ref, name=name)
+        queryset = queryset.annotate(field_val=Subquery(form_field.values("value")[:1]))
+
+        return queryset.order_by(f"{prefix}field_val")
 
 
 class PublicCalumaInstanceFilterSet(FilterSet):
@@ -7,6 +7,7 @@ from dateutil.parser import ParserError, parse as dateutil_parse
 from django.conf import settings
 from django.utils.translation import get_language
 
+from camac import config_registry
 from camac.core.models import MultilingualModel
 
 
@@ -16,24 +17,21 @@ class MasterData(object):
     visible_questions: dict = field(default_factory=dict)
 
     def __getattr__(self, lookup_key):
-        config = settings.APPLICATION["MASTER_DATA"].get(lookup_key)
+        config = config_registry.get_master_data_config(lookup_key)
 
         if not config:
             raise AttributeError(
                 f"Key '{lookup_key}' is not configured in master data config. Available keys are: {', '.join(settings.APPLICATION['MASTER_DATA'].keys())}"
             )
 
-        resolver, *args = config
-        fn = getattr(self, f"{resolver}_resolver", None)
+        resolver, resolver_method, lookup, kwargs = config
+        fn = getattr(self, resolver_method, None)
 
         if not fn:
             raise AttributeError(
                 f"Resolver '{resolver}' used in key '{lookup_key}' is not defined in master data class"
             )
 
-        lookup = args[0]
-        kwargs = args[1] if len(args) > 1 else {}
-
         return fn(lookup, **kwargs)
 
     def _parse_value(self, value, default=None, value_parser=None, answer=None):
@@ -0,0 +1,36 @@
+# Generated by Django 3.2.14 on 2022-08-22 09:12
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Lowercased text of all strings and numbers in a form field value, used by
+# the free text filters of the instance list (see `FormFieldSearchText`).
+CREATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION form_field_search_text(value jsonb) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT lower(string_agg(item #>> '{}', ' '))
+    FROM jsonb_path_query(
+        value, 'strict $.** ? (@.type() == "string" || @.type() == "number")'
+    ) AS item
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instance', '0036_alter_instance_case'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunSQL(
+            CREATE_FUNCTION,
+            'DROP FUNCTION IF EXISTS form_field_search_text(jsonb);',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX instance_formfield_search_text_trgm ON instance_formfield '
+            'USING gin (form_field_search_text(value) gin_trgm_ops);',
+            'DROP INDEX IF EXISTS instance_formfield_search_text_trgm;',
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.14 on 2022-08-23 10:41
+
+from django.db import migrations
+
+# Text of a form field value used to sort instances by a form field (see
+# `FormFieldSortKey`). Truncated to stay below the size limit of btree index
+# entries.
+CREATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION form_field_sort_key(value jsonb) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT left(value #>> '{}', 255)
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instance', '0037_form_field_search_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            CREATE_FUNCTION,
+            'DROP FUNCTION IF EXISTS form_field_sort_key(jsonb);',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX instance_formfield_sort_key ON instance_formfield '
+            '(name, form_field_sort_key(value), instance_id);',
+            'DROP INDEX IF EXISTS instance_formfield_sort_key;',
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.14 on 2022-08-29 08:17
+
+from django.db import migrations
+
+# Numeric form field values are sorted by this number before the text of the
+# value (see `FormFieldSortNumber`), as their text doesn't sort numerically.
+# Other values are sorted first (NULLS FIRST), as strings are sorted before
+# numbers in jsonb.
+CREATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION form_field_sort_number(value jsonb) RETURNS numeric
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT CASE WHEN jsonb_typeof(value) = 'number' THEN (value #>> '{}')::numeric END
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instance', '0038_form_field_sort_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            CREATE_FUNCTION,
+            'DROP FUNCTION IF EXISTS form_field_sort_number(jsonb);',
+        ),
+        migrations.RunSQL(
+            'DROP INDEX IF EXISTS instance_formfield_sort_key;',
+            'CREATE INDEX instance_formfield_sort_key ON instance_formfield '
+            '(name, form_field_sort_key(value), instance_id);',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX instance_formfield_sort_number_key ON instance_formfield '
+            '(name, form_field_sort_number(value) NULLS FIRST, '
+            'form_field_sort_key(value) NULLS FIRST, instance_id);',
+            'DROP INDEX IF EXISTS instance_formfield_sort_number_key;',
+        ),
+    ]
@@ -8,6 +8,7 @@ from django.utils import timezone
 from django.utils.translation import gettext as _
 from rest_framework import exceptions
 
+from camac import config_registry
 from camac.attrs import nested_getattr
 from camac.constants import kt_uri as uri_constants
 from camac.core.models import Circulation, CommissionAssignment, InstanceService
@@ -76,9 +77,7 @@ class InstanceQuerysetMixin(object):
         # instance state is always used to determine permissions
         instance_state_expr = self._get_instance_filter_expr("instance_state")
         role_name = get_role_name(get_group(self))
-        hidden_states = settings.APPLICATION.get("INSTANCE_HIDDEN_STATES", {}).get(
-            role_name, []
-        )
+        hidden_states = config_registry.get_hidden_states(role_name)
         queryset = (
             super().get_queryset()
             if hasattr(super(), "get_queryset")
@@ -460,9 +459,7 @@ class InstanceEditableMixin(AttributeMixin):
 
     def validate_instance_for_coordination(self, instance):
         # TODO: Map form types to responsible KOORS
-        hidden_states = settings.APPLICATION.get("INSTANCE_HIDDEN_STATES", {}).get(
-            "coordination", []
-        )
+        hidden_states = config_registry.get_hidden_states("coordination")
         if instance.instance_state.name in hidden_states:
             raise exceptions.ValidationError(
                 _("Not allowed to add data to instance %(instance)s as coordination")
@@ -1,9 +1,12 @@
 import logging
+from collections import defaultdict
 
 import reversion
 from django.conf import settings
 from django.db import models
+from django.db.models import prefetch_related_objects
 
+from camac import config_registry
 from camac.core.models import HistoryActionConfig
 from camac.user.models import User
 
@@ -172,7 +175,8 @@ class Instance(models.Model):
         InstanceGroup, models.SET_NULL, related_name="instances", null=True
     )
 
-    def _responsible_service_instance_service(self, filter_type=None, **kwargs):
+    def _get_active_service_config(self, filter_type=None):
+        """Return the name and config of the active service to look up."""
         active_services_settings = settings.APPLICATION.get("ACTIVE_SERVICES", {})
 
         if filter_type:
@@ -183,41 +187,83 @@ class Instance(models.Model):
                     f"Active service `filter_type` {filter_type} is not configured"
                 )
 
-            active_service_config = active_services_settings.get(filter_type)
-        else:
-            active_service_config = None
-            default_active_service_config = None
-
-            for config in active_services_settings.values():
-                if config.get("DEFAULT"):
-                    default_active_service_config = config
-
-                if any(
-                    [
-                        self.instance_state.name == current_state
-                        and self.previous_instance_state.name == previous_state
-                        for current_state, previous_state in config.get(
-                            "INSTANCE_STATES", []
-                        )
-                    ]
-                ):
-                    active_service_config = config
-
-            active_service_config = (
-                active_service_config or default_active_service_config
-            )
+            return filter_type, active_services_settings.get(filter_type)
+
+        return config_registry.get_active_service_config(
+            self.instance_state.name, self.previous_instance_state.name
+        )
+
+    def _responsible_service_instance_service(self, filter_type=None, **kwargs):
+        name, active_service_config = self._get_active_service_config(filter_type)
+
+        preloaded = getattr(self, "_preloaded_responsible_services", {})
+        if name in preloaded:
+            return preloaded[name]
 
         service_filters = active_service_config.get("FILTERS", {})
 
-        instance_services = self.instance_services.filter(active=1, **service_filters)
-        instance_service = instance_services.order_by("-pk").first()
+        # fetch two to detect multiple active services in the same query
+        instance_services = list(
+            self.instance_services.filter(active=1, **service_filters)
+            .select_related("service")
+            .order_by("-pk")[:2]
+        )
 
-        if instance_services.count() > 1:
+        if len(instance_services) > 1:
             log.warning(
-                f"Instance {self.pk}: Multiple active services, picking most recent one: {instance_service.service.get_name()}!"
+                f"Instance {self.pk}: Multiple active services, picking most recent one: {instance_services[0].service.get_name()}!"
             )
 
-        return instance_service.service if instance_service else None
+        return instance_services[0].service if instance_services else None
+
+    @classmethod
+    def responsible_services_for(cls, instances, filter_type=None):
+        """Look up the responsible services of multiple instances.
+
+        Runs one query per active service config instead of one per
+        instance. The result is also stored on the instances, so later calls
+        of `responsible_service` with the same `filter_type` don't query
+        again.
+
+        :return: dict of instance pk to responsible service
+        """
+        if not settings.APPLICATION.get("USE_INSTANCE_SERVICE"):
+            prefetch_related_objects(instances, "group__service")
+            return {instance.pk: instance.group.service for instance in instances}
+
+        by_config = defaultdict(list)
+        configs = {}
+        for instance in instances:
+            name, config = instance._get_active_service_config(filter_type)
+            by_config[name].append(instance)
+            configs[name] = config
+
+        result = {}
+        for name, config_instances in by_config.items():
+            services = {}
+            for instance_service in (
+                core_models.InstanceService.objects.filter(
+                    instance__in=config_instances,
+                    active=1,
+                    **configs[name].get("FILTERS", {}),
+                )
+                .select_related("service")
+                .order_by("instance_id", "-pk")
+            ):
+                if instance_service.instance_id in services:
+                    log.warning(
+                        f"Instance {instance_service.instance_id}: Multiple active services, picking most recent one: {services[instance_service.instance_id].get_name()}!"
+                    )
+                    continue
+                services[instance_service.instance_id] = instance_service.service
+
+            for instance in config_instances:
+                result[instance.pk] = services.get(instance.pk)
+                if not hasattr(instance, "_preloaded_responsible_services"):
+                    instance._preloaded_responsible_services = {}
+                instance._preloaded_responsible_services[name] = result[instance.pk]
+
+        return result
 
     def responsible_service(self, **kwargs):
         """
@@ -345,6 +391,39 @@ class IssueTemplateSet(models.Model):
     name = models.CharField(max_length=500)
 
 
+class FormFieldSearchText(models.Func):
+    """Lowercased text of all strings and numbers in a form field value.
+
+    A trigram index exists on this expression, so `contains` lookups with a
+    lowercased search value are index backed.
+    """
+
+    function = "form_field_search_text"
+    output_field = models.TextField()
+
+
+class FormFieldSortNumber(models.Func):
+    """Number of a numeric form field value used for sorting, NULL otherwise.
+
+    Sorted by with nulls first before `FormFieldSortKey`, so numbers are
+    sorted numerically and after strings like in jsonb. Matches the index on
+    form field name and sort keys.
+    """
+
+    function = "form_field_sort_number"
+    output_field = models.DecimalField()
+
+
+class FormFieldSortKey(models.Func):
+    """Text of a form field value used for sorting, truncated to 255 chars.
+
+    Matches the index on form field name and sort keys.
+    """
+
+    function = "form_field_sort_key"
+    output_field = models.TextField()
+
+
 @reversion.register()
 class FormField(models.Model):
     """
@@ -1,7 +1,6 @@
 import base64
 from io import BytesIO
 
-import qrcode
 from caluma.caluma_form.models import Question
 from caluma.caluma_workflow.models import WorkItem
 from django.conf import settings
@@ -449,6 +448,9 @@ class InformationOfNeighborsField(serializers.ReadOnlyField):
 
     def to_representation(self, value):
         if value and self.type == "qr_code":
+            # imported on first use as it loads PIL
+            import qrcode
+
             data = BytesIO()
             img = qrcode.make(value)
             img.save(data, "PNG")
@@ -14,12 +14,13 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.management import call_command
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Manager, Q, prefetch_related_objects
 from django.utils import timezone
 from django.utils.translation import gettext as _, gettext_noop
 from rest_framework import exceptions
 from rest_framework_json_api import relations, serializers
 
+from camac import config_registry
 from camac.caluma.api import CalumaApi
 from camac.constants import kt_uri as uri_constants
 from camac.core.models import (
@@ -453,6 +454,16 @@ class CamacInstanceChangeFormSerializer(serializers.Serializer):
         resource_name = "instance-change-forms"
 
 
+class CalumaInstanceListSerializer(serializers.ListSerializer):
+    """Preload the facts of all instances of a page before serializing them."""
+
+    def to_representation(self, data):
+        instances = list(data.all() if isinstance(data, Manager) else data)
+        self.child.preload(instances)
+
+        return super().to_representation(instances)
+
+
 class CalumaInstanceSerializer(InstanceSerializer, InstanceQuerysetMixin):
     instance_state = serializers.ResourceRelatedField(
         queryset=models.InstanceState.objects.filter(name="new"),
@@ -492,6 +503,51 @@ class CalumaInstanceSerializer(InstanceSerializer, InstanceQuerysetMixin):
     rejection_feedback = serializers.SerializerMethodField()
     name = serializers.SerializerMethodField()
 
+    _coordinated_instances = None
+    _rejection_feedbacks = None
+
+    def preload(self, instances):
+        """Compute the facts of multiple instances in a few queries.
+
+        Used for lists, which would otherwise query them for every instance.
+        """
+        prefetch_related_objects(instances, "instance_state", "previous_instance_state")
+        CalumaApi().preload_facts(instances)
+
+        if "nfd" in settings.APPLICATION.get("CALUMA", {}).get("FORM_PERMISSIONS", []):
+            CalumaApi().preload_nfd_statuses(instances)
+
+        # used by `active_service` and `get_editable_for_service`
+        models.Instance.responsible_services_for(instances, filter_type="municipality")
+        models.Instance.responsible_services_for(instances)
+
+        self._coordinated_instances = set(
+            InstanceService.objects.filter(
+                instance__in=instances,
+                service__service_group__name="lead-service",
+                active=1,
+            ).values_list("instance_id", flat=True)
+        )
+
+        config = settings.APPLICATION["REJECTION_FEEDBACK_QUESTION"]
+        self._rejection_feedbacks = {
+            answer.instance_id: answer.get_value()
+            for answer in Answer.objects.filter(
+                instance__in=instances,
+                chapter=config.get("CHAPTER"),
+                question=config.get("QUESTION"),
+                item=config.get("ITEM"),
+            ).select_related("question")
+        }
+
+    def _is_coordinated(self, instance):
+        if self._coordinated_instances is not None:
+            return instance.pk in self._coordinated_instances
+
+        return instance.instance_services.filter(
+            service__service_group__name="lead-service", active=1
+        ).exists()
+
     def get_is_paper(self, instance):
         return CalumaApi().is_paper(instance)
 
@@ -835,9 +891,7 @@ class CalumaInstanceSerializer(InstanceSerializer, InstanceQuerysetMixin):
         imported = api.is_imported(instance)  # from dossier import
         paper = api.is_paper(instance)
         modification = api.is_modification(instance)
-        is_kog = instance.instance_services.filter(
-            service__service_group__name="lead-service", active=1
-        )
+        is_kog = self._is_coordinated(instance)
 
         if migrated:
             name = api.get_migration_type(instance)[1]
@@ -946,6 +1000,9 @@ class CalumaInstanceSerializer(InstanceSerializer, InstanceQuerysetMixin):
         )
 
     def get_rejection_feedback(self, instance):
+        if self._rejection_feedbacks is not None:
+            return self._rejection_feedbacks.get(instance.pk, "")
+
         return Answer.get_value_by_cqi(
             instance,
             settings.APPLICATION["REJECTION_FEEDBACK_QUESTION"].get("CHAPTER"),
@@ -955,6 +1012,7 @@ class CalumaInstanceSerializer(InstanceSerializer, InstanceQuerysetMixin):
         )
 
     class Meta(InstanceSerializer.Meta):
+        list_serializer_class = CalumaInstanceListSerializer
         fields = InstanceSerializer.Meta.fields + (
             "caluma_form",
             "is_paper",
@@ -1687,15 +1745,9 @@ class InstanceSubmitSerializer(InstanceSerializer):
         form_validator.validate()
 
         # find municipality assigned to location of instance
-        role_permissions = settings.APPLICATION.get("ROLE_PERMISSIONS", {})
-        municipality_roles = [
-            role
-            for role, permission in role_permissions.items()
-            if permission == "municipality"
-        ]
-
         location_group = Group.objects.filter(
-            locations=location, role__name__in=municipality_roles
+            locations=location,
+            role__name__in=config_registry.get_roles("municipality"),
         ).first()
 
         if location_group is None:
@@ -1715,9 +1767,8 @@ class FormFieldSerializer(InstanceEditableMixin, serializers.ModelSerializer):
     def validate_name(self, name):
         # TODO: check whether question is part of used form
 
-        perms = settings.APPLICATION.get("ROLE_PERMISSIONS", {})
         group = self.context["request"].group
-        permission = perms.get(group.role.name, "applicant")
+        permission = config_registry.get_permission(group.role.name) or "applicant"
 
         question = settings.FORM_CONFIG["questions"].get(name)
         if question is None:
@@ -303,3 +303,32 @@ def test_form_field_side_effect_history_entry(
             instance.history.first().title
             == application_settings["FORM_FIELD_HISTORY_ENTRY"][0]["title"]
         )
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("Large House", ["large house"]),
+        (
+            [{"egrid": "CH967722307039", "number": 420, "active": True}],
+            ["ch967722307039", "420"],
+        ),
+        ({"street": {"name": "Seestrasse", "number": "12a"}}, ["seestrasse", "12a"]),
+        (None, None),
+    ],
+)
+def test_form_field_search_text(db, form_field_factory, value, expected):
+    form_field = form_field_factory(value=value)
+
+    search_text = (
+        models.FormField.objects.annotate(
+            search_text=models.FormFieldSearchText("value")
+        )
+        .values_list("search_text", flat=True)
+        .get(pk=form_field.pk)
+    )
+
+    if expected is None:
+        assert search_text is None
+    else:
+        assert sorted(search_text.split(" ")) == sorted(" ".join(expected).split(" "))
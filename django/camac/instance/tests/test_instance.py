@@ -1663,17 +1663,28 @@ def test_instance_filter_pending_sanctions_control_instance(
 
 
 @pytest.mark.parametrize("role__name", ["Applicant"])
+@pytest.mark.parametrize(
+    "values",
+    [
+        ("ABC", "ZYX"),
+        (9, 10),
+        # strings before numbers and missing fields last, like jsonb
+        ("9", 10),
+        (10, None),
+    ],
+)
 def test_instance_form_field_ordering(
-    admin_client, admin_user, instance_factory, form_field_factory
+    admin_client, admin_user, instance_factory, form_field_factory, values
 ):
     url = reverse("instance-list")
 
     instances = instance_factory.create_batch(2, user=admin_user)
 
     add_field = functools.partial(form_field_factory, instance=instances[0])
-    add_field(name="bezeichnung", value="ABC")
-    add_field = functools.partial(form_field_factory, instance=instances[1])
-    add_field(name="bezeichnung", value="ZYX")
+    add_field(name="bezeichnung", value=values[0])
+    if values[1] is not None:
+        add_field = functools.partial(form_field_factory, instance=instances[1])
+        add_field(name="bezeichnung", value=values[1])
 
     response = admin_client.get(url, {"sort_form_field": "bezeichnung"})
 
@@ -444,6 +444,84 @@ def test_instance_list(
     assert set(json["data"][0]["meta"]["editable"]) == set(editable)
 
 
+def test_instance_serializer_preload(
+    db,
+    be_instance,
+    instance_factory,
+    instance_with_case,
+    answer_factory,
+    django_assert_num_queries,
+):
+    pks = [be_instance.pk] + [
+        instance_with_case(instance_factory()).pk for _ in range(2)
+    ]
+    answer_factory(
+        question_id="projektaenderung",
+        value="projektaenderung-ja",
+        document=Instance.objects.get(pk=pks[1]).case.document,
+    )
+
+    def get_facts(serializer, instance):
+        return (
+            serializer.get_is_paper(instance),
+            serializer.get_is_modification(instance),
+            serializer.get_name(instance),
+            serializer.get_rejection_feedback(instance),
+        )
+
+    expected = [
+        get_facts(CalumaInstanceSerializer(), instance)
+        for instance in Instance.objects.filter(pk__in=pks).order_by("pk")
+    ]
+
+    instances = list(Instance.objects.filter(pk__in=pks).order_by("pk"))
+    serializer = CalumaInstanceSerializer()
+    serializer.preload(instances)
+
+    # all facts of the page are preloaded, independent of the page size
+    with django_assert_num_queries(0):
+        assert [get_facts(serializer, instance) for instance in instances] == expected
+
+    assert [facts[1] for facts in expected] == [
+        instance.pk == pks[1] for instance in instances
+    ]
+
+
+def test_responsible_services_for(
+    db,
+    instance_factory,
+    instance_service_factory,
+    use_instance_service,
+    django_assert_num_queries,
+):
+    single, multiple, without = instance_factory.create_batch(3)
+    instance_service_factory(instance=single)
+    instance_service_factory(instance=multiple)
+    instance_service_factory(instance=multiple, active=0)
+    instance_service_factory(instance=multiple)
+
+    expected = {
+        instance.pk: instance.responsible_service(filter_type="municipality")
+        for instance in Instance.objects.all()
+    }
+    assert expected[without.pk] is None
+    assert expected[multiple.pk] == multiple.instance_services.last().service
+
+    instances = list(Instance.objects.all())
+
+    with django_assert_num_queries(1):
+        assert (
+            Instance.responsible_services_for(instances, filter_type="municipality")
+            == expected
+        )
+
+    with django_assert_num_queries(0):
+        assert {
+            instance.pk: instance.responsible_service(filter_type="municipality")
+            for instance in instances
+        } == expected
+
+
 @pytest.mark.parametrize("service_group__name", ["municipality"])
 @pytest.mark.parametrize("instance_state__name", ["new"])
 @pytest.mark.parametrize(
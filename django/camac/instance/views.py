@@ -2,7 +2,6 @@ import csv
 import mimetypes
 from datetime import timedelta
 
-import django_excel
 from caluma.caluma_form import models as form_models
 from caluma.caluma_workflow import api as workflow_api, models as workflow_models
 from dateutil.parser import parse as dateutil_parse
@@ -29,6 +28,7 @@ from rest_framework.settings import api_settings
 from rest_framework_json_api import views
 from rest_framework_json_api.views import ReadOnlyModelViewSet
 
+from camac import config_registry
 from camac.caluma.api import CalumaApi
 from camac.constants import kt_uri as ur_constants
 from camac.core.models import (
@@ -432,6 +432,8 @@ class InstanceView(
             for instance in queryset
         ]
 
+        import django_excel
+
         sheet = django_excel.pe.Sheet(content)
         return django_excel.make_response(
             sheet, file_type="xlsx", file_name="list.xlsx"
@@ -642,6 +644,8 @@ class InstanceView(
             _("Tags"),
         ]
 
+        import django_excel
+
         sheet = django_excel.pe.Sheet([header] + data)
         return django_excel.make_response(sheet, file_type="xlsx")
 
@@ -911,6 +915,27 @@ class InstanceResponsibilityView(mixins.InstanceQuerysetMixin, views.ModelViewSe
         return True
 
 
+def _compile_readable_questions(questions):
+    readable = {}
+    for question, value in questions.items():
+        # all permissions may read per default once they have access to instance
+        for permission in value.get(
+            "restrict",
+            [
+                "applicant",
+                "public_reader",
+                "reader",
+                "canton",
+                "municipality",
+                "service",
+                "support",
+            ],
+        ):
+            readable.setdefault(permission, []).append(question)
+
+    return {permission: tuple(names) for permission, names in readable.items()}
+
+
 class FormFieldView(
     mixins.InstanceQuerysetMixin, mixins.InstanceEditableMixin, views.ModelViewSet
 ):
@@ -932,26 +957,14 @@ class FormFieldView(
 
     def get_base_queryset(self):
         queryset = super().get_base_queryset()
-        perms = settings.APPLICATION.get("ROLE_PERMISSIONS", {})
-        permission = perms.get(self.request.group.role.name, "applicant")
-        questions = [
-            question
-            for question, value in settings.FORM_CONFIG["questions"].items()
-            # all permissions may read per default once they have access to instance
-            if permission
-            in value.get(
-                "restrict",
-                [
-                    "applicant",
-                    "public_reader",
-                    "reader",
-                    "canton",
-                    "municipality",
-                    "service",
-                    "support",
-                ],
-            )
-        ]
+        permission = (
+            config_registry.get_permission(self.request.group.role.name) or "applicant"
+        )
+        questions = config_registry.compiled(
+            "readable_questions",
+            settings.FORM_CONFIG["questions"],
+            _compile_readable_questions,
+        ).get(permission, ())
 
         return queryset.filter(name__in=questions)
 
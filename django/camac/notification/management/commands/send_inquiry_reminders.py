@@ -7,7 +7,7 @@ from django.core.management.base import BaseCommand
 from camac.notification.serializers import (
     PermissionlessNotificationTemplateSendmailSerializer,
 )
-from camac.notification.utils import send_mail
+from camac.notification.utils import send_mail_batch
 
 TEMPLATE_REMINDER_CIRCULATION = "05-meldung-fristuberschreitung-fachstelle"
 
@@ -16,16 +16,22 @@ class Command(BaseCommand):
     help = "Send reminders for all inquiries that exceeded their deadline yesterday."
 
     def handle(self, *args, **options):
-        for instance_id in WorkItem.objects.filter(
-            task_id=settings.DISTRIBUTION["INQUIRY_TASK"],
-            status=WorkItem.STATUS_READY,
-            deadline__date=date.today() - timedelta(days=1),
-            case__family__instance__instance_state__name="circulation",
-        ).values_list("case__family__instance__pk", flat=True):
-            send_mail(
-                TEMPLATE_REMINDER_CIRCULATION,
-                {},
-                PermissionlessNotificationTemplateSendmailSerializer,
-                recipient_types=["inquiry_deadline_yesterday"],
-                instance={"id": instance_id, "type": "instances"},
+        instance_ids = (
+            WorkItem.objects.filter(
+                task_id=settings.DISTRIBUTION["INQUIRY_TASK"],
+                status=WorkItem.STATUS_READY,
+                deadline__date=date.today() - timedelta(days=1),
+                case__family__instance__instance_state__name="circulation",
             )
+            .values_list("case__family__instance__pk", flat=True)
+            .order_by()
+            .distinct()
+        )
+
+        send_mail_batch(
+            TEMPLATE_REMINDER_CIRCULATION,
+            {},
+            instance_ids,
+            PermissionlessNotificationTemplateSendmailSerializer,
+            recipient_types=["inquiry_deadline_yesterday"],
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from camac.notification.outbox import deliver_queued_emails
+
+
+class Command(BaseCommand):
+    help = "Deliver all due emails of the notification outbox (including retries)."
+
+    def handle(self, *args, **options):
+        sent = deliver_queued_emails()
+        self.stdout.write(f"Sent {sent} queued emails")
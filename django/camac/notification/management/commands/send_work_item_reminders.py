@@ -1,10 +1,11 @@
+from collections import Counter, defaultdict
 from datetime import date
 
 from caluma.caluma_workflow.models import WorkItem
 from django.conf import settings
 from django.core import mail
 from django.core.management.base import BaseCommand
-from django.db.models import Q
+from django.db.models import BooleanField, ExpressionWrapper, Q
 
 from camac.user.models import Service, User
 
@@ -24,11 +25,19 @@ def get_task_trans(count, lang, controlling=False):
     return translations[lang]["singular" if count == 1 else "plural"]
 
 
+def _get_trans_name(service, language):
+    # iterate over the (prefetched) translations instead of querying them
+    return next(
+        (trans.name for trans in service.trans.all() if trans.language == language),
+        None,
+    )
+
+
 def render_service_template(
     addressed_overdue, addressed_not_viewed, controlling_overdue, service
 ):
     if settings.APPLICATION.get("IS_MULTILINGUAL"):
-        name = service.trans.filter(language="de").first().name
+        name = _get_trans_name(service, "de")
     else:
         name = service.name
 
@@ -46,7 +55,7 @@ Diese E-Mail wurde automatisch generiert, bitte antworten Sie nicht darauf.
 """
 
     if settings.APPLICATION.get("IS_MULTILINGUAL", False):
-        name_fr = service.trans.filter(language="fr").first().name
+        name_fr = _get_trans_name(service, "fr")
         text = (
             text
             + f"""
@@ -105,6 +114,46 @@ Ce message a été généré automatiquement, veuillez ne pas y répondre.
     return text
 
 
+def count_work_items(work_items, is_overdue, is_not_viewed):
+    """Count overdue and not viewed work items per user and per service.
+
+    All counters are computed in a single pass over the work items instead of
+    running multiple count queries per user and service.
+    """
+    user_counts = defaultdict(Counter)
+    service_counts = defaultdict(Counter)
+
+    rows = (
+        work_items.annotate(
+            overdue=ExpressionWrapper(is_overdue, output_field=BooleanField()),
+            not_viewed=ExpressionWrapper(is_not_viewed, output_field=BooleanField()),
+        )
+        .values_list(
+            "assigned_users",
+            "addressed_groups",
+            "controlling_groups",
+            "overdue",
+            "not_viewed",
+        )
+        .order_by()
+        .iterator()
+    )
+
+    for assigned_users, addressed, controlling, overdue, not_viewed in rows:
+        for username in set(assigned_users):
+            user_counts[username]["overdue"] += bool(overdue)
+            user_counts[username]["not_viewed"] += bool(not_viewed)
+
+        for service_id in set(addressed):
+            service_counts[str(service_id)]["addressed_overdue"] += bool(overdue)
+            service_counts[str(service_id)]["addressed_not_viewed"] += bool(not_viewed)
+
+        for service_id in set(controlling):
+            service_counts[str(service_id)]["controlling_overdue"] += bool(overdue)
+
+    return user_counts, service_counts
+
+
 class Command(BaseCommand):
     help = "Send reminders for unread or overdue work items."
 
@@ -125,28 +174,24 @@ class Command(BaseCommand):
             )
             .filter(deadline__isnull=False)
             .filter(is_overdue | is_not_viewed)
-            .order_by("deadline", "name")
+        )
+
+        user_counts, service_counts = count_work_items(
+            work_items, is_overdue, is_not_viewed
         )
 
         emails = []
 
         # assigned_users
-        all_assigned_usernames = set(
-            username
-            for item in work_items.values_list("assigned_users", flat=True)
-            for username in item
-        )
         all_assigned_users = (
             User.objects.exclude(disabled=1)
-            .filter(username__in=all_assigned_usernames)
+            .filter(username__in=user_counts.keys())
             .order_by("username")
         )
 
         for user in all_assigned_users:
-            user_items = work_items.filter(assigned_users__contains=[user.username])
-
-            not_viewed_items = user_items.filter(is_not_viewed).count()
-            overdue_items = user_items.filter(is_overdue).count()
+            not_viewed_items = user_counts[user.username]["not_viewed"]
+            overdue_items = user_counts[user.username]["overdue"]
 
             if not_viewed_items + overdue_items > 0:
                 emails.append(
@@ -159,26 +204,19 @@ class Command(BaseCommand):
                 )
 
         # addressed or controlling groups
-        all_service_ids = set(
-            group
-            for item in work_items.values("addressed_groups", "controlling_groups")
-            for group in item["addressed_groups"] + item["controlling_groups"]
-        )
         all_services = (
             Service.objects.exclude(disabled=1)
-            .filter(pk__in=all_service_ids)
+            .filter(pk__in=service_counts.keys())
+            .prefetch_related("trans")
             .order_by("pk")
         )
 
         for service in all_services:
-            addressed = work_items.filter(addressed_groups__contains=[str(service.pk)])
-            controlling = work_items.filter(
-                controlling_groups__contains=[str(service.pk)]
-            )
+            counts = service_counts[str(service.pk)]
 
-            addressed_overdue = addressed.filter(is_overdue).count()
-            addressed_not_viewed = addressed.filter(is_not_viewed).count()
-            controlling_overdue = controlling.filter(is_overdue).count()
+            addressed_overdue = counts["addressed_overdue"]
+            addressed_not_viewed = counts["addressed_not_viewed"]
+            controlling_overdue = counts["controlling_overdue"]
 
             if addressed_overdue + addressed_not_viewed + controlling_overdue > 0:
                 emails.append(
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.14 on 2022-08-03 08:30
+
+from django.db import migrations
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.get_or_create(
+        name="deliver-queued-emails",
+        defaults={
+            "func": "camac.notification.outbox.deliver_queued_emails",
+            "schedule_type": "I",
+            "minutes": 1,
+            "repeats": -1,
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(name="deliver-queued-emails").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notification", "0008_queuedemail"),
+        ("django_q", "0014_schedule_cluster"),
+    ]
+
+    operations = [migrations.RunPython(create_schedule, delete_schedule)]
@@ -1,4 +1,6 @@
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
+from django.utils import timezone
 
 from ..core import models as core_models
 
@@ -62,3 +64,33 @@ class ProjectSubmitterData(models.Model):
     class Meta:
         managed = False
         db_table = "PROJECT_SUBMITTER_DATA"
+
+
+class QueuedEmail(models.Model):
+    """Email waiting in the outbox to be delivered by a worker."""
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_PENDING, STATUS_PENDING),
+        (STATUS_SENT, STATUS_SENT),
+        (STATUS_FAILED, STATUS_FAILED),
+    )
+
+    subject = models.TextField()
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = ArrayField(models.CharField(max_length=254), default=list)
+    cc = ArrayField(models.CharField(max_length=254), default=list)
+    created_at = models.DateTimeField(default=timezone.now)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt"])]
@@ -0,0 +1,128 @@
+from datetime import timedelta
+from logging import getLogger
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+from django_q.tasks import async_task
+
+from . import models
+
+logger = getLogger(__name__)
+
+
+def queue_emails(emails):
+    """Write the given emails to the outbox.
+
+    Delivery is triggered as soon as the surrounding transaction is committed,
+    so emails of a rolled back request are never sent.
+    """
+    models.QueuedEmail.objects.bulk_create(
+        [
+            models.QueuedEmail(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=email.to,
+                cc=email.cc,
+            )
+            for email in emails
+        ]
+    )
+
+    transaction.on_commit(lambda: async_task(deliver_queued_emails))
+
+
+def _claim_batch():
+    return list(
+        models.QueuedEmail.objects.select_for_update(skip_locked=True)
+        .filter(
+            status=models.QueuedEmail.STATUS_PENDING,
+            next_attempt__lte=timezone.now(),
+        )
+        .order_by("next_attempt", "pk")[: settings.EMAIL_OUTBOX_BATCH_SIZE]
+    )
+
+
+def _record_failure(queued_email, error):
+    queued_email.error = error
+
+    if queued_email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        queued_email.status = models.QueuedEmail.STATUS_FAILED
+        logger.error(
+            f'Giving up sending email "{queued_email.subject}" to '
+            f"{queued_email.to}: {queued_email.error}"
+        )
+    else:
+        queued_email.next_attempt = timezone.now() + timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (queued_email.attempts - 1)
+        )
+
+
+def _deliver(queued_email, connection):
+    queued_email.attempts += 1
+
+    try:
+        EmailMessage(
+            subject=queued_email.subject,
+            body=queued_email.body,
+            from_email=queued_email.from_email,
+            to=queued_email.to,
+            cc=queued_email.cc,
+            connection=connection,
+        ).send()
+    except Exception as e:  # noqa: B902
+        _record_failure(queued_email, str(e))
+        return False
+
+    queued_email.status = models.QueuedEmail.STATUS_SENT
+    queued_email.sent_at = timezone.now()
+    queued_email.error = ""
+    logger.info(f'Sent email "{queued_email.subject}" to {queued_email.to}')
+    return True
+
+
+def _deliver_batch(batch, connection):
+    try:
+        connection.open()
+    except Exception as e:  # noqa: B902
+        # e.g. the mail server is down, every email of the batch is retried
+        logger.warning(f"Failed to connect to the mail server: {e}")
+        for queued_email in batch:
+            queued_email.attempts += 1
+            _record_failure(queued_email, str(e))
+        return 0
+
+    try:
+        return sum(_deliver(queued_email, connection) for queued_email in batch)
+    finally:
+        connection.close()
+
+
+def deliver_queued_emails():
+    """Deliver all due emails of the outbox in batches.
+
+    Rows are claimed with `SKIP LOCKED`, so multiple workers can deliver
+    concurrently. Failed deliveries (including failed connections to the
+    mail server) are retried with an exponential backoff, either when the
+    next email is queued or by the `deliver-queued-emails` schedule.
+
+    :return: number of sent emails
+    """
+    sent = 0
+    connection = get_connection()
+
+    while True:
+        with transaction.atomic():
+            batch = _claim_batch()
+            if not batch:
+                break
+
+            sent += _deliver_batch(batch, connection)
+
+            models.QueuedEmail.objects.bulk_update(
+                batch, ["attempts", "status", "next_attempt", "sent_at", "error"]
+            )
+
+    return sent
@@ -16,6 +16,7 @@ from django.db.models import Exists, Func, IntegerField, OuterRef, Q, Subquery,
 from django.db.models.functions import Cast
 from django.utils import timezone, translation
 from django.utils.text import slugify
+from jinja2 import meta as jinja2_meta
 from rest_framework import exceptions
 from rest_framework_json_api import serializers
 
@@ -41,6 +42,7 @@ from camac.utils import flatten, get_responsible_koor_service_id
 
 from ..core import models as core_models
 from . import models
+from .outbox import queue_emails
 
 logger = getLogger(__name__)
 
@@ -201,11 +203,21 @@ class InstanceMergeSerializer(InstanceEditableMixin, serializers.Serializer):
     work_item_name = serializers.SerializerMethodField()
 
     def __init__(
-        self, instance=None, inquiry=None, work_item=None, escape=False, *args, **kwargs
+        self,
+        instance=None,
+        inquiry=None,
+        work_item=None,
+        escape=False,
+        placeholders=None,
+        *args,
+        **kwargs,
     ):
         self.escape = escape
         self.inquiry = inquiry
         self.work_item = work_item
+        # names of the placeholders which are needed; `None` means all
+        self.placeholders = placeholders
+        self._placeholder_cache = {}
 
         super().__init__(instance=instance, *args, **kwargs)
 
@@ -213,6 +225,28 @@ class InstanceMergeSerializer(InstanceEditableMixin, serializers.Serializer):
             self.context["request"].group.service if "request" in self.context else None
         )
 
+    def get_fields(self):
+        fields = super().get_fields()
+
+        if self.placeholders is None:
+            return fields
+
+        return {
+            name: field for name, field in fields.items() if name in self.placeholders
+        }
+
+    def _needs_form_fields(self):
+        return self.placeholders is None or any(
+            placeholder.startswith("field_") for placeholder in self.placeholders
+        )
+
+    def _cached(self, key, func):
+        """Memoize values which are needed by multiple placeholders."""
+        if key not in self._placeholder_cache:
+            self._placeholder_cache[key] = func()
+
+        return self._placeholder_cache[key]
+
     def _escape(self, data):
         result = data
         if isinstance(data, str):
@@ -326,22 +360,33 @@ class InstanceMergeSerializer(InstanceEditableMixin, serializers.Serializer):
 
         return publications
 
+    def _get_leitbehoerde(self, instance):
+        return self._cached(
+            ("leitbehoerde", instance.pk),
+            lambda: instance.responsible_service(filter_type="municipality"),
+        )
+
     def get_leitbehoerde_name_de(self, instance):
         """Return current active service of the instance in german."""
-        service = instance.responsible_service(filter_type="municipality")
+        service = self._get_leitbehoerde(instance)
 
         return service.get_name("de") if service else "-"
 
     def get_leitbehoerde_name_fr(self, instance):
         """Return current active service of the instance in french."""
-        service = instance.responsible_service(filter_type="municipality")
+        service = self._get_leitbehoerde(instance)
 
         return service.get_name("fr") if service else "-"
 
+    def _get_master_data(self, instance):
+        return self._cached(
+            ("master_data", instance.pk), lambda: MasterData(instance.case)
+        )
+
     def get_municipality_de(self, instance):
         """Return municipality in german."""
         try:
-            master_data = MasterData(instance.case)
+            master_data = self._get_master_data(instance)
 
             with translation.override("de"):
                 return f"Gemeinde {master_data.municipality.get('label')}"
@@ -351,7 +396,7 @@ class InstanceMergeSerializer(InstanceEditableMixin, serializers.Serializer):
     def get_municipality_fr(self, instance):
         """Return municipality in french."""
         try:
-            master_data = MasterData(instance.case)
+            master_data = self._get_master_data(instance)
 
             with translation.override("fr"):
                 return f"Municipalité {master_data.municipality.get('label')}"
@@ -439,11 +484,16 @@ class InstanceMergeSerializer(InstanceEditableMixin, serializers.Serializer):
             self.inquiry.document, settings.DISTRIBUTION["QUESTIONS"]["REMARK"]
         )
 
+    def _get_form_name(self, instance):
+        return self._cached(
+            ("form_name", instance.pk), lambda: CalumaApi().get_form_name(instance)
+        )
+
     def get_form_name_de(self, instance):
-        return CalumaApi().get_form_name(instance).de or ""
+        return self._get_form_name(instance).de or ""
 
     def get_form_name_fr(self, instance):
-        return CalumaApi().get_form_name(instance).fr or ""
+        return self._get_form_name(instance).fr or ""
 
     def get_ebau_number(self, instance):
         """Dossier number - Kanton Bern."""
@@ -480,12 +530,30 @@ class InstanceMergeSerializer(InstanceEditableMixin, serializers.Serializer):
     def get_base_url(self, instance):
         return settings.INTERNAL_BASE_URL
 
+    def _get_workflow_entry_dates(self, instance):
+        """Fetch the first entry of all needed workflow items in one query."""
+        workflow_items = settings.APPLICATION.get("WORKFLOW_ITEMS", {})
+        entries = {}
+
+        for entry in WorkflowEntry.objects.filter(
+            instance=instance,
+            workflow_item__in=[
+                workflow_items.get(key)
+                for key in ["INSTANCE_COMPLETE", "SUBMIT", "DECISION"]
+            ],
+        ).order_by("pk"):
+            entries.setdefault(entry.workflow_item_id, entry.workflow_date)
+
+        return entries
+
     def _get_workflow_entry_date(self, instance, item_id):
-        entry = WorkflowEntry.objects.filter(
-            instance=instance, workflow_item=item_id
-        ).first()
-        if entry:
-            return self.format_date(entry.workflow_date)
+        entries = self._cached(
+            ("workflow_entries", instance.pk),
+            lambda: self._get_workflow_entry_dates(instance),
+        )
+
+        if item_id in entries:
+            return self.format_date(entries[item_id])
         return "---"
 
     def get_date_dossiervollstandig(self, instance):
@@ -519,20 +587,28 @@ class InstanceMergeSerializer(InstanceEditableMixin, serializers.Serializer):
             instance, settings.APPLICATION.get("WORKFLOW_ITEMS", {}).get("DECISION")
         )
 
+    def _get_billing_totals(self, instance):
+        return self._cached(
+            ("billing_totals", instance.pk),
+            lambda: BillingV2Entry.objects.filter(instance=instance).aggregate(
+                total=Sum("final_rate"),
+                kommunal=Sum(
+                    "final_rate", filter=Q(organization=BillingV2Entry.MUNICIPAL)
+                ),
+                kanton=Sum(
+                    "final_rate", filter=Q(organization=BillingV2Entry.CANTONAL)
+                ),
+            ),
+        )
+
     def get_billing_total_kommunal(self, instance):
-        return BillingV2Entry.objects.filter(
-            instance=instance, organization=BillingV2Entry.MUNICIPAL
-        ).aggregate(total=Sum("final_rate"))["total"]
+        return self._get_billing_totals(instance)["kommunal"]
 
     def get_billing_total_kanton(self, instance):
-        return BillingV2Entry.objects.filter(
-            instance=instance, organization=BillingV2Entry.CANTONAL
-        ).aggregate(total=Sum("final_rate"))["total"]
+        return self._get_billing_totals(instance)["kanton"]
 
     def get_billing_total(self, instance):
-        return BillingV2Entry.objects.filter(instance=instance).aggregate(
-            total=Sum("final_rate")
-        )["total"]
+        return self._get_billing_totals(instance)["total"]
 
     def _get_inquiries(self, instance):
         if not settings.DISTRIBUTION:
@@ -679,7 +755,9 @@ class InstanceMergeSerializer(InstanceEditableMixin, serializers.Serializer):
     def to_representation(self, instance):
         ret = super().to_representation(instance)
 
-        for field in instance.fields.all():
+        form_fields = instance.fields.all() if self._needs_form_fields() else []
+
+        for field in form_fields:
             # remove versioning (-v3) from question names so the placeholders are backwards compatible
             name_without_version = re.sub(r"(-v\d+$)", "", field.name)
             name = inflection.underscore("field-" + name_without_version)
@@ -766,6 +844,25 @@ class NotificationTemplateMergeSerializer(
     subject = serializers.CharField(required=False)
     body = serializers.CharField(required=False)
 
+    def _get_placeholders(self, *values):
+        """Return the names of all variables used in the given templates.
+
+        Returns `None` if the templates can't be parsed, in which case all
+        placeholders are computed and the error is raised while merging.
+        """
+        environment = jinja2.Environment()
+
+        try:
+            return {
+                name.lower()
+                for value in values
+                for name in jinja2_meta.find_undeclared_variables(
+                    environment.parse(value or "")
+                )
+            }
+        except jinja2.TemplateError:
+            return None
+
     def _merge(self, value, data):
         try:
             value_template = jinja2.Template(value)
@@ -778,24 +875,23 @@ class NotificationTemplateMergeSerializer(
         notification_template = data["notification_template"]
         instance = data["instance"]
 
+        subject = data.get("subject", notification_template.get_trans_attr("subject"))
+        body = data.get("body", notification_template.get_trans_attr("body"))
+
+        # only compute the placeholders which are used in the template
         placeholder_data = InstanceMergeSerializer(
             instance=instance,
             context=self.context,
             inquiry=data.get("inquiry"),
             work_item=data.get("work_item"),
+            placeholders=self._get_placeholders(subject, body),
         ).data
 
         # some cantons use uppercase placeholders. be as compatible as possible
         placeholder_data.update({k.upper(): v for k, v in placeholder_data.items()})
 
-        data["subject"] = self._merge(
-            data.get("subject", notification_template.get_trans_attr("subject")),
-            placeholder_data,
-        )
-        data["body"] = self._merge(
-            data.get("body", notification_template.get_trans_attr("body")),
-            placeholder_data,
-        )
+        data["subject"] = self._merge(subject, placeholder_data)
+        data["body"] = self._merge(body, placeholder_data)
         data["pk"] = "{0}-{1}".format(notification_template.slug, instance.pk)
 
         return data
@@ -1207,7 +1303,8 @@ class NotificationTemplateSendmailSerializer(NotificationTemplateMergeSerializer
         emails = []
         post_send = []
 
-        connection = get_connection()
+        # batch sending shares one connection for multiple serializers
+        connection = self.context.get("connection") or get_connection()
 
         for recipient_type in sorted(validated_data["recipient_types"]):
             recipients = getattr(self, "_get_recipients_%s" % recipient_type)(instance)
@@ -1245,7 +1342,7 @@ class NotificationTemplateSendmailSerializer(NotificationTemplateMergeSerializer
             # operation user.
             user = None
 
-            if self.context:
+            if self.context.get("request"):
                 user = self.context["request"].user
             elif settings.APPLICATION.get("SYSTEM_USER"):
                 user = User.objects.filter(
@@ -1309,8 +1406,11 @@ class NotificationTemplateSendmailSerializer(NotificationTemplateMergeSerializer
             )
 
     def _send_mails(self, emails, connection):
-        if emails:
-            connection.open()
+        if emails and settings.EMAIL_OUTBOX:
+            queue_emails(emails)
+        elif emails:
+            # only close the connection if it hasn't been opened by the caller
+            opened = connection.open()
             exceptions = []
             for email in emails:
                 try:
@@ -1318,7 +1418,9 @@ class NotificationTemplateSendmailSerializer(NotificationTemplateMergeSerializer
                     logger.info(f'Sent email "{email.subject}" to {email.to}')
                 except Exception as e:  # noqa: B902
                     exceptions.append((e, email))
-            connection.close()
+
+            if opened is not False:
+                connection.close()
 
             if len(exceptions) > 0:
                 error_msgs = "\n".join(
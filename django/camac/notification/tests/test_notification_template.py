@@ -1485,3 +1485,48 @@ def test_notification_history_entry(
             history_entry.title == f"Notifikation gesendet an {service.email} (Subject)"
         )
         assert history_entry.body == "Body"
+
+
+def test_instance_merge_serializer_placeholders(
+    db,
+    sz_instance,
+    settings,
+    workflow_entry_factory,
+    billing_v2_entry_factory,
+    django_assert_max_num_queries,
+):
+    settings.APPLICATION["WORKFLOW_ITEMS"]["SUBMIT"] = workflow_entry_factory(
+        instance=sz_instance,
+        workflow_date=timezone.make_aware(datetime(2019, 7, 22, 10)),
+    ).workflow_item.pk
+    billing_v2_entry_factory(instance=sz_instance, organization="municipal")
+    billing_v2_entry_factory(instance=sz_instance, organization="cantonal")
+
+    placeholders = serializers.NotificationTemplateMergeSerializer()._get_placeholders(
+        "{{ IDENTIFIER }}",
+        """
+        {{ date_dossiereingang }} {{ date_dossiervollstandig }}
+        {% for total in [billing_total, billing_total_kanton] %}{{ total }}{% endfor %}
+        """,
+    )
+
+    # workflow entries and billing totals are fetched with one query each
+    with django_assert_max_num_queries(2):
+        data = InstanceMergeSerializer(
+            instance=sz_instance, placeholders=placeholders
+        ).data
+
+    assert set(data.keys()) == {
+        "identifier",
+        "date_dossiereingang",
+        "date_dossiervollstandig",
+        "billing_total",
+        "billing_total_kanton",
+    }
+    assert data["date_dossiereingang"] == "22.07.2019"
+    assert data["date_dossiervollstandig"] == "---"
+
+    assert (
+        serializers.NotificationTemplateMergeSerializer()._get_placeholders("{{$x}}")
+        is None
+    )
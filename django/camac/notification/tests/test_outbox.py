@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+import pytest
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.utils import timezone
+
+from camac.notification import models, outbox
+from camac.notification.serializers import NotificationTemplateSendmailSerializer
+
+
+def _queue(*recipients):
+    outbox.queue_emails(
+        [
+            EmailMessage(subject="Subject", body="Body", to=[to], cc=["cc@example.com"])
+            for to in recipients
+        ]
+    )
+
+
+def test_queue_emails(db, mocker, mailoutbox, django_capture_on_commit_callbacks):
+    async_task = mocker.patch("camac.notification.outbox.async_task")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _queue("foo@example.com", "bar@example.com")
+
+        # nothing is sent before the transaction is committed
+        assert not async_task.called
+
+    async_task.assert_called_once_with(outbox.deliver_queued_emails)
+    assert len(mailoutbox) == 0
+    assert (
+        models.QueuedEmail.objects.filter(
+            status=models.QueuedEmail.STATUS_PENDING
+        ).count()
+        == 2
+    )
+
+    assert outbox.deliver_queued_emails() == 2
+    assert sorted((m.to, m.cc) for m in mailoutbox) == [
+        (["bar@example.com"], ["cc@example.com"]),
+        (["foo@example.com"], ["cc@example.com"]),
+    ]
+    assert not models.QueuedEmail.objects.exclude(
+        status=models.QueuedEmail.STATUS_SENT
+    ).exists()
+
+    # sent emails are not delivered again
+    assert outbox.deliver_queued_emails() == 0
+
+
+def test_deliver_queued_emails_retry(db, mocker, mailoutbox, settings):
+    settings.EMAIL_OUTBOX_BATCH_SIZE = 1
+    settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+    mocker.patch("camac.notification.outbox.async_task")
+    original_send = EmailMessage.send
+
+    def on_send(self, *args, **kwargs):
+        if "not.an.email" in self.to:
+            raise Exception("Invalid E-Mail")
+        return original_send(self, *args, **kwargs)
+
+    mocker.patch("django.core.mail.EmailMessage.send", new=on_send)
+
+    _queue("not.an.email", "fine@example.com")
+
+    assert outbox.deliver_queued_emails() == 1
+    assert [m.to for m in mailoutbox] == [["fine@example.com"]]
+
+    failed = models.QueuedEmail.objects.get(to=["not.an.email"])
+    assert failed.status == models.QueuedEmail.STATUS_PENDING
+    assert failed.attempts == 1
+    assert failed.error == "Invalid E-Mail"
+    assert failed.next_attempt > timezone.now()
+
+    # retry is not due yet
+    assert outbox.deliver_queued_emails() == 0
+    assert models.QueuedEmail.objects.get(pk=failed.pk).attempts == 1
+
+    failed.next_attempt = timezone.now() - timedelta(seconds=1)
+    failed.save()
+
+    call_command("send_queued_emails")
+
+    failed.refresh_from_db()
+    assert failed.status == models.QueuedEmail.STATUS_FAILED
+    assert failed.attempts == 2
+
+
+@pytest.mark.parametrize("email_outbox", [True, False])
+def test_sendmail_serializer_outbox(db, mocker, mailoutbox, settings, email_outbox):
+    settings.EMAIL_OUTBOX = email_outbox
+    mocker.patch("camac.notification.outbox.async_task")
+
+    NotificationTemplateSendmailSerializer()._send_mails(
+        [EmailMessage(subject="Subject", body="Body", to=["foo@example.com"])],
+        mocker.MagicMock(),
+    )
+
+    assert models.QueuedEmail.objects.exists() == email_outbox
+    assert len(mailoutbox) == (0 if email_outbox else 1)
+
+
+def test_deliver_queued_emails_connection_failure(db, mocker, mailoutbox, settings):
+    settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+    mocker.patch("camac.notification.outbox.async_task")
+    connection = mocker.MagicMock()
+    connection.open.side_effect = ConnectionRefusedError("Connection refused")
+    mocker.patch("camac.notification.outbox.get_connection", return_value=connection)
+
+    _queue("foo@example.com", "bar@example.com")
+
+    assert outbox.deliver_queued_emails() == 0
+
+    queued = models.QueuedEmail.objects.all()
+    assert all(email.attempts == 1 for email in queued)
+    assert all(email.status == models.QueuedEmail.STATUS_PENDING for email in queued)
+    assert all(email.next_attempt > timezone.now() for email in queued)
+    assert all(email.error == "Connection refused" for email in queued)
+
+    queued.update(next_attempt=timezone.now() - timedelta(seconds=1))
+    assert outbox.deliver_queued_emails() == 0
+    assert not models.QueuedEmail.objects.exclude(
+        status=models.QueuedEmail.STATUS_FAILED
+    ).exists()
+    assert len(mailoutbox) == 0
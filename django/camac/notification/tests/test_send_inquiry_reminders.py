@@ -4,6 +4,8 @@ import pytest
 from django.core.management import call_command
 from django.utils import timezone
 
+from camac.notification import serializers, utils
+
 
 @pytest.mark.parametrize("instance_state__name", ["circulation"])
 def test_send_inquiry_reminders(
@@ -24,3 +26,36 @@ def test_send_inquiry_reminders(
 
     call_command("send_inquiry_reminders")
     assert len(mailoutbox) == 1
+
+
+@pytest.mark.parametrize("instance_state__name", ["circulation"])
+def test_send_inquiry_reminders_batch(
+    db,
+    be_instance,
+    active_inquiry_factory,
+    service_factory,
+    notification_template,
+    system_operation_user,
+    mailoutbox,
+    mocker,
+):
+    mocker.patch(
+        "camac.notification.management.commands.send_inquiry_reminders.TEMPLATE_REMINDER_CIRCULATION",
+        notification_template.slug,
+    )
+    batch_connection = mocker.spy(utils, "get_connection")
+    serializer_connection = mocker.spy(serializers, "get_connection")
+
+    for _ in range(2):
+        active_inquiry_factory(
+            addressed_service=service_factory(),
+            deadline=timezone.now() - timedelta(days=1),
+        )
+
+    call_command("send_inquiry_reminders")
+
+    # one email per addressed service, even though both inquiries belong to
+    # the same instance, sent over one shared connection
+    assert len(mailoutbox) == 2
+    assert batch_connection.call_count == 1
+    assert serializer_connection.call_count == 0
@@ -83,3 +83,30 @@ def test_dont_send_reminders_caluma(db, user, service, work_item_factory, mailou
     )
     call_command("send_work_item_reminders")
     assert len(mailoutbox) == 0
+
+
+@pytest.mark.parametrize("service_count", [1, 10])
+def test_send_work_item_reminders_num_queries(
+    db,
+    service_factory,
+    user_factory,
+    work_item_factory,
+    mailoutbox,
+    django_assert_num_queries,
+    service_count,
+):
+    for service in service_factory.create_batch(service_count):
+        work_item_factory(
+            status="ready",
+            meta={"not-viewed": True},
+            deadline=timezone.now() - timedelta(days=1),
+            assigned_users=[user_factory().username],
+            addressed_groups=[str(service.pk)],
+            controlling_groups=[str(service.pk)],
+        )
+
+    # counting work items, fetching users, services and their translations
+    with django_assert_num_queries(4):
+        call_command("send_work_item_reminders")
+
+    assert len(mailoutbox) == service_count * 2
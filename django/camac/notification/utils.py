@@ -1,5 +1,7 @@
 from collections import namedtuple
 
+from django.core.mail import get_connection
+
 from camac.notification.models import NotificationTemplate
 from camac.notification.serializers import (
     NotificationTemplateSendmailSerializer,
@@ -36,6 +38,43 @@ def send_mail(
     """Call a SendmailSerializer based on a NotificationTemplate Slug."""
     notification_template = NotificationTemplate.objects.get(slug=slug)
 
+    return _send_notification_template(
+        notification_template, context, serializer, **kwargs
+    )
+
+
+def send_mail_batch(
+    slug,
+    context,
+    instance_ids,
+    serializer=NotificationTemplateSendmailSerializer,
+    **kwargs,
+):
+    """Send a NotificationTemplate for multiple instances at once.
+
+    The template is only fetched once and all emails are delivered over a
+    single connection instead of opening a new one per instance.
+    """
+    notification_template = NotificationTemplate.objects.get(slug=slug)
+    connection = get_connection()
+    connection.open()
+
+    try:
+        return [
+            _send_notification_template(
+                notification_template,
+                {**context, "connection": connection},
+                serializer,
+                instance={"id": instance_id, "type": "instances"},
+                **kwargs,
+            )
+            for instance_id in instance_ids
+        ]
+    finally:
+        connection.close()
+
+
+def _send_notification_template(notification_template, context, serializer, **kwargs):
     data = {
         "notification_template": {
             "type": "notification-templates",
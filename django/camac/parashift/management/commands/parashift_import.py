@@ -15,11 +15,26 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("from_id", type=int, help="Parashift ID starting with")
         parser.add_argument("to_id", type=int, help="Parashift ID ending with")
+        parser.add_argument(
+            "--fetch-workers",
+            type=int,
+            default=None,
+            help="Number of records to fetch concurrently",
+        )
+        parser.add_argument(
+            "--crop-workers",
+            type=int,
+            default=None,
+            help="Number of processes for cropping PDFs (0 to crop in process)",
+        )
 
     def handle(self, *args, **options):
         from_id = options.get("from_id")
         to_id = options.get("to_id")
-        client = ParashiftImporter()
+        client = ParashiftImporter(
+            fetch_workers=options.get("fetch_workers"),
+            crop_workers=options.get("crop_workers"),
+        )
         try:
             client.run(from_id, to_id)
         except (ParashiftDataError, ParashiftValidationError) as e:
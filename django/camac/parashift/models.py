@@ -0,0 +1,20 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ImportedRecord(models.Model):
+    """Checkpoint of a parashift record which has been imported.
+
+    Written in the same transaction as the imported instance, so an
+    interrupted import can be resumed without fetching the records again.
+    """
+
+    external_id = models.CharField(max_length=255, unique=True)
+    instance = models.ForeignKey(
+        "instance.Instance",
+        models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    created_at = models.DateTimeField(default=timezone.now)
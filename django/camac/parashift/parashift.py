@@ -1,14 +1,21 @@
 import io
 import math
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
 
 import requests
 from django.conf import settings
+from django.db import transaction
 from PyPDF2 import PdfReader, PdfWriter
+from requests.adapters import HTTPAdapter
 
 from camac.constants import kt_uri as uri_constants
 from camac.core.import_dossiers import import_dossiers
 from camac.utils import build_url
 
+from .models import ImportedRecord
+
 GROUP_KOOR_ARE_BG_ID = 142
 
 
@@ -28,8 +35,59 @@ class ParashiftDataError(Exception):
     pass
 
 
+def crop_pdf_file(source, barcodes, external_id):
+    """Split the PDF `source` (path or file) into one document per barcode.
+
+    This is a module level function taking and returning only picklable
+    values, so it can be run in a process pool.
+    """
+    pdf = PdfReader(source)
+    barcodes = list(barcodes)
+
+    try:
+        barcodes.pop(0)
+    except IndexError:  # pragma: no cover
+        print(f"{external_id}: no barcode in record")
+        pass
+
+    documents = []
+    for index, code in enumerate(barcodes, start=1):
+        section = uri_constants.PARASHIFT_ATTACHMENT_SECTION_MAPPING.get(code["type"])
+        if not section:  # pragma: no cover
+            print(f"{external_id}: unexpected barcode type {code['type']}, skipping")
+            continue
+
+        start = code["page"]
+        stop = None
+        for c in barcodes:
+            if c["page"] > start:
+                stop = c["page"] - 1
+                break
+
+        if stop is None:
+            stop = len(pdf.pages) - 1
+
+        output = PdfWriterWithStreamAttribute()
+
+        for page in range(start, stop + 1):
+            output.add_page(pdf.pages[page])
+
+        bytes_file = io.BytesIO()
+        output.write(bytes_file)
+        documents.append(
+            {"section": section, "name": f"{index}.pdf", "data": bytes_file.getvalue()}
+        )
+    return documents
+
+
 class ParashiftImporter:
-    """Import dossier from parashift."""
+    """Import dossier from parashift.
+
+    Records are fetched concurrently over a pooled HTTP session and their
+    source PDFs are spooled to temporary files. Every imported record is
+    checkpointed, so restarting an import skips the records which have
+    already been imported.
+    """
 
     DATA_URI_FORMAT = build_url(
         settings.PARASHIFT_BASE_URI,
@@ -73,12 +131,23 @@ class ParashiftImporter:
         "baurecht-nr": (lambda a: int(a), "Must be an integer!"),
     }
 
+    def __init__(self, fetch_workers=None, crop_workers=None):
+        self.fetch_workers = fetch_workers or settings.PARASHIFT_FETCH_WORKERS
+        self.crop_workers = (
+            settings.PARASHIFT_CROP_WORKERS if crop_workers is None else crop_workers
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.fetch_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
     @property
     def _record_blueprint(self):
         return dict(self.schema)
 
     def _get(self, *args, auth=True, **kwargs):
-        return self._request(requests.get, *args, auth=auth, **kwargs)
+        return self._request(self.session.get, *args, auth=auth, **kwargs)
 
     def _request(self, method, *args, auth=True, **kwargs):
         headers = {}
@@ -90,52 +159,28 @@ class ParashiftImporter:
         return response
 
     def crop_pdf(self, record):
-        pdf = PdfReader(record["document"])
-
-        try:
-            record["barcodes"].pop(0)
-        except IndexError:  # pragma: no cover
-            print(f"{record['external-id']}: no barcode in record")
-            pass
-
-        documents = []
-        for index, code in enumerate(record["barcodes"], start=1):
-            section = uri_constants.PARASHIFT_ATTACHMENT_SECTION_MAPPING.get(
-                code["type"]
+        documents = crop_pdf_file(
+            record["document"], record["barcodes"], record["external-id"]
+        )
+        return self._wrap_documents(documents)
+
+    def _wrap_documents(self, documents):
+        return [
+            {**document, "data": io.BytesIO(document["data"])} for document in documents
+        ]
+
+    def _import_record(self, record, documents):
+        record["documents"] = self._wrap_documents(documents)
+
+        with transaction.atomic():
+            instances = [i for i in import_dossiers([record]) if i is not None]
+            ImportedRecord.objects.create(
+                external_id=record["external-id"],
+                instance=instances[0] if instances else None,
             )
-            if not section:  # pragma: no cover
-                print(
-                    f"{record['external-id']}: unexpected barcode type {code['type']}, skipping"
-                )
-                continue
-
-            start = code["page"]
-            stop = None
-            for c in record["barcodes"]:
-                if c["page"] > start:
-                    stop = c["page"] - 1
-                    break
 
-            if stop is None:
-                stop = len(pdf.pages) - 1
-
-            output = PdfWriterWithStreamAttribute()
-
-            for page in range(start, stop + 1):
-                output.add_page(pdf.pages[page])
-
-            bytes_file = io.BytesIO()
-            output.write(bytes_file)
-            documents.append(
-                {
-                    "section": uri_constants.PARASHIFT_ATTACHMENT_SECTION_MAPPING[
-                        code["type"]
-                    ],
-                    "name": f"{index}.pdf",
-                    "data": bytes_file,
-                }
-            )
-        return documents
+        record["document"].close()
+        return instances
 
     def run(self, from_id, to_id):
         total_records = self._get(
@@ -144,23 +189,51 @@ class ParashiftImporter:
 
         total_pages = math.ceil(total_records / 100)
 
-        dossiers = []
-        for page_number in range(1, (total_pages + 1)):
+        crop_pool = (
+            ProcessPoolExecutor(self.crop_workers)
+            if self.crop_workers
+            else nullcontext()
+        )
 
-            result = self._get(
-                self.LIST_URI_FORMAT.format(
-                    to_id=to_id, from_id=from_id, page_number=page_number
+        dossiers = []
+        with ThreadPoolExecutor(self.fetch_workers) as fetch_pool, crop_pool:
+            crop = crop_pool.map if self.crop_workers else map
+
+            for page_number in range(1, (total_pages + 1)):
+
+                result = self._get(
+                    self.LIST_URI_FORMAT.format(
+                        to_id=to_id, from_id=from_id, page_number=page_number
+                    )
+                ).json()
+
+                ids = [str(rec["id"]) for rec in result["data"]]
+                imported = set(
+                    ImportedRecord.objects.filter(external_id__in=ids).values_list(
+                        "external_id", flat=True
+                    )
                 )
-            ).json()
+                if imported:
+                    print(f"skipping {len(imported)} already imported records")
 
-            records = [self.fetch_data(rec["id"]) for rec in result["data"]]
-            records = [r for r in records if r is not None]
+                records = fetch_pool.map(
+                    self.fetch_data, [i for i in ids if i not in imported]
+                )
+                records = [r for r in records if r is not None]
 
-            print(f"found {len(records)} dossiers, start cropping...")
-            for record in records:
-                record["documents"] = self.crop_pdf(record)
+                print(f"found {len(records)} dossiers, start cropping...")
+                cropped = crop(
+                    crop_pdf_file,
+                    [
+                        r["document"].name if self.crop_workers else r["document"]
+                        for r in records
+                    ],
+                    [r["barcodes"] for r in records],
+                    [r["external-id"] for r in records],
+                )
 
-            dossiers += import_dossiers(records)
+                for record, documents in zip(records, cropped):
+                    dossiers += self._import_record(record, documents)
 
         return dossiers
 
@@ -186,8 +259,12 @@ class ParashiftImporter:
         except (KeyError, IndexError):
             raise ParashiftDataError("Couldn't fetch original PDF.")
 
-        file_resp = self._get(url, auth=False)
-        file = io.BytesIO(file_resp.content)
+        # spool the PDF to disk instead of keeping it in memory
+        file = tempfile.NamedTemporaryFile(suffix=".pdf")
+        with self._get(url, auth=False, stream=True) as file_resp:
+            for chunk in file_resp.iter_content(chunk_size=64 * 2**10):
+                file.write(chunk)
+        file.seek(0)
 
         return file
 
@@ -1,11 +1,13 @@
 import io
 from pathlib import Path
 
+import pytest
 from django.conf import settings
 from django.core.management import call_command
 from PyPDF2 import PdfReader
 
 from camac.instance.master_data import MasterData
+from camac.parashift.models import ImportedRecord
 from camac.parashift.parashift import ParashiftImporter
 from camac.utils import build_url
 
@@ -37,7 +39,7 @@ def test_import(
 
     client = ParashiftImporter()
     record = client.fetch_data("138866")
-    record["document"] = record["document"].getvalue()
+    record["document"] = record["document"].read()
 
     assert record == expected
 
@@ -76,12 +78,17 @@ def test_import_validation_error(requests_mock, capsys):
     assert capsys.readouterr().out == "138866: parzelle-nr: Must be an integer!\n"
 
 
+@pytest.mark.parametrize("crop_workers", [0, 2])
 def test_command(
-    parashift_data, parashift_mock, application_settings, master_data_is_visible_mock
+    parashift_data,
+    parashift_mock,
+    application_settings,
+    master_data_is_visible_mock,
+    crop_workers,
 ):
     application_settings["MASTER_DATA"] = settings.APPLICATIONS["kt_uri"]["MASTER_DATA"]
 
-    client = ParashiftImporter()
+    client = ParashiftImporter(crop_workers=crop_workers)
     instances = client.run("138866", "138867")
     instance = instances[0]
     master_data = MasterData(instance.case)
@@ -105,8 +112,28 @@ def test_command(
     attachment = instance.attachments.first()
     assert attachment.path.size == 91785
 
+    assert ImportedRecord.objects.get(external_id="138866").instance == instance
+
+
+def test_command_resume(
+    parashift_data,
+    parashift_mock,
+    application_settings,
+    master_data_is_visible_mock,
+    requests_mock,
+):
+    application_settings["MASTER_DATA"] = settings.APPLICATIONS["kt_uri"]["MASTER_DATA"]
+
+    assert len(ParashiftImporter().run("138866", "138867")) == 1
+    fetched = requests_mock.call_count
+
+    # already imported records are neither fetched nor imported again
+    assert ParashiftImporter().run("138866", "138867") == []
+    assert requests_mock.call_count == fetched + 2
+    assert ImportedRecord.objects.count() == 1
+
 
-def test_command_validation_error(requests_mock, capsys):
+def test_command_validation_error(db, requests_mock, capsys):
     data = {
         "data": {
             "id": "138866",
@@ -165,7 +192,7 @@ def test_command_validation_error(requests_mock, capsys):
     assert out.rsplit("\n")[0] == "138866: parzelle-nr: Must be an integer!"
 
 
-def test_command_data_error(parashift_mock, requests_mock):
+def test_command_data_error(db, parashift_mock, requests_mock):
     broken_data = {
         "data": [
             {
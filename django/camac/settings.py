@@ -46,6 +46,12 @@ SECRET_KEY = env.str("DJANGO_SECRET_KEY", default=default("uuuuuuuuuu"))
 DEBUG = env.bool("DJANGO_DEBUG", default=default(True, False))
 ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=default(["*"]))
 API_HOST = env.str("DJANGO_API_HOST", default="http://localhost:80")
+# in seconds, 0 disables caching of the instance permissions used by caluma.
+# The cache isn't invalidated when the permissions change without a change of
+# the instance state (e.g. by an inquiry), so they may be stale that long.
+CALUMA_PERMISSIONS_CACHE_TIMEOUT = env.int(
+    "DJANGO_CALUMA_PERMISSIONS_CACHE_TIMEOUT", default=0
+)
 ENABLE_SILK = env.bool("DJANGO_ENABLE_SILK", default=False)
 
 DEMO_MODE = env.bool("DEMO_MODE", default=False)
@@ -158,6 +164,8 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "camac.wsgi.application"
+# load the views in the uwsgi master, so restarted workers don't import them
+WSGI_PRELOAD = env.bool("DJANGO_WSGI_PRELOAD", default=True)
 
 COMMON_FORM_SLUGS_BE = [
     "personalien",
@@ -2795,6 +2803,9 @@ DEFAULT_FILE_STORAGE = env.str(
     "DJANGO_DEFAULT_FILE_STORAGE", default="django.core.files.storage.FileSystemStorage"
 )
 FILE_UPLOAD_PERMISSIONS = env.int("FILE_UPLOAD_PERMISSIONS", default=0o644)
+# Use `camac.document.storage.ContentAddressedStorage` to store identical
+# attachments only once
+ATTACHMENT_STORAGE = env.str("DJANGO_ATTACHMENT_STORAGE", default=DEFAULT_FILE_STORAGE)
 
 THUMBNAIL_ENGINE = "sorl.thumbnail.engines.convert_engine.Engine"
 THUMBNAIL_FLATTEN = True
@@ -2993,6 +3004,14 @@ EMAIL_HOST_USER = env.str("DJANGO_EMAIL_HOST_USER", "")
 EMAIL_HOST_PASSWORD = env.str("DJANGO_EMAIL_HOST_PASSWORD", "")
 EMAIL_USE_TLS = env.str("DJANGO_EMAIL_USE_TLS", False)
 
+# Queue notification emails in the outbox table and deliver them with a
+# django-q worker instead of sending them within the request
+EMAIL_OUTBOX = env.bool("DJANGO_EMAIL_OUTBOX", default=False)
+EMAIL_OUTBOX_BATCH_SIZE = env.int("DJANGO_EMAIL_OUTBOX_BATCH_SIZE", default=100)
+EMAIL_OUTBOX_MAX_ATTEMPTS = env.int("DJANGO_EMAIL_OUTBOX_MAX_ATTEMPTS", default=8)
+# in seconds, doubled after every failed attempt
+EMAIL_OUTBOX_RETRY_DELAY = env.int("DJANGO_EMAIL_OUTBOX_RETRY_DELAY", default=60)
+
 EMAIL_PREFIX_SUBJECT = env.str("EMAIL_PREFIX_SUBJECT", default("[eBau Test]: ", ""))
 EMAIL_PREFIX_BODY = env.str(
     "EMAIL_PREFIX_BODY",
@@ -3058,6 +3077,11 @@ GIS_SKIP_BOOLEAN_LAYERS = env.list("GIS_SKIP_BOOLEAN_LAYERS", default=[])
 
 GIS_SKIP_SPECIAL_LAYERS = env.list("GIS_SKIP_SPECIAL_LAYERS", default=[])
 
+# in seconds
+GIS_CACHE_TIMEOUT = env.int("GIS_CACHE_TIMEOUT", default=60 * 60)
+# query every layer in a separate request, concurrently
+GIS_CONCURRENT_LAYER_QUERIES = env.bool("GIS_CONCURRENT_LAYER_QUERIES", default=False)
+
 DOCUMENT_MERGE_SERVICE_URL = build_url(
     env.str("DOCUMENT_MERGE_SERVICE_URL", "http://document-merge-service:8000/api/v1/")
 )
@@ -3164,6 +3188,10 @@ PARASHIFT_SOURCE_FILES_URI = env.str(
 
 PARASHIFT_TENANT_ID = env.int("PARASHIFT_TENANT_ID", default=1665)
 PARASHIFT_API_KEY = env.str("PARASHIFT_API_KEY", default="ey...")
+# number of records fetched concurrently
+PARASHIFT_FETCH_WORKERS = env.int("PARASHIFT_FETCH_WORKERS", default=8)
+# number of processes for cropping the PDFs; 0 crops in the importing process
+PARASHIFT_CROP_WORKERS = env.int("PARASHIFT_CROP_WORKERS", default=0)
 
 Q_CLUSTER = {
     "name": "DjangORM",
@@ -3175,6 +3203,25 @@ Q_CLUSTER = {
     "orm": "default",
 }
 
+# data migration commands (see camac.core.chunked_migration)
+MIGRATION_CHUNK_SIZE = env.int("DJANGO_MIGRATION_CHUNK_SIZE", default=500)
+MIGRATION_WORKERS = env.int("DJANGO_MIGRATION_WORKERS", default=1)
+
+# answer the statistics from the materialized summaries (see camac.stats.summaries)
+STATS_SUMMARIES = env.bool("DJANGO_STATS_SUMMARIES", default=False)
+
+# number of dossiers imported before the progress is saved
+DOSSIER_IMPORT_BATCH_SIZE = env.int("DJANGO_DOSSIER_IMPORT_BATCH_SIZE", default=20)
+DOSSIER_IMPORT_CHUNK_SIZE = env.int("DJANGO_DOSSIER_IMPORT_CHUNK_SIZE", default=200)
+# seconds after which a running chunk is considered dead, e.g. killed by the
+# task timeout or a restart of the cluster
+DOSSIER_IMPORT_CHUNK_TIMEOUT = env.int(
+    "DJANGO_DOSSIER_IMPORT_CHUNK_TIMEOUT", default=Q_CLUSTER["timeout"]
+)
+DOSSIER_IMPORT_VALIDATE_ASYNC = env.bool(
+    "DJANGO_DOSSIER_IMPORT_VALIDATE_ASYNC", default=False
+)
+
 DOSSIER_IMPORT_CLIENT_ID = env.str(
     "DJANGO_DOSSIER_IMPORT_CLIENT_ID", default="dossier-import"
 )
@@ -1,22 +1,29 @@
 import datetime
-from typing import Dict, List, Tuple
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
 
 from caluma.caluma_form.models import Answer, Document
 from caluma.caluma_workflow.models import WorkItem
-from django.db.models import Avg, Count, IntegerField, OuterRef, QuerySet, Subquery
-from django.db.models.fields.json import KeyTextTransform
+from django.db.models import Avg, Count, IntegerField, QuerySet
 from django.db.models.functions import Cast
 
 from camac.instance.master_data import MasterData
 from camac.instance.models import Instance
 
+from .models import InstanceCycleTime
+
 
 def _get_previously_rejected_instance(instance: Instance):
-    return Instance.objects.filter(
-        case__document__source=instance.case.document,
-        instance_state__name="finished",
-        previous_instance_state__name="rejected",
-    ).first()
+    # the document is loaded along, as it's the source of the next lookup
+    return (
+        Instance.objects.filter(
+            case__document__source=instance.case.document,
+            instance_state__name="finished",
+            previous_instance_state__name="rejected",
+        )
+        .select_related("case__document")
+        .first()
+    )
 
 
 def _get_rejected_instance_cycletime(rejected_instance: Instance) -> int:
@@ -61,31 +68,20 @@ def _compute_total_idle_days(
     Returns the total idle time in days as an integer
     """
 
-    merged_ranges = []
-    elim = []
-    for i in range(len(sorted_durations)):
-        if i in elim:
+    total = 0
+    current_start, current_end = None, None
+    for start, end in sorted_durations:
+        if current_end is not None and start < current_end:
+            current_end = max(current_end, end)
             continue
-        start, end = sorted_durations[i]
-        while True:
-            try:
-                next_start, next_end = sorted_durations[i + 1]
-            except IndexError:
-                break
-            if next_start < end:
-                if next_end < end:
-                    elim.append(i + 1)
-                    i += 1
-                else:
-                    end = next_end
-                    i += 1
-                    elim.append(i)
-            else:
-                # apparently this is not explicitly covered anymore but it still
-                # breaks the loop as expected, is this a change in python 3.8?
-                break  # pragma: no cover
-        merged_ranges.append((start, end))
-    return sum(map(lambda duration: (duration[1] - duration[0]).days, merged_ranges))
+
+        if current_end is not None:
+            total += (current_end - current_start).days
+        current_start, current_end = start, end
+
+    if current_end is not None:
+        total += (current_end - current_start).days
+    return total
 
 
 def _retrieve_waiting_periods(
@@ -114,21 +110,22 @@ def _retrieve_waiting_periods(
     except Answer.DoesNotExist:
         decision_date = None
 
+    dates = defaultdict(dict)
+    for document_id, question_id, date in Answer.objects.filter(
+        document__in=rows,
+        question_id__in=["nfd-tabelle-datum-anfrage", "nfd-tabelle-datum-antwort"],
+    ).values_list("document_id", "question_id", "date"):
+        dates[document_id][question_id] = date
+
     results = []
-    for row in rows.iterator():
-        request_answer = row.answers.filter(
-            question_id="nfd-tabelle-datum-anfrage"
-        ).first()
-        response_answer = row.answers.filter(
-            question_id="nfd-tabelle-datum-antwort"
-        ).first()
-        if (request_answer and request_answer.date) is None or (
-            response_answer and response_answer.date
-        ) is None:
+    for row in dates.values():
+        request_date = row.get("nfd-tabelle-datum-anfrage")
+        response_date = row.get("nfd-tabelle-datum-antwort")
+        if request_date is None or response_date is None:
             continue
-        if response_answer.date > decision_date:
+        if decision_date and response_date > decision_date:
             continue
-        results.append((request_answer.date, response_answer.date))
+        results.append((request_date, response_date))
     return sorted(results, key=lambda pair: pair[0])
 
 
@@ -150,8 +147,7 @@ def _rejected_instances(instance) -> List[Instance]:
     return flat_list
 
 
-def compute_cycle_time(instance: Instance) -> Dict:
-    master_data = MasterData(instance.case)
+def _compute_cycle_time(instance: Instance, master_data: MasterData) -> Dict:
     cycle_start = master_data.paper_submit_date or master_data.submit_date
     decision_date = master_data.decision_date
 
@@ -173,41 +169,71 @@ def compute_cycle_time(instance: Instance) -> Dict:
     }
 
 
-def aggregate_cycle_times(instances: QuerySet) -> Dict:
+def compute_cycle_time(instance: Instance) -> Dict:
+    return _compute_cycle_time(instance, MasterData(instance.case))
+
+
+def _get_procedure(instance: Instance) -> Optional[str]:
+    if instance.case.workflow_id == "preliminary-clarification":
+        return "preliminary-clarification"
+
+    return (
+        Answer.objects.filter(
+            question_id="decision-approval-type",
+            document__work_item__case__instance=instance,
+        )
+        .values_list("value", flat=True)
+        .first()
+    )
+
+
+def update_cycle_time(instance: Instance) -> Dict:
+    """Compute the cycle time of an instance and store it.
+
+    The cycle time is written to the case meta and to `InstanceCycleTime`,
+    which is used by the statistics. Instances without a valid decision are
+    removed from the statistics.
+    """
+    master_data = MasterData(instance.case)
+    cycle_time = _compute_cycle_time(instance, master_data)
+
+    instance.case.meta.update(cycle_time)
+    instance.case.save()
+
+    if not cycle_time:
+        InstanceCycleTime.objects.filter(instance=instance).delete()
+        return cycle_time
+
+    InstanceCycleTime.objects.update_or_create(
+        instance=instance,
+        defaults={
+            "service": instance.responsible_service(),
+            "procedure": _get_procedure(instance),
+            "decision_date": master_data.decision_date,
+            "year": master_data.decision_date.year,
+            "total_cycle_time": cycle_time["total-cycle-time"],
+            "net_cycle_time": cycle_time["net-cycle-time"],
+        },
+    )
+
+    return cycle_time
+
+
+def aggregate_cycle_times(instances: QuerySet) -> QuerySet:
     # Categorize by year and aggregate (AVG) instances's cycle times.
     return (
-        instances.annotate(
-            year=Subquery(
-                Answer.objects.filter(
-                    question_id="decision-date",
-                    document__work_item__case__instance=OuterRef("pk"),
-                )
-                .exclude(
-                    document__work_item__status=WorkItem.STATUS_CANCELED,
-                )
-                .values("date__year")[:1]
-            )
+        InstanceCycleTime.objects.filter(
+            instance__in=instances,
+            decision_date__gte=datetime.date(1970, 1, 1),
+            decision_date__lte=datetime.date.today(),
         )
         .values("year")
         .annotate(
             avg_total_cycle_time=Cast(
-                Avg(
-                    Cast(
-                        KeyTextTransform("total-cycle-time", "case__meta"),
-                        output_field=IntegerField(),
-                    )
-                ),
-                output_field=IntegerField(),
-            ),
-            avg_net_cycle_time=Cast(
-                Avg(
-                    Cast(
-                        KeyTextTransform("net-cycle-time", "case__meta"),
-                        output_field=IntegerField(),
-                    )
-                ),
-                output_field=IntegerField(),
+                Avg("total_cycle_time"), output_field=IntegerField()
             ),
+            avg_net_cycle_time=Cast(Avg("net_cycle_time"), output_field=IntegerField()),
             count=Count("pk"),
         )
+        .order_by("year")
     )
@@ -0,0 +1,20 @@
+from factory import Faker, LazyAttribute, SubFactory
+from factory.django import DjangoModelFactory
+
+from camac.instance.factories import InstanceFactory
+from camac.user.factories import ServiceFactory
+
+from . import models
+
+
+class InstanceCycleTimeFactory(DjangoModelFactory):
+    instance = SubFactory(InstanceFactory)
+    service = SubFactory(ServiceFactory)
+    procedure = "decision-approval-type-building-permit"
+    decision_date = Faker("past_date")
+    year = LazyAttribute(lambda cycle_time: cycle_time.decision_date.year)
+    total_cycle_time = Faker("pyint", max_value=365)
+    net_cycle_time = LazyAttribute(lambda cycle_time: cycle_time.total_cycle_time)
+
+    class Meta:
+        model = models.InstanceCycleTime
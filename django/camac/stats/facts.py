@@ -0,0 +1,281 @@
+"""Denormalized dossier facts for analytics.
+
+Every instance is exported as one row with its state, form, responsible
+services, dates, cycle time, inquiry counts and a configurable set of master
+data keys. The rows are built in chunks and written as one row group (or
+record batch) per chunk, so the export runs in constant memory and analyses
+don't need to query the production database.
+
+The instances, their services, cycle times and inquiry counts are loaded
+with a fixed number of queries per chunk, and the answers and work items
+are prefetched for the master data. Master data resolvers which look up
+other data (e.g. of related cases or services) still query per instance.
+"""
+import json
+from datetime import date, datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from caluma.caluma_form.models import Answer
+from caluma.caluma_workflow.models import WorkItem
+from dateutil.parser import ParserError, parse as dateutil_parse
+from django.conf import settings
+from django.db.models import Count, Exists, OuterRef, Q
+
+from camac.instance.master_data import MasterData
+from camac.instance.models import Instance
+
+FORMATS = ["parquet", "arrow"]
+
+# exported unless other keys are requested, as far as they are configured
+DEFAULT_MASTER_DATA_KEYS = [
+    "dossier_number",
+    "application_type",
+    "proposal",
+    "construction_costs",
+    "publication_date",
+]
+
+FIELDS = [
+    pa.field("instance_id", pa.int64(), nullable=False),
+    pa.field("instance_state", pa.string()),
+    pa.field("form", pa.string()),
+    pa.field("municipality_id", pa.int64()),
+    pa.field("municipality", pa.string()),
+    pa.field("responsible_service_id", pa.int64()),
+    pa.field("responsible_service", pa.string()),
+    pa.field("creation_date", pa.timestamp("us", tz="UTC")),
+    pa.field("modification_date", pa.timestamp("us", tz="UTC")),
+    pa.field("submit_date", pa.date32()),
+    pa.field("decision_date", pa.date32()),
+    pa.field("procedure", pa.string()),
+    pa.field("total_cycle_time", pa.int32()),
+    pa.field("net_cycle_time", pa.int32()),
+    pa.field("inquiries", pa.int32()),
+    pa.field("completed_inquiries", pa.int32()),
+]
+
+
+def get_master_data_keys(keys=None):
+    """Return the configured master data keys to export.
+
+    Keys which are exported as fixed columns anyway are skipped.
+    """
+    configured = settings.APPLICATION.get("MASTER_DATA", {})
+    fixed = {field.name for field in FIELDS}
+
+    return [
+        key
+        for key in (DEFAULT_MASTER_DATA_KEYS if keys is None else keys)
+        if key in configured and key not in fixed
+    ]
+
+
+def get_schema(master_data_keys):
+    # master data values differ in type between the applications
+    return pa.schema(FIELDS + [pa.field(key, pa.string()) for key in master_data_keys])
+
+
+def changed_since(since):
+    """Filter instances which have been changed since the given time.
+
+    Besides the instance itself, changes of the case, its answers (including
+    table rows), its work items (including child cases) and the stored cycle
+    time are considered. Deleted instances aren't detected.
+    """
+    return (
+        Q(modification_date__gte=since)
+        | Q(case__modified_at__gte=since)
+        | Q(cycle_time__updated_at__gte=since)
+        | Q(
+            Exists(
+                Answer.objects.filter(
+                    document__family_id=OuterRef("case__document_id"),
+                    modified_at__gte=since,
+                )
+            )
+        )
+        | Q(
+            Exists(
+                WorkItem.objects.filter(
+                    case__family_id=OuterRef("case_id"), modified_at__gte=since
+                )
+            )
+        )
+    )
+
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return dateutil_parse(value).date()
+        except ParserError:
+            return None
+    return None
+
+
+def _to_string(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+class FactsBuilder:
+    """Build the rows of the dossier facts in chunks."""
+
+    def __init__(self, master_data_keys):
+        self.master_data_keys = master_data_keys
+        self.schema = get_schema(master_data_keys)
+        # names of the services, which are the same across many chunks
+        self._service_names = {}
+
+    def _service_name(self, service):
+        if service is None:
+            return None
+        if service.pk not in self._service_names:
+            self._service_names[service.pk] = service.get_name()
+        return self._service_names[service.pk]
+
+    def _municipalities(self, instances):
+        active_services = settings.APPLICATION.get("ACTIVE_SERVICES", {})
+        filter_type = "municipality" if "MUNICIPALITY" in active_services else None
+
+        return Instance.responsible_services_for(instances, filter_type=filter_type)
+
+    def _inquiry_counts(self, instances):
+        if not settings.DISTRIBUTION:  # pragma: no cover
+            return {}
+
+        return {
+            row["case__family__instance"]: row
+            for row in WorkItem.objects.filter(
+                task_id=settings.DISTRIBUTION["INQUIRY_TASK"],
+                case__family__instance__in=instances,
+            )
+            .exclude(status=WorkItem.STATUS_CANCELED)
+            .values("case__family__instance")
+            .annotate(
+                total=Count("pk"),
+                completed=Count("pk", filter=Q(status=WorkItem.STATUS_COMPLETED)),
+            )
+        }
+
+    def _master_data(self, master_data, key):
+        try:
+            return getattr(master_data, key)
+        except (AttributeError, LookupError, TypeError, ValueError):
+            # broken data of a single instance mustn't abort the export
+            return None
+
+    def get_instances(self, pks):
+        return list(
+            Instance.objects.filter(pk__in=pks)
+            .select_related(
+                "instance_state",
+                "previous_instance_state",
+                "form",
+                "case__document",
+                "cycle_time",
+            )
+            .prefetch_related(
+                "case__document__answers",
+                "case__work_items__document__answers",
+            )
+            .order_by("pk")
+        )
+
+    def build_rows(self, instances):
+        municipalities = self._municipalities(instances)
+        responsible_services = Instance.responsible_services_for(instances)
+        inquiries = self._inquiry_counts(instances)
+
+        for instance in instances:
+            case = instance.case
+            cycle_time = getattr(instance, "cycle_time", None)
+            inquiry_counts = inquiries.get(instance.pk, {})
+            municipality = municipalities.get(instance.pk)
+            responsible_service = responsible_services.get(instance.pk)
+
+            row = {
+                "instance_id": instance.pk,
+                "instance_state": instance.instance_state.name,
+                "form": case.document.form_id if case else instance.form.name,
+                "municipality_id": municipality and municipality.pk,
+                "municipality": self._service_name(municipality),
+                "responsible_service_id": responsible_service
+                and responsible_service.pk,
+                "responsible_service": self._service_name(responsible_service),
+                "creation_date": instance.creation_date,
+                "modification_date": instance.modification_date,
+                "submit_date": None,
+                "decision_date": cycle_time and cycle_time.decision_date,
+                "procedure": cycle_time and cycle_time.procedure,
+                "total_cycle_time": cycle_time and cycle_time.total_cycle_time,
+                "net_cycle_time": cycle_time and cycle_time.net_cycle_time,
+                "inquiries": inquiry_counts.get("total", 0),
+                "completed_inquiries": inquiry_counts.get("completed", 0),
+            }
+
+            if case:
+                master_data = MasterData(case)
+                row["submit_date"] = _to_date(
+                    self._master_data(master_data, "submit_date")
+                )
+                if not row["decision_date"]:
+                    row["decision_date"] = _to_date(
+                        self._master_data(master_data, "decision_date")
+                    )
+                for key in self.master_data_keys:
+                    row[key] = _to_string(self._master_data(master_data, key))
+            else:
+                row.update({key: None for key in self.master_data_keys})
+
+            yield row
+
+    def iter_tables(self, queryset, chunk_size):
+        """Yield one table per chunk of the given instances."""
+        pks = list(queryset.order_by("pk").values_list("pk", flat=True).distinct())
+
+        for start in range(0, len(pks), chunk_size):
+            instances = self.get_instances(pks[start : start + chunk_size])
+            yield pa.Table.from_pylist(
+                list(self.build_rows(instances)), schema=self.schema
+            )
+
+
+def write_facts(path, tables, schema, file_format="parquet"):
+    """Write the tables to a single Parquet or Arrow IPC file.
+
+    The file is written under a temporary name and renamed at the end, so
+    readers never see a partial export.
+
+    :return: number of written rows
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    rows = 0
+
+    if file_format == "parquet":
+        writer = pq.ParquetWriter(str(tmp_path), schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(str(tmp_path), schema)
+
+    try:
+        with writer:
+            for table in tables:
+                writer.write_table(table)
+                rows += table.num_rows
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    tmp_path.rename(path)
+
+    return rows
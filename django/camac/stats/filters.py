@@ -1,5 +1,4 @@
-from caluma.caluma_form.models import Answer
-from django.db.models import Exists, OuterRef, Q
+from django.db.models import Q
 from django_filters.rest_framework import BaseCSVFilter, CharFilter, FilterSet
 from rest_framework.exceptions import ValidationError
 
@@ -55,18 +54,7 @@ class InstanceCycleTimeFilterSet(FilterSet):
     procedure = CharFilter(method="filter_procedure_types")
 
     def filter_procedure_types(self, queryset, name, value):
-        if value == "preliminary-clarification":
-            return queryset.filter(case__workflow_id="preliminary-clarification")
-
-        return queryset.filter(
-            Exists(
-                Answer.objects.filter(
-                    question_id="decision-approval-type",
-                    value=value,
-                    document__work_item__case__instance=OuterRef("pk"),
-                )
-            )
-        )
+        return queryset.filter(cycle_time__procedure=value)
 
     class Meta:
         fields = ("procedure",)
@@ -0,0 +1,109 @@
+import json
+from argparse import ArgumentTypeError
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from camac.instance.models import Instance
+from camac.stats.facts import (
+    FORMATS,
+    FactsBuilder,
+    changed_since,
+    get_master_data_keys,
+    write_facts,
+)
+
+# written to the output directory after every successful export
+STATE_FILE = "dossier-facts.json"
+
+
+def _datetime(value):
+    parsed = parse_datetime(value)
+    if not parsed:
+        raise ArgumentTypeError(f"Invalid datetime: {value}")
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+
+class Command(BaseCommand):
+    help = "Export the dossier facts to a Parquet or Arrow file for analytics"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Directory to write the export to")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            default="parquet",
+            help="File format of the export",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of instances per row group",
+        )
+        parser.add_argument(
+            "--incremental",
+            default=False,
+            action="store_true",
+            help="Only export instances changed since the last export to the directory",
+        )
+        parser.add_argument(
+            "--since",
+            type=_datetime,
+            help="Only export instances changed since the given time",
+        )
+        parser.add_argument(
+            "--master-data",
+            nargs="+",
+            help="Master data keys to export, as far as they are configured",
+        )
+
+    def get_since(self, state_path, options):
+        if options["since"] or not options["incremental"]:
+            return options["since"]
+
+        if not state_path.exists():
+            self.stdout.write("No previous export found, exporting all instances")
+            return None
+
+        try:
+            return parse_datetime(json.loads(state_path.read_text())["exported_at"])
+        except (KeyError, TypeError, ValueError):
+            raise CommandError(f"Invalid state of the previous export: {state_path}")
+
+    def handle(self, *args, **options):
+        output = Path(options["output"])
+        output.mkdir(parents=True, exist_ok=True)
+        state_path = output / STATE_FILE
+
+        # taken before querying, so changes during the export are exported
+        # again by the next incremental run
+        exported_at = timezone.now()
+        since = self.get_since(state_path, options)
+
+        queryset = Instance.objects.all()
+        if since:
+            queryset = queryset.filter(changed_since(since))
+
+        builder = FactsBuilder(get_master_data_keys(options["master_data"]))
+        path = output / f"dossier-facts-{exported_at:%Y%m%dT%H%M%S}.{options['format']}"
+        rows = write_facts(
+            path,
+            builder.iter_tables(queryset, options["chunk_size"]),
+            builder.schema,
+            options["format"],
+        )
+
+        state_path.write_text(
+            json.dumps(
+                {
+                    "exported_at": exported_at.isoformat(),
+                    "since": since and since.isoformat(),
+                    "file": path.name,
+                    "rows": rows,
+                }
+            )
+        )
+        self.stdout.write(f"Exported {rows} instances to {path}")
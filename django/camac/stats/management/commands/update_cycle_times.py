@@ -0,0 +1,29 @@
+from caluma.caluma_workflow.models import WorkItem
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+
+from camac.core.chunked_migration import ChunkedMigrationCommand
+from camac.instance.models import Instance
+from camac.stats.cycle_time import update_cycle_time
+
+
+class Command(ChunkedMigrationCommand):
+    help = (
+        "Compute and store the cycle times of all decided instances, run after "
+        "deploying changes of the cycle time computation"
+    )
+
+    def get_queryset(self, options):
+        return Instance.objects.filter(
+            Exists(
+                WorkItem.objects.filter(
+                    case__instance=OuterRef("pk"),
+                    task_id=settings.APPLICATION.get("CALUMA", {}).get("DECISION_TASK"),
+                    status=WorkItem.STATUS_COMPLETED,
+                )
+            )
+        ).select_related("case", "instance_state", "previous_instance_state")
+
+    def migrate_chunk(self, instances):
+        for instance in instances:
+            update_cycle_time(instance)
@@ -0,0 +1,67 @@
+# Generated by Django 3.2.14 on 2022-08-25 08:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("instance", "0038_form_field_sort_index"),
+        ("user", "0016_set_superuser_and_is_staff"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InstanceCycleTime",
+            fields=[
+                (
+                    "instance",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="cycle_time",
+                        serialize=False,
+                        to="instance.instance",
+                    ),
+                ),
+                (
+                    "procedure",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                ("decision_date", models.DateField()),
+                ("year", models.PositiveSmallIntegerField()),
+                ("total_cycle_time", models.IntegerField()),
+                ("net_cycle_time", models.IntegerField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "service",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="user.service",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="instancecycletime",
+            index=models.Index(fields=["year"], name="stats_cycle_time_year_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="instancecycletime",
+            index=models.Index(
+                fields=["service", "year"], name="stats_cycle_time_service_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="instancecycletime",
+            index=models.Index(
+                fields=["procedure", "year"], name="stats_cycle_time_procedure_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,113 @@
+# Generated by Django 3.2.14 on 2022-08-26 07:48
+
+from django.conf import settings
+from django.db import migrations
+
+# Submit date as used by the period filters of the summary views: the paper
+# submit date takes precedence over the submit date if present.
+SUBMIT_DATE = """
+COALESCE(NULLIF(c.meta -> 'paper-submit-date', 'null'::jsonb), c.meta -> 'submit-date')
+"""
+
+INSTANCE_SUMMARY = f"""
+CREATE MATERIALIZED VIEW stats_instance_summary AS
+SELECT {SUBMIT_DATE} AS submit_date, s."NAME" AS instance_state, count(*) AS count
+FROM "INSTANCE" i
+JOIN "INSTANCE_STATE" s ON s."INSTANCE_STATE_ID" = i."INSTANCE_STATE_ID"
+LEFT JOIN caluma_workflow_case c ON c.id = i.case_id
+GROUP BY 1, 2
+WITH NO DATA;
+
+CREATE UNIQUE INDEX stats_instance_summary_key
+ON stats_instance_summary (submit_date, instance_state);
+"""
+
+CLAIM_SUMMARY = f"""
+CREATE MATERIALIZED VIEW stats_claim_summary AS
+SELECT service.value AS service, {SUBMIT_DATE} AS submit_date, count(*) AS count
+FROM caluma_form_document d
+LEFT JOIN caluma_form_answer service
+    ON service.document_id = d.id AND service.question_id = 'nfd-tabelle-behoerde'
+LEFT JOIN caluma_workflow_workitem w ON w.document_id = d.family_id
+LEFT JOIN caluma_workflow_case c ON c.id = w.case_id
+WHERE d.form_id = 'nfd-tabelle' AND NOT EXISTS (
+    SELECT 1 FROM caluma_form_answer status
+    WHERE status.document_id = d.id
+    AND status.question_id = 'nfd-tabelle-status'
+    AND status.value = '"nfd-tabelle-status-entwurf"'::jsonb
+)
+GROUP BY 1, 2
+WITH NO DATA;
+
+CREATE UNIQUE INDEX stats_claim_summary_key
+ON stats_claim_summary (service, submit_date);
+"""
+
+# Completed work items per task and addressed service. The rows with an
+# empty service contain the totals of a task, as work items may be
+# addressed to multiple services.
+INQUIRY_SUMMARY = f"""
+CREATE MATERIALIZED VIEW stats_inquiry_summary AS
+WITH work_items AS (
+    SELECT
+        task_id,
+        addressed_groups,
+        age(closed_at, created_at) AS duration,
+        CASE WHEN (deadline AT TIME ZONE '{settings.TIME_ZONE}')::date
+            > (closed_at AT TIME ZONE '{settings.TIME_ZONE}')::date
+            THEN 1 ELSE 0 END AS deadline_met
+    FROM caluma_workflow_workitem
+    WHERE status = 'completed'
+)
+SELECT task_id, service, count(*) AS count, sum(duration) AS duration,
+    sum(deadline_met) AS deadline_met
+FROM work_items, unnest(addressed_groups) AS service
+GROUP BY task_id, service
+UNION ALL
+SELECT task_id, '' AS service, count(*), sum(duration), sum(deadline_met)
+FROM work_items
+GROUP BY task_id
+WITH NO DATA;
+
+CREATE UNIQUE INDEX stats_inquiry_summary_key
+ON stats_inquiry_summary (task_id, service);
+"""
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.get_or_create(
+        name="refresh-stats-summaries",
+        defaults={
+            "func": "camac.stats.summaries.refresh_summaries",
+            "schedule_type": "I",
+            "minutes": 15,
+            "repeats": -1,
+        },
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(name="refresh-stats-summaries").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stats", "0001_initial"),
+        ("caluma_form", "0045_simple_history"),
+        ("caluma_workflow", "0031_simple_history"),
+        ("django_q", "0014_schedule_cluster"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            INSTANCE_SUMMARY, "DROP MATERIALIZED VIEW stats_instance_summary;"
+        ),
+        migrations.RunSQL(CLAIM_SUMMARY, "DROP MATERIALIZED VIEW stats_claim_summary;"),
+        migrations.RunSQL(
+            INQUIRY_SUMMARY, "DROP MATERIALIZED VIEW stats_inquiry_summary;"
+        ),
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
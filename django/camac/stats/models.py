@@ -0,0 +1,37 @@
+from django.db import models
+
+
+class InstanceCycleTime(models.Model):
+    """Cycle time of a decided instance.
+
+    Maintained by `camac.stats.cycle_time.update_cycle_time` when an
+    instance is decided or its claims are answered, so the statistics are
+    aggregated without evaluating the case meta.
+    """
+
+    instance = models.OneToOneField(
+        "instance.Instance",
+        models.CASCADE,
+        primary_key=True,
+        related_name="cycle_time",
+    )
+    service = models.ForeignKey(
+        "user.Service", models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    procedure = models.CharField(max_length=255, null=True, blank=True)
+    decision_date = models.DateField()
+    year = models.PositiveSmallIntegerField()
+    total_cycle_time = models.IntegerField()
+    net_cycle_time = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["year"], name="stats_cycle_time_year_idx"),
+            models.Index(
+                fields=["service", "year"], name="stats_cycle_time_service_idx"
+            ),
+            models.Index(
+                fields=["procedure", "year"], name="stats_cycle_time_procedure_idx"
+            ),
+        ]
@@ -0,0 +1,110 @@
+"""Materialized summaries of the statistics endpoints.
+
+The views are created by the migrations of this app and refreshed by a
+django-q schedule (see `refresh_summaries`). They are only used when
+`STATS_SUMMARIES` is enabled and they have been populated; otherwise the
+statistics are computed live.
+"""
+import json
+from logging import getLogger
+
+from django.conf import settings
+from django.db import connection
+
+logger = getLogger(__name__)
+
+SUMMARY_VIEWS = [
+    "stats_instance_summary",
+    "stats_claim_summary",
+    "stats_inquiry_summary",
+]
+
+
+def is_populated(view):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT ispopulated FROM pg_matviews WHERE matviewname = %s", [view]
+        )
+        row = cursor.fetchone()
+
+    return bool(row and row[0])
+
+
+def refresh_summaries():
+    """Refresh all summaries without blocking the readers."""
+    if not settings.STATS_SUMMARIES:
+        return
+
+    for view in SUMMARY_VIEWS:
+        # a view which has never been populated can't be refreshed concurrently
+        concurrently = "CONCURRENTLY" if is_populated(view) else ""
+        with connection.cursor() as cursor:
+            cursor.execute(f"REFRESH MATERIALIZED VIEW {concurrently} {view}")
+        logger.info(f"Refreshed {view}")
+
+
+def _period_conditions(period):
+    conditions = []
+    params = []
+    start, end = period or (None, None)
+
+    # same comparison of the json values as the period filter
+    if start:
+        conditions.append("submit_date >= to_jsonb(%s::text)")
+        params.append(start)
+    if end:
+        conditions.append("submit_date <= to_jsonb(%s::text)")
+        params.append(end)
+
+    return conditions, params
+
+
+def _fetch(sql, conditions, params):
+    if conditions:
+        sql = f"{sql} WHERE {' AND '.join(conditions)}"
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()
+
+
+def count_instances(period=None, hidden_states=None):
+    conditions, params = _period_conditions(period)
+    if hidden_states:
+        conditions.append("(instance_state <> ALL(%s) OR instance_state IS NULL)")
+        params.append(list(hidden_states))
+
+    return _fetch(
+        "SELECT COALESCE(SUM(count), 0)::bigint FROM stats_instance_summary",
+        conditions,
+        params,
+    )[0]
+
+
+def count_claims(period=None, service_id=None):
+    conditions, params = _period_conditions(period)
+    if service_id is not None:
+        conditions.append("service = %s::jsonb")
+        params.append(json.dumps(service_id))
+
+    return _fetch(
+        "SELECT COALESCE(SUM(count), 0)::bigint FROM stats_claim_summary",
+        conditions,
+        params,
+    )[0]
+
+
+def summarize_work_items(task_id, service_id=None):
+    """Return the average processing time and the deadline quota.
+
+    :return: average duration (timedelta) and percentage of work items
+             closed before the deadline, both None without work items
+    """
+    duration, deadline_quota = _fetch(
+        "SELECT SUM(duration) / SUM(count)::float8, "
+        "SUM(deadline_met) * 100.0 / SUM(count) FROM stats_inquiry_summary",
+        ["task_id = %s", "service = %s"],
+        [task_id, "" if service_id is None else str(service_id)],
+    )
+
+    return duration, deadline_quota and float(deadline_quota)
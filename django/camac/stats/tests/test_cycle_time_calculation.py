@@ -3,13 +3,19 @@ import datetime
 import pytest
 from caluma.caluma_core.events import send_event
 from caluma.caluma_workflow.events import post_complete_work_item
+from django.core.management import call_command
 
 from camac.constants.kt_bern import (
     DECISION_TYPE_BAUBEWILLIGUNGSFREI,
     DECISIONS_BEWILLIGT,
 )
 from camac.instance.serializers import SUBMIT_DATE_FORMAT
-from camac.stats.cycle_time import _compute_total_idle_days, compute_cycle_time
+from camac.stats.cycle_time import (
+    _compute_total_idle_days,
+    compute_cycle_time,
+    update_cycle_time,
+)
+from camac.stats.models import InstanceCycleTime
 
 
 @pytest.mark.parametrize("case_cycle_time", [45])
@@ -180,6 +186,9 @@ def test_decision_completion_computes_cycle_time(
     # after
     assert be_instance.case.meta.get("total-cycle-time") == case_cycle_time
     assert be_instance.case.meta.get("net-cycle-time") == case_cycle_time
+    assert be_instance.cycle_time.total_cycle_time == case_cycle_time
+    assert be_instance.cycle_time.net_cycle_time == case_cycle_time
+    assert be_instance.cycle_time.procedure == DECISION_TYPE_BAUBEWILLIGUNGSFREI
 
 
 @pytest.mark.parametrize("instance_state__name", ["finished"])
@@ -188,6 +197,58 @@ def test_handles_incomplete_case(db, be_instance):
     assert compute_cycle_time(be_instance) == {}
 
 
+@pytest.mark.parametrize("instance_state__name", ["finished"])
+def test_update_cycle_time_without_decision(
+    db, be_instance, instance_cycle_time_factory
+):
+    instance_cycle_time_factory(instance=be_instance)
+
+    assert update_cycle_time(be_instance) == {}
+    assert not InstanceCycleTime.objects.filter(instance=be_instance).exists()
+
+
+@pytest.mark.parametrize("has_cycle_time", [True, False])
+def test_nfd_completion_updates_cycle_time(
+    db,
+    be_instance,
+    caluma_admin_user,
+    work_item_factory,
+    instance_cycle_time_factory,
+    mocker,
+    has_cycle_time,
+):
+    if has_cycle_time:
+        instance_cycle_time_factory(instance=be_instance)
+    update = mocker.patch("camac.caluma.extensions.events.decision.update_cycle_time")
+
+    send_event(
+        post_complete_work_item,
+        sender="post_complete_work_item",
+        work_item=work_item_factory(case=be_instance.case, task_id="nfd"),
+        user=caluma_admin_user,
+        context={},
+    )
+
+    # only instances which are already decided are updated
+    assert update.called == has_cycle_time
+
+
+@pytest.mark.parametrize("instance_state__name", ["finished"])
+def test_update_cycle_times_command(
+    db, be_instance, instance_factory, decision_factory, application_settings, mocker
+):
+    application_settings["CALUMA"]["DECISION_TASK"] = "decision"
+    decision_factory()
+    instance_factory()
+    update = mocker.patch(
+        "camac.stats.management.commands.update_cycle_times.update_cycle_time"
+    )
+
+    call_command("update_cycle_times")
+
+    update.assert_called_once_with(be_instance)
+
+
 @pytest.mark.parametrize(
     "submit_date,decision_date,nfd_start,nfd_end,exp_total,exp_net",
     [
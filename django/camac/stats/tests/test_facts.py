@@ -0,0 +1,139 @@
+import datetime
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from camac.stats.facts import (
+    FORMATS,
+    FactsBuilder,
+    _to_date,
+    _to_string,
+    get_schema,
+    write_facts,
+)
+
+
+def test_export_dossier_facts(
+    db, tmp_path, instance_factory, case_factory, instance_cycle_time_factory
+):
+    decided = instance_factory()
+    case_factory(instance=decided)
+    instance_cycle_time_factory(
+        instance=decided, total_cycle_time=30, net_cycle_time=20
+    )
+    other = instance_factory()
+
+    call_command("export_dossier_facts", str(tmp_path))
+
+    state = json.loads((tmp_path / "dossier-facts.json").read_text())
+    assert state["rows"] == 2
+    rows = {
+        row["instance_id"]: row
+        for row in pq.read_table(tmp_path / state["file"]).to_pylist()
+    }
+    assert set(rows) == {decided.pk, other.pk}
+    assert rows[decided.pk]["instance_state"] == decided.instance_state.name
+    assert rows[decided.pk]["total_cycle_time"] == 30
+    assert rows[decided.pk]["net_cycle_time"] == 20
+    assert rows[other.pk]["total_cycle_time"] is None
+
+    # nothing changed since the last export
+    call_command("export_dossier_facts", str(tmp_path), "--incremental")
+    assert json.loads((tmp_path / "dossier-facts.json").read_text())["rows"] == 0
+
+    decided.case.save()
+
+    call_command(
+        "export_dossier_facts", str(tmp_path), "--incremental", "--format", "arrow"
+    )
+    state = json.loads((tmp_path / "dossier-facts.json").read_text())
+    table = pa.ipc.open_file(tmp_path / state["file"]).read_all()
+    assert table.column("instance_id").to_pylist() == [decided.pk]
+
+
+def test_export_dossier_facts_since(db, tmp_path, instance_factory):
+    instance_factory()
+
+    # no previous export
+    call_command("export_dossier_facts", str(tmp_path), "--incremental")
+    assert json.loads((tmp_path / "dossier-facts.json").read_text())["rows"] == 1
+
+    for since, rows in [("2000-01-01T00:00:00", 1), ("2100-01-01T00:00:00+00:00", 0)]:
+        call_command(
+            "export_dossier_facts", str(tmp_path), "--incremental", "--since", since
+        )
+        assert json.loads((tmp_path / "dossier-facts.json").read_text())["rows"] == rows
+
+    with pytest.raises(CommandError):
+        call_command("export_dossier_facts", str(tmp_path), "--since", "yesterday")
+
+
+@pytest.mark.parametrize("state", ["", "{}", '{"exported_at": 1}'])
+def test_export_dossier_facts_invalid_state(db, tmp_path, state):
+    (tmp_path / "dossier-facts.json").write_text(state)
+
+    with pytest.raises(CommandError):
+        call_command("export_dossier_facts", str(tmp_path), "--incremental")
+
+
+@pytest.mark.parametrize("file_format", FORMATS)
+def test_write_facts_failure(tmp_path, file_format):
+    schema = get_schema([])
+
+    def tables():
+        yield pa.Table.from_pylist([], schema=schema)
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        write_facts(tmp_path / "facts", tables(), schema, file_format)
+
+    # neither the export nor the temporary file remain
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (None, None),
+        ("text", "text"),
+        (datetime.date(2021, 3, 4), "2021-03-04"),
+        (["a", 1], '["a", 1]'),
+        ({"a": datetime.date(2021, 3, 4)}, '{"a": "2021-03-04"}'),
+        (12.5, "12.5"),
+    ],
+)
+def test_to_string(value, expected):
+    assert _to_string(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (datetime.datetime(2021, 3, 4, 12), datetime.date(2021, 3, 4)),
+        (datetime.date(2021, 3, 4), datetime.date(2021, 3, 4)),
+        ("2021-03-04", datetime.date(2021, 3, 4)),
+        ("not a date", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_to_date(value, expected):
+    assert _to_date(value) == expected
+
+
+def test_master_data_error():
+    class BrokenMasterData:
+        proposal = "Neubau"
+
+        @property
+        def dossier_number(self):
+            raise LookupError()
+
+    builder = FactsBuilder([])
+
+    assert builder._master_data(BrokenMasterData(), "proposal") == "Neubau"
+    assert builder._master_data(BrokenMasterData(), "dossier_number") is None
@@ -10,9 +10,11 @@ from django.urls import reverse
 from django.utils.timezone import make_aware, now
 from django_filters.rest_framework import DjangoFilterBackend
 from faker import Faker
+from rest_framework import status
 
 from camac.instance.models import Instance
 from camac.instance.serializers import SUBMIT_DATE_FORMAT
+from camac.stats import summaries
 from camac.stats.views import ClaimSummaryView, InstanceSummaryView
 
 
@@ -266,6 +268,7 @@ def test_instance_cycle_time_view(  # TODO: fix test
     admin_user,
     admin_client,
     decision_factory,
+    instance_cycle_time_factory,
     freezer,
     has_access,
 ):
@@ -307,6 +310,14 @@ def test_instance_cycle_time_view(  # TODO: fix test
                 decision_type=decision_type,
                 decision_date=submitted.date() + datetime.timedelta(days=(3 * i)),
             )
+            instance_cycle_time_factory(
+                instance=instance,
+                service=group.service,
+                procedure=decision_type or "preliminary-clarification",
+                decision_date=submitted.date() + datetime.timedelta(days=(3 * i)),
+                total_cycle_time=cycle_time,
+                net_cycle_time=cycle_time - cycle_time // 3,
+            )
 
             instance.case.save()
             cycle_time += 6
@@ -329,6 +340,14 @@ def test_instance_cycle_time_view(  # TODO: fix test
             decision_type="decision-approval-type-overall-building-permit",
             decision_date=(submitted + datetime.timedelta(days=3)).date(),
         )
+        instance_cycle_time_factory(
+            instance=excl_instance,
+            service=group.service,
+            procedure="decision-approval-type-overall-building-permit",
+            decision_date=(submitted + datetime.timedelta(days=3)).date(),
+            total_cycle_time=11,
+            net_cycle_time=11,
+        )
         excl_instance.case.save()
 
     url = reverse("instances-cycle-times")
@@ -357,3 +376,115 @@ def test_instance_cycle_time_view(  # TODO: fix test
         )
 
     assert len(admin_client.get(url, {"procedure": "something"}).json()) == 0
+
+
+@pytest.mark.parametrize("role__name", ["Support"])
+@pytest.mark.parametrize("period", [None, ",1999-12-31", "1990-01-01,2005-01-01"])
+def test_summaries(
+    db,
+    admin_client,
+    settings,
+    role,
+    group,
+    instance_factory,
+    case_factory,
+    nfd_tabelle_document_row,
+    period,
+):
+    settings.STATS_SUMMARIES = True
+
+    for paper_submit_date, submit_date in [
+        ("1985-05-15", None),
+        (None, "1992-05-15"),
+        ("1999-05-15", "1995-05-15"),
+        (None, None),
+    ]:
+        instance = instance_factory()
+        case_factory(
+            instance=instance,
+            meta={"submit-date": submit_date, "paper-submit-date": paper_submit_date},
+        )
+        instance.save()
+
+    nfd_tabelle_document_row(group.service_id, "nfd-tabelle-status-beantwortet")
+    nfd_tabelle_document_row(group.service_id, "nfd-tabelle-status-entwurf")
+
+    params = {"period": period} if period else {}
+
+    for url in [reverse("instances-summary"), reverse("claims-summary")]:
+        live = admin_client.get(url, {**params, "live": "true"}).json()
+
+        # not populated yet
+        assert admin_client.get(url, params).json() == live
+
+        summaries.refresh_summaries()
+        assert summaries.is_populated("stats_instance_summary")
+        assert admin_client.get(url, params).json() == live
+
+
+@pytest.mark.parametrize("role__name", ["Support", "Service"])
+def test_inquiries_summaries(
+    db,
+    admin_client,
+    settings,
+    role,
+    group,
+    active_inquiry_factory,
+    be_distribution_settings,
+    be_instance,
+    service_factory,
+):
+    settings.STATS_SUMMARIES = True
+
+    for service, closed_at in [
+        (group.service, datetime.datetime(2020, 7, 15)),
+        (group.service, datetime.datetime(2020, 7, 25)),
+        (service_factory(), datetime.datetime(2020, 7, 14)),
+    ]:
+        active_inquiry_factory(
+            for_instance=be_instance,
+            addressed_service=service,
+            status=WorkItem.STATUS_COMPLETED,
+            created_at=make_aware(datetime.datetime(2020, 7, 11)),
+            closed_at=make_aware(closed_at),
+            deadline=make_aware(datetime.datetime(2020, 7, 20)),
+        )
+
+    url = reverse("inquiries-summary")
+    live = admin_client.get(url, {"live": "true"}).json()
+    assert live["avg-processing-time"]
+
+    summaries.refresh_summaries()
+    assert summaries.is_populated("stats_inquiry_summary")
+    assert admin_client.get(url).json() == live
+
+
+@pytest.mark.parametrize("role__name", ["Service"])
+def test_inquiries_summaries_without_work_items(
+    db, admin_client, settings, role, be_distribution_settings
+):
+    settings.STATS_SUMMARIES = True
+    summaries.refresh_summaries()
+
+    assert admin_client.get(reverse("inquiries-summary")).json() == {
+        "avg-processing-time": None,
+        "deadline-quota": None,
+    }
+
+
+def test_refresh_summaries_disabled(db, settings):
+    settings.STATS_SUMMARIES = False
+    summaries.refresh_summaries()
+
+    assert not any(summaries.is_populated(view) for view in summaries.SUMMARY_VIEWS)
+
+
+@pytest.mark.parametrize("role__name", ["Support"])
+@pytest.mark.parametrize("url", ["instances-summary", "claims-summary"])
+def test_summaries_invalid_period(db, admin_client, settings, role, url):
+    settings.STATS_SUMMARIES = True
+    summaries.refresh_summaries()
+
+    response = admin_client.get(reverse(url), {"period": "2020-01-01"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
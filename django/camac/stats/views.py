@@ -1,38 +1,36 @@
-from datetime import date
-
-from caluma.caluma_form.models import Answer, Document
+from caluma.caluma_form.models import Document
 from caluma.caluma_workflow.models import WorkItem
 from django.conf import settings
 from django.db.models import (
     Avg,
     Case,
     Count,
-    Exists,
     ExpressionWrapper,
     F,
     FloatField,
     Func,
     IntegerField,
-    OuterRef,
-    Q,
     QuerySet,
     Sum,
     When,
 )
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import ListAPIView
 from rest_framework.renderers import JSONRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from camac import config_registry
 from camac.instance.mixins import InstanceQuerysetMixin
 from camac.instance.models import Instance
+from camac.stats import summaries
 from camac.stats.cycle_time import aggregate_cycle_times
 from camac.stats.filters import (
     ClaimSummaryFilterSet,
     InstanceCycleTimeFilterSet,
     InstanceSummaryFilterSet,
 )
-from camac.user.permissions import permission_aware
+from camac.user.permissions import get_role_name, permission_aware
 
 from .serializers import (
     ClaimSummarySerializer,
@@ -42,7 +40,36 @@ from .serializers import (
 )
 
 
-class ClaimSummaryView(ListAPIView):
+class SummaryMixin:
+    """Answer from the materialized summaries for the `summary_roles`.
+
+    Live values are computed for all other roles, when `live=true` is
+    passed or when the summaries are not available.
+    """
+
+    summary_view = None
+    summary_roles = ()
+
+    def use_summary(self):
+        return (
+            settings.STATS_SUMMARIES
+            and get_role_name(self.request.group) in self.summary_roles
+            and self.request.query_params.get("live") != "true"
+            and summaries.is_populated(self.summary_view)
+        )
+
+    def get_period(self):
+        period = self.request.query_params.get("period")
+        if not period:
+            return None
+
+        period = period.split(",")
+        if len(period) != 2:
+            raise ValidationError()
+        return period
+
+
+class ClaimSummaryView(SummaryMixin, ListAPIView):
     renderer_classes = [JSONRenderer]
     filterset_class = ClaimSummaryFilterSet
     swagger_schema = None
@@ -51,6 +78,8 @@ class ClaimSummaryView(ListAPIView):
         answers__value="nfd-tabelle-status-entwurf",
     )
     serializer_class = ClaimSummarySerializer
+    summary_view = "stats_claim_summary"
+    summary_roles = ("municipality", "support")
 
     @permission_aware
     def get_queryset(self):
@@ -66,25 +95,44 @@ class ClaimSummaryView(ListAPIView):
         return self.queryset
 
     def get(self, request, *args, **kwargs):
+        if self.use_summary():
+            service_id = (
+                None
+                if get_role_name(request.group) == "support"
+                else request.group.service_id
+            )
+            return Response(summaries.count_claims(self.get_period(), service_id))
+
         return Response(self.filter_queryset(self.get_queryset()).count())
 
 
-class InstanceSummaryView(InstanceQuerysetMixin, ListAPIView):
+class InstanceSummaryView(SummaryMixin, InstanceQuerysetMixin, ListAPIView):
     filterset_class = InstanceSummaryFilterSet
     renderer_classes = [JSONRenderer]
     swagger_schema = None
     queryset = Instance.objects.all()
     serializer_class = InstanceSummarySerializer
     instance_field = None
+    summary_view = "stats_instance_summary"
+    # roles which see all instances apart from the hidden states
+    summary_roles = ("canton", "support")
 
     def get(self, request, *args, **kwargs):
+        if self.use_summary():
+            hidden_states = config_registry.get_hidden_states(
+                get_role_name(request.group)
+            )
+            return Response(summaries.count_instances(self.get_period(), hidden_states))
+
         return Response(self.filter_queryset(self.get_queryset()).count())
 
 
-class InquiriesSummaryView(ListAPIView):
+class InquiriesSummaryView(SummaryMixin, ListAPIView):
     renderer_classes = [JSONRenderer]
     swagger_schema = None
     serializer_class = InquiriesSummarySerializer
+    summary_view = "stats_inquiry_summary"
+    summary_roles = ("service", "support")
 
     def get_base_queryset(self) -> QuerySet:
         if not settings.DISTRIBUTION:  # pragma: no cover
@@ -108,6 +156,20 @@ class InquiriesSummaryView(ListAPIView):
         )
 
     def get(self, request: Request, *args, **kwargs) -> Response:
+        if settings.DISTRIBUTION and self.use_summary():
+            duration, deadline_quota = summaries.summarize_work_items(
+                settings.DISTRIBUTION["INQUIRY_TASK"],
+                None
+                if get_role_name(request.group) == "support"
+                else request.group.service_id,
+            )
+            return Response(
+                {
+                    "avg-processing-time": duration and duration.total_seconds(),
+                    "deadline-quota": deadline_quota and round(deadline_quota, 2),
+                }
+            )
+
         res = (
             self.get_queryset()
             .annotate(
@@ -142,21 +204,7 @@ class InstancesCycleTimesView(InstanceQuerysetMixin, ListAPIView):
     filterset_class = InstanceCycleTimeFilterSet
     renderer_classes = [JSONRenderer]
     swagger_schema = None
-    queryset = Instance.objects.filter(
-        case__meta__has_keys=["total-cycle-time", "net-cycle-time"]
-    ).filter(
-        Exists(
-            Answer.objects.filter(
-                question_id="decision-date",
-                document__work_item__case__instance=OuterRef("pk"),
-            ).exclude(
-                Q(document__work_item__status=WorkItem.STATUS_CANCELED)
-                | Q(date__isnull=True)
-                | Q(date__lt=date(1970, 1, 1))
-                | Q(date__gt=date.today())
-            )
-        )
-    )
+    queryset = Instance.objects.filter(cycle_time__isnull=False)
     serializer_class = InstancesCycleTimeSerializer
     instance_field = None
 
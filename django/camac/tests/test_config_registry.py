@@ -0,0 +1,70 @@
+from camac import config_registry
+
+
+def test_compiled_per_source(application_settings):
+    application_settings["ROLE_PERMISSIONS"] = {
+        "Municipality": "municipality",
+        "Municipality Clerk": "municipality",
+        "Service": "service",
+    }
+
+    assert config_registry.get_roles("municipality") == (
+        "Municipality",
+        "Municipality Clerk",
+    )
+    assert config_registry.get_roles("canton") == ()
+
+    # replacing the configuration compiles it again
+    application_settings["ROLE_PERMISSIONS"] = {"Service": "service"}
+    assert config_registry.get_roles("municipality") == ()
+    assert config_registry.get_permission("Service") == "service"
+
+
+def test_active_service_config(application_settings):
+    application_settings["ACTIVE_SERVICES"] = {
+        "MUNICIPALITY": {"DEFAULT": True},
+        "CONSTRUCTION_CONTROL": {
+            "INSTANCE_STATES": [["construction-monitoring", "sb2"]]
+        },
+    }
+
+    assert config_registry.get_active_service_config(
+        "construction-monitoring", "sb2"
+    ) == (
+        "CONSTRUCTION_CONTROL",
+        {"INSTANCE_STATES": [["construction-monitoring", "sb2"]]},
+    )
+    assert config_registry.get_active_service_config("subm", "new") == (
+        "MUNICIPALITY",
+        {"DEFAULT": True},
+    )
+
+
+def test_hidden_states(application_settings):
+    application_settings["INSTANCE_HIDDEN_STATES"] = {"coordination": ["new"]}
+
+    assert config_registry.get_hidden_states("coordination") == {"new"}
+    assert config_registry.get_hidden_states("service") == frozenset()
+
+
+def test_master_data_config(application_settings):
+    application_settings["MASTER_DATA"] = {
+        "canton": ("static", "BE"),
+        "submit_date": ("case_meta", "submit-date", {"value_parser": "datetime"}),
+    }
+
+    assert config_registry.get_master_data_config("canton") == (
+        "static",
+        "static_resolver",
+        "BE",
+        {},
+    )
+    resolver, method, lookup, kwargs = config_registry.get_master_data_config(
+        "submit_date"
+    )
+    assert (method, lookup, dict(kwargs)) == (
+        "case_meta_resolver",
+        "submit-date",
+        {"value_parser": "datetime"},
+    )
+    assert config_registry.get_master_data_config("unknown") is None
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+# expensive to import and only used by a few features, so they're imported
+# lazily and mustn't be loaded to serve the API
+LAZY_MODULES = [
+    "camac.ech0211.schema.ech_0129_5_0",
+    "camac.ech0211.schema.ech_0211_2_0",
+    "django_excel",
+    "docxtpl",
+    "openpyxl",
+    "PyPDF2",
+    "qrcode",
+]
+
+# in seconds, for setting up django and importing all views
+IMPORT_TIME_BUDGET = 15
+
+LOAD_APPLICATION = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+
+def _import_times():
+    """Load the application with `-X importtime` and parse the report.
+
+    :return: dict of module name to the time spent importing it (in
+             microseconds, without its imports)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", LOAD_APPLICATION],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, _, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(self_time)
+
+    return times
+
+
+def test_import_time():
+    times = _import_times()
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:20]
+    report = "\n".join(f"{time / 1000:8.1f}ms {name}" for name, time in slowest)
+
+    assert [module for module in LAZY_MODULES if module in times] == []
+    assert sum(times.values()) / 1e6 < IMPORT_TIME_BUDGET, report
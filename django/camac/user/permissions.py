@@ -3,6 +3,7 @@ from functools import wraps
 from django.conf import settings
 from rest_framework import permissions
 
+from camac import config_registry
 from camac.request import get_request
 
 
@@ -63,8 +64,7 @@ def permission_aware(func):
 
 
 def get_role_name(group):
-    perms = settings.APPLICATION.get("ROLE_PERMISSIONS", {})
-    return perms.get(group.role.name) if group else "public"
+    return config_registry.get_permission(group.role.name) if group else "public"
 
 
 def get_permission_func(cls, name, group):
@@ -74,13 +74,11 @@ def get_permission_func(cls, name, group):
     perm = get_role_name(group)
 
     if perm:
-        perm_func = f"{name}_for_{perm}"
-        if hasattr(cls, perm_func):
+        perm_func = config_registry.get_permission_func_name(
+            cls if isinstance(cls, type) else type(cls), name, perm
+        )
+        if perm_func:
             return getattr(cls, perm_func)
-        parent = settings.APPLICATION.get("ROLE_INHERITANCE", {}).get(perm)
-        parent_perm_func = f"{name}_for_{parent}"
-        if parent and hasattr(cls, parent_perm_func):
-            return getattr(cls, parent_perm_func)
 
     return None
 
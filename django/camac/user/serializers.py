@@ -4,6 +4,7 @@ from django.contrib.auth.models import AnonymousUser
 from django.core.validators import validate_email
 from rest_framework_json_api import relations, serializers
 
+from camac import config_registry
 from camac.core.serializers import MultilingualField, MultilingualSerializer
 
 from . import models
@@ -101,8 +102,7 @@ class RoleSerializer(MultilingualSerializer, serializers.ModelSerializer):
     permission = serializers.SerializerMethodField()
 
     def get_permission(self, role):
-        perms = settings.APPLICATION.get("ROLE_PERMISSIONS", {})
-        return perms.get(role.name)
+        return config_registry.get_permission(role.name)
 
     class Meta:
         model = models.Role
@@ -4,7 +4,6 @@ from urllib.parse import parse_qsl
 
 import requests
 from django.conf import settings
-from docxtpl import DocxTemplate
 from rest_framework import exceptions
 
 from camac import jinja
@@ -23,6 +22,9 @@ class DocxRenderer:
     def __init__(self, path, data):
         self.path = path
 
+        # imported on first use as it loads lxml and docx
+        from docxtpl import DocxTemplate
+
         self.buffer = io.BytesIO()
         doc = DocxTemplate(path)
         doc.render(data, jinja.get_jinja_env())
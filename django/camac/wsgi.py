@@ -11,9 +11,30 @@ import os
 
 from django.conf import settings
 from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.urls import get_resolver
+
+from camac import config_registry
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "camac.settings")
 
+
+def preload():
+    """Import the code used by most requests ahead of the first request.
+
+    uwsgi loads this module in the master and forks the workers from it, so
+    workers restarted after `max-requests` don't import the views again.
+    Rarely used heavy modules (e.g. the eCH bindings) are imported lazily and
+    aren't preloaded.
+    """
+    # imports all views, serializers, permissions and authentication classes
+    get_resolver().url_patterns
+    config_registry.compile_all()
+
+    # connections may not be shared with the forked workers
+    connections.close_all()
+
+
 if settings.MANABI_ENABLE:
     from camac.dav import get_dav
 
@@ -35,3 +56,6 @@ if settings.MANABI_ENABLE:
 else:
 
     application = get_wsgi_application()
+
+if settings.WSGI_PRELOAD:
+    preload()